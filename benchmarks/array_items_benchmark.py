@@ -0,0 +1,41 @@
+"""
+Array items inference benchmark
+    - inference time should scale with the number of distinct item shapes, not with the number of items
+
+python3 -m benchmarks.array_items_benchmark
+"""
+import time
+from src.json_schema_form import JsonSchemaFormInputFactory
+
+
+def create_items(items_count: int, shapes_count: int) -> list:
+    return [
+        {
+            "id": index,
+            "name": "item",
+            "price": 1.5,
+            "tags": ["foo", "bar"],
+            "address": {"street": "Main", "city": "Prague"},
+            "shape" + str(index % shapes_count): True
+        }
+        for index in range(items_count)
+    ]
+
+
+def measure(items: list) -> float:
+    factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+    start = time.perf_counter()
+    factory.create_input("items", items)
+    return time.perf_counter() - start
+
+
+def main():
+    print("{:>10} {:>8} {:>12}".format("items", "shapes", "time [ms]"))
+    for items_count in [1000, 10000, 100000]:
+        for shapes_count in [1, 10, 100]:
+            items = create_items(items_count, shapes_count)
+            print("{:>10} {:>8} {:>12.2f}".format(items_count, shapes_count, measure(items) * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Recursive vs iterative (explicit stack) engine benchmark for deep and wide documents
+
+python3 -m benchmarks.iterative_engine_benchmark
+"""
+import time
+from src.json_schema_form import JsonSchemaForm
+from src.iterative_engine import IterativeJsonSchemaForm
+
+
+def create_deep_document(depth: int) -> dict:
+    document = value = {}
+    for level in range(depth):
+        value["level" + str(level)] = [{"id": level}]
+        value = value["level" + str(level)][0]
+    return document
+
+
+def create_wide_document(width: int) -> dict:
+    return {
+        "items": [{"key" + str(index): index for index in range(width)}],
+        "object": {"key" + str(index): {"value": "foo"} for index in range(width)}
+    }
+
+
+def measure(form_class, document: dict) -> str:
+    try:
+        start = time.perf_counter()
+        form = form_class(document, items_are_invisible=True)
+        inference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        form.get_data_schema()
+        form.get_ui_schema()
+        emission_time = time.perf_counter() - start
+    except RecursionError:
+        return "{:>27}".format("RecursionError")
+    return "{:>12.2f} {:>14.2f}".format(inference_time * 1000, emission_time * 1000)
+
+
+def main():
+    documents = [("deep", depth, create_deep_document(depth)) for depth in [100, 300, 600, 5000]]
+    documents += [("wide", width, create_wide_document(width)) for width in [1000, 10000, 100000]]
+    print("{:>6} {:>8} {:>10} {:>12} {:>14}".format("shape", "size", "engine", "infer [ms]", "emit [ms]"))
+    for shape, size, document in documents:
+        for engine, form_class in [("recursive", JsonSchemaForm), ("iterative", IterativeJsonSchemaForm)]:
+            print("{:>6} {:>8} {:>10} {}".format(shape, size, engine, measure(form_class, document)))
+
+
+if __name__ == "__main__":
+    main()
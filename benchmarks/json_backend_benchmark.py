@@ -0,0 +1,44 @@
+"""
+JSON backends benchmark - parse, infer and emit times per backend (the outputs are checked to be identical)
+
+python3 -m benchmarks.json_backend_benchmark [objects count]
+"""
+import sys
+import json
+import time
+from src.json_schema_form import JsonSchemaForm
+from src.batch_generator import get_json_schema_document
+from src.json_backend import JSON_BACKENDS, get_json_backend, JsonBackendNotInstalled
+from benchmarks.memory_benchmark import create_document
+
+
+def main():
+    objects_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    data = json.dumps(create_document(objects_count)).encode()
+    print("input [MB]: {:.2f}".format(len(data) / 1024 / 1024))
+    outputs = {}
+    for name in JSON_BACKENDS:
+        try:
+            json_backend = get_json_backend(name)
+        except JsonBackendNotInstalled:
+            print("{:<8} not installed".format(name))
+            continue
+        start_time = time.perf_counter()
+        document = json_backend.loads(data)
+        parse_time = time.perf_counter()
+        json_schema_form = JsonSchemaForm(document)
+        json_schema_document = get_json_schema_document(json_schema_form)
+        infer_time = time.perf_counter()
+        outputs[name] = json_backend.dumps(json_schema_document, indent=2)
+        emit_time = time.perf_counter()
+        print("{:<8} parse [s]: {:6.3f}   infer [s]: {:6.3f}   emit [s]: {:6.3f}".format(
+            name,
+            parse_time - start_time,
+            infer_time - parse_time,
+            emit_time - infer_time
+        ))
+    print("identical outputs: {}".format(len(set(outputs.values())) == 1))
+
+
+if __name__ == "__main__":
+    main()
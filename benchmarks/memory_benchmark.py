@@ -0,0 +1,84 @@
+"""
+Inputs tree memory benchmark - bytes allocated per input node (tracemalloc)
+    - the nodes are compared with their unslotted variant (the input classes before they were slotted and
+      before their titles were interned), both variants are measured as the copies of the same nodes
+
+python3 -m benchmarks.memory_benchmark [objects count]
+"""
+import sys
+import copy
+import json
+import tracemalloc
+from typing import Callable, List
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput
+
+
+def create_document(objects_count: int) -> dict:
+    """
+    Objects with mixed property names - the names repeat across the objects, but there are more of them than the
+    titles cache holds
+    """
+    return json.loads(json.dumps({
+        "object" + str(index): {
+            "property" + str((index * 7 + offset) % 5000): [1, "foo", 1.5, True, {"nested": "foo"}][offset % 5]
+            for offset in range(50)
+        }
+        for index in range(objects_count)
+    }))
+
+
+class UnslottedInput:
+    """
+    Input node without __slots__ - the attributes are stored in the instance __dict__ and the title isn't shared
+    with the other nodes of the same name (the titles cache evicts the titles of the large trees)
+    """
+
+    def __init__(self, form_input: JsonSchemaFormInput):
+        for input_class in type(form_input).__mro__:
+            for attribute in getattr(input_class, "__slots__", ()):
+                setattr(self, attribute, getattr(form_input, attribute))
+        self.title = "".join(list(form_input.title))
+
+
+def get_nodes(json_schema_form: JsonSchemaForm) -> List[JsonSchemaFormInput]:
+    nodes = []
+    stack = list(json_schema_form.inputs)
+    while stack:
+        form_input = stack.pop()
+        nodes.append(form_input)
+        stack += form_input.get_child_inputs()
+    return nodes
+
+
+def measure_copies(nodes: List[JsonSchemaFormInput], copy_node: Callable[[JsonSchemaFormInput], object]) -> int:
+    """
+    Returns the bytes allocated by the copies of the nodes (the copies share the children containers)
+    """
+    tracemalloc.start()
+    copies = [copy_node(form_input) for form_input in nodes]
+    allocated_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copies
+    return allocated_size
+
+
+def main():
+    objects_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    document = create_document(objects_count)
+    tracemalloc.start()
+    json_schema_form = JsonSchemaForm(document)
+    allocated_size, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = get_nodes(json_schema_form)
+    print("nodes:          {}".format(len(nodes)))
+    print("allocated [MB]: {:.2f}".format(allocated_size / 1024 / 1024))
+    print("peak [MB]:      {:.2f}".format(peak_size / 1024 / 1024))
+    print("bytes per node: {:.1f}".format(allocated_size / len(nodes)))
+    print("node copy bytes per node: {:.1f} slotted, {:.1f} unslotted".format(
+        measure_copies(nodes, copy.copy) / len(nodes),
+        measure_copies(nodes, UnslottedInput) / len(nodes)
+    ))
+
+
+if __name__ == "__main__":
+    main()
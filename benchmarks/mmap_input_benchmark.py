@@ -0,0 +1,92 @@
+"""
+Input reading benchmark - peak RSS and time of parsing the JSON file read as str, read as bytes and memory-mapped
+(JsonBackend.load_file) per backend, every measurement runs in a fresh process
+
+python3 -m benchmarks.mmap_input_benchmark [file size in MB]
+    - the records contain long strings, so the parsed document isn't much bigger than the file and the input copies
+      are visible in the peak RSS (1 GB file needs about 3.5 GB of memory)
+"""
+import sys
+import time
+import json
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from src.json_backend import JSON_BACKENDS, get_json_backend, JsonBackendNotInstalled
+
+
+READ_METHODS = {
+    "read_text": lambda json_backend, json_path: json_backend.loads(Path(json_path).read_text()),
+    "read_bytes": lambda json_backend, json_path: json_backend.loads(Path(json_path).read_bytes()),
+    "mmap": lambda json_backend, json_path: json_backend.load_file(json_path)
+}
+
+
+def create_json_file(json_path: Path, size: int):
+    """
+    Writes the array of the records with long strings until the file has at least the size (bytes)
+    """
+    with open(json_path, "w") as json_file:
+        json_file.write("[")
+        written_size = 1
+        index = 0
+        while written_size < size:
+            record = json.dumps({"id": index, "title": "record " + str(index), "text": "lorem ipsum " * 500})
+            written_size += json_file.write(("," if index else "") + record)
+            index += 1
+        json_file.write("]")
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes (ru_maxrss is in kilobytes on Linux)
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure_read_method(backend_name: str, read_method: str, json_path: str) -> tuple:
+    json_backend = get_json_backend(backend_name)
+    start_rss = get_peak_rss()
+    start_time = time.perf_counter()
+    document = READ_METHODS[read_method](json_backend, json_path)
+    parse_time = time.perf_counter() - start_time
+    peak_rss = get_peak_rss()
+    return len(document), parse_time, peak_rss - start_rss
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "input.json"
+        create_json_file(json_path, size * 1024 * 1024)
+        file_size = json_path.stat().st_size
+        print("input [MB]: {:.2f}".format(file_size / 1024 / 1024))
+        for backend_name in JSON_BACKENDS:
+            try:
+                get_json_backend(backend_name)
+            except JsonBackendNotInstalled:
+                print("{:<8} not installed".format(backend_name))
+                continue
+            for read_method in READ_METHODS:
+                # a fresh process per measurement, so the peak RSS isn't affected by the previous measurements
+                with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    records_count, parse_time, peak_rss = executor.submit(
+                        measure_read_method,
+                        backend_name,
+                        read_method,
+                        str(json_path)
+                    ).result()
+                print("{:<8} {:<12} records: {}   time [s]: {:6.3f}   peak RSS [MB]: {:8.1f} ({:.2f}x input)".format(
+                    backend_name,
+                    read_method,
+                    records_count,
+                    parse_time,
+                    peak_rss / 1024 / 1024,
+                    peak_rss / file_size
+                ))
+
+
+if __name__ == "__main__":
+    main()
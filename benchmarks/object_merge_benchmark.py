@@ -0,0 +1,71 @@
+"""
+Object properties merge scaling benchmark
+    - merging of the array items objects should take linear time in the number of their properties
+
+python3 -m benchmarks.object_merge_benchmark
+    - exits with status 1 when 4 times more properties take more than 8 times longer (quadratic merge ~16 times)
+"""
+import sys
+import time
+from typing import Callable
+from src.json_schema_form import JsonSchemaFormInputFactory
+
+
+MAX_SCALING_RATIO = 8
+
+
+def measure_merge(items: list, detect_formats: bool = False) -> float:
+    """
+    Returns the best time of the repeated runs
+    """
+    factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False, detect_formats=detect_formats)
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        factory.create_input("array", items)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def create_wide_items(keys_count: int) -> list:
+    return [
+        {"key" + str(index): index for index in range(keys_count)},
+        {"key" + str(index): index for index in range(keys_count // 2, keys_count * 3 // 2)}
+    ]
+
+
+def create_many_items(items_count: int, value) -> list:
+    # every item adds a new key to the merged items input
+    return [{"key" + str(index): value} for index in range(items_count)]
+
+
+# case name -> items of the given size, formats detection
+CASES = {
+    "wide items": (create_wide_items, False),
+    "many items": (lambda items_count: create_many_items(items_count, 1), False),
+    "many items with formats": (lambda items_count: create_many_items(items_count, "foo@bar.baz"), True)
+}
+
+
+def measure_scaling(create_items: Callable[[int], list], size: int, detect_formats: bool) -> float:
+    """
+    Returns the ratio of the merge times of 4 times more and the given number of properties
+    """
+    return measure_merge(create_items(size * 4), detect_formats) / measure_merge(create_items(size), detect_formats)
+
+
+def main():
+    print("{:<24} {:>8}".format("case", "4x ratio"))
+    slow_cases = []
+    for name, (create_items, detect_formats) in CASES.items():
+        ratio = measure_scaling(create_items, 10000, detect_formats)
+        print("{:<24} {:>8.2f}".format(name, ratio))
+        if ratio >= MAX_SCALING_RATIO:
+            slow_cases.append(name)
+    if slow_cases:
+        print("Not linear: " + ", ".join(slow_cases))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
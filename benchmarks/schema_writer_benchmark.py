@@ -0,0 +1,66 @@
+"""
+Schema output benchmark - json.dumps of the built document vs the streaming writer
+(peak memory of the emission, time to the first byte, total time)
+
+python3 -m benchmarks.schema_writer_benchmark [objects count]
+"""
+import sys
+import json
+import time
+import tracemalloc
+from src.json_schema_form import JsonSchemaForm
+from src.batch_generator import get_json_schema_document
+from src.schema_writer import write_json_schema_document
+from benchmarks.memory_benchmark import create_document
+
+
+class MeasuredOutput:
+    """
+    Discards the output, remembers the time of the first write
+    """
+
+    def __init__(self):
+        self.first_write_time = None
+
+    def write(self, chunk: str):
+        if self.first_write_time is None:
+            self.first_write_time = time.perf_counter()
+
+
+def measure(name: str, json_schema_form: JsonSchemaForm, write):
+    # definitions cached by the previous measurement must not be reused
+    json_schema_form = JsonSchemaForm.from_inputs(json_schema_form.inputs, items_are_invisible=True)
+    for form_input in json_schema_form.inputs:
+        form_input.invalidate_definitions()
+    output = MeasuredOutput()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    write(json_schema_form, output)
+    end_time = time.perf_counter()
+    _, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<8} peak [MB]: {:8.2f}   first byte [s]: {:6.3f}   total [s]: {:6.3f}".format(
+        name,
+        peak_size / 1024 / 1024,
+        output.first_write_time - start_time,
+        end_time - start_time
+    ))
+
+
+def write_dumped_document(json_schema_form: JsonSchemaForm, output: MeasuredOutput):
+    output.write(json.dumps(get_json_schema_document(json_schema_form), indent=2))
+
+
+def write_streamed_document(json_schema_form: JsonSchemaForm, output: MeasuredOutput):
+    write_json_schema_document(json_schema_form, output, indent=2)
+
+
+def main():
+    objects_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    json_schema_form = JsonSchemaForm(create_document(objects_count), items_are_invisible=True)
+    measure("dumps", json_schema_form, write_dumped_document)
+    measure("stream", json_schema_form, write_streamed_document)
+
+
+if __name__ == "__main__":
+    main()
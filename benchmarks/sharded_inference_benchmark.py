@@ -0,0 +1,46 @@
+"""
+Sharded inference benchmark - single process vs sharded JSON lines inference
+
+python3 -m benchmarks.sharded_inference_benchmark [records count]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+from src.json_lines import read_json_lines
+from src.json_schema_form import JsonSchemaForm
+from src.sharded_inference import ShardedSchemaInference
+
+
+def write_records(json_lines_path: str, records_count: int):
+    with open(json_lines_path, "w") as json_lines_file:
+        for index in range(records_count):
+            json_lines_file.write(json.dumps({
+                "id": index,
+                "type": "event" + str(index % 20),
+                "payload": {"value": index * 1.5, "flag" + str(index % 100): True},
+                "tags": ["foo", "bar"]
+            }) + "\n")
+
+
+def main():
+    records_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_lines_path = os.path.join(temp_dir, "records.jsonl")
+        write_records(json_lines_path, records_count)
+        start = time.perf_counter()
+        with open(json_lines_path) as json_lines_stream:
+            JsonSchemaForm.from_records(read_json_lines(json_lines_stream)).get_data_schema()
+        single_time = time.perf_counter() - start
+        print("{:>10} {:>12} {:>10}".format("workers", "time [s]", "speedup"))
+        print("{:>10} {:>12.2f} {:>10.2f}".format("single", single_time, 1))
+        for workers_count in sorted(set([1, 2, 4, 8, os.cpu_count() or 1])):
+            start = time.perf_counter()
+            ShardedSchemaInference({}, workers_count=workers_count).infer_json_lines(json_lines_path).get_data_schema()
+            sharded_time = time.perf_counter() - start
+            print("{:>10} {:>12.2f} {:>10.2f}".format(workers_count, sharded_time, single_time / sharded_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark suite - times the inputs creation, data schema and UI schema emission (separate and combined in one walk,
+see JsonSchemaForm.get_schemas) of the synthetic workloads (see benchmarks.workloads) and compares them with
+the stored baseline
+
+python3 -m benchmarks.suite [--save-baseline] [--baseline=<path>] [--threshold=<ratio>] [--scale=<ratio>]
+                            [--repeats=<count>] [--workloads=<name>,<name>]
+    - exits with status 1 when any of the timings is slower than its baseline times the threshold
+    - --save-baseline stores the timings as the new baseline (keeps the thresholds of the stored baseline)
+"""
+import gc
+import sys
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from src.cli_arguments import CliArguments
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInputFactory
+from benchmarks.workloads import WORKLOADS
+
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_REPEATS = 5
+# differences below this are a measurement noise (seconds)
+MIN_REGRESSION = 0.002
+STAGES = ["create_input", "get_data_schema", "get_ui_schema", "get_schemas"]
+
+
+def measure_best_time(run: Callable[[], object], prepare: Callable[[], object], repeats: int) -> float:
+    """
+    Returns the best time of the repeated runs (the least disturbed one), prepare isn't measured
+        - garbage collector is disabled during the runs (same as timeit does)
+    """
+    best_time = None
+    for _ in range(repeats):
+        prepare()
+        gc.collect()
+        gc.disable()
+        try:
+            start_time = time.perf_counter()
+            run()
+            run_time = time.perf_counter() - start_time
+        finally:
+            gc.enable()
+        if best_time is None or run_time < best_time:
+            best_time = run_time
+    return best_time
+
+
+def clear_definitions(json_schema_form: JsonSchemaForm):
+    """
+    Drops all the cached definitions, so the schemas are emitted from scratch
+    """
+    stack = list(json_schema_form.inputs)
+    while stack:
+        form_input = stack.pop()
+        form_input.definition = None
+        form_input.ui_hidden_definition = None
+        stack += form_input.get_child_inputs()
+    json_schema_form.invalidate_definitions()
+
+
+def benchmark_workload(document: dict, repeats: int) -> Dict[str, float]:
+    inputs_factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+    inputs = []
+
+    def create_inputs():
+        inputs[:] = [inputs_factory.create_input(key, value) for key, value in document.items()]
+
+    results = {"create_input": measure_best_time(create_inputs, lambda: None, repeats)}
+    json_schema_form = JsonSchemaForm.from_inputs(inputs, items_are_invisible=True)
+    for stage in STAGES[1:]:
+        results[stage] = measure_best_time(
+            getattr(json_schema_form, stage),
+            lambda: clear_definitions(json_schema_form),
+            repeats
+        )
+    return results
+
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: dict) -> List[str]:
+    """
+    Returns the descriptions of the timings slower than their baseline times the threshold
+        - baseline thresholds: {"default": ratio, "<workload>.<stage>": ratio, ...}
+    """
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for workload, stages_results in results.items():
+        for stage, result in stages_results.items():
+            baseline_result = baseline.get("results", {}).get(workload, {}).get(stage)
+            if baseline_result is None:
+                continue
+            threshold = thresholds.get(workload + "." + stage, thresholds.get("default", DEFAULT_THRESHOLD))
+            if result > baseline_result * threshold and result - baseline_result > MIN_REGRESSION:
+                regressions.append("{}.{}: {:.4f} s (baseline {:.4f} s, threshold {:.2f}x)".format(
+                    workload,
+                    stage,
+                    result,
+                    baseline_result,
+                    threshold
+                ))
+    return regressions
+
+
+def main():
+    cli_arguments = CliArguments(
+        sys.argv[1:],
+        optional_arguments=["save-baseline", "baseline", "threshold", "scale", "repeats", "workloads"]
+    )
+    baseline_path = DEFAULT_BASELINE_PATH
+    if cli_arguments.is_argument_set("baseline"):
+        baseline_path = Path(cli_arguments.get_argument_value("baseline"))
+    scale = float(cli_arguments.get_argument_value("scale")) if cli_arguments.is_argument_set("scale") else 1.0
+    repeats = DEFAULT_REPEATS
+    if cli_arguments.is_argument_set("repeats"):
+        repeats = int(cli_arguments.get_argument_value("repeats"))
+    workloads = list(WORKLOADS)
+    if cli_arguments.is_argument_set("workloads"):
+        workloads = cli_arguments.get_argument_value("workloads").split(",")
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.is_file() else {}
+    if cli_arguments.is_argument_set("threshold"):
+        baseline["thresholds"] = {"default": float(cli_arguments.get_argument_value("threshold"))}
+    if baseline and baseline.get("scale", 1.0) != scale:
+        print("Baseline has been measured with scale {}, the comparison is not meaningful".format(baseline["scale"]))
+    results = {}
+    print("{:<24} {:>16} {:>16} {:>16} {:>16}".format("workload [ms]", *STAGES))
+    for workload in workloads:
+        results[workload] = {
+            stage: round(result, 6) for stage, result in benchmark_workload(WORKLOADS[workload](scale), repeats).items()
+        }
+        print("{:<24} {:>16.2f} {:>16.2f} {:>16.2f} {:>16.2f}".format(
+            workload,
+            *(results[workload][stage] * 1000 for stage in STAGES)
+        ))
+    if cli_arguments.is_argument_set("save-baseline"):
+        baseline_path.write_text(json.dumps({
+            "scale": scale,
+            "thresholds": baseline.get("thresholds", {"default": DEFAULT_THRESHOLD}),
+            "results": {**baseline.get("results", {}), **results}
+        }, indent=2) + "\n")
+        print("Baseline saved to " + str(baseline_path))
+        return
+    regressions = find_regressions(results, baseline)
+    for regression in regressions:
+        print("Regression: " + regression)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
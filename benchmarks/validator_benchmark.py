@@ -0,0 +1,76 @@
+"""
+Form data validation benchmark - interpreting the data schema on every call vs the compiled validator
+(the submitted data are the records of the realistic API payload, the schema is generated from all of them)
+
+python3 -m benchmarks.validator_benchmark [validations count]
+"""
+import re
+import sys
+import time
+from src.json_schema_form import JsonSchemaForm
+from src.schema_validator import ValidatorCompiler, get_validator, CAST_TYPE_PATTERNS
+from src.string_formats import DEFAULT_STRING_FORMATS
+from benchmarks.workloads import create_api_payload
+
+
+TYPES = {"string": str, "integer": int, "float": (int, float), "boolean": bool, "object": dict, "array": list}
+
+
+def interpret_schema(definition: dict, value, pointer: str = "") -> list:
+    """
+    Generic validation - the definition is interpreted for every value (same rules as the compiled validator)
+    """
+    errors = []
+    if "type" not in definition:
+        return errors
+    valid_type = isinstance(value, TYPES[definition["type"]]) and (
+        definition["type"] == "boolean" or not isinstance(value, bool)
+    )
+    if definition.get("cast_type") in CAST_TYPE_PATTERNS:
+        valid_type = isinstance(value, str) and re.fullmatch(CAST_TYPE_PATTERNS[definition["cast_type"]], value) \
+            or isinstance(value, TYPES[definition["cast_type"]]) and not isinstance(value, bool)
+    elif definition.get("format") in DEFAULT_STRING_FORMATS:
+        valid_type = valid_type and re.fullmatch(DEFAULT_STRING_FORMATS[definition["format"]][0], value)
+    if not valid_type:
+        return [{"pointer": pointer, "message": "must be " + definition["type"]}]
+    if definition["type"] == "object":
+        for name in definition.get("required", []):
+            if name not in value:
+                errors.append({"pointer": pointer + "/" + name, "message": "is required"})
+        for name, property_definition in definition.get("properties", {}).items():
+            if name in value:
+                errors += interpret_schema(property_definition, value[name], pointer + "/" + name)
+    elif definition["type"] == "array":
+        for index, item in enumerate(value):
+            errors += interpret_schema(definition.get("items", {}), item, pointer + "/" + str(index))
+    return errors
+
+
+def measure(name: str, validate, records: list, validations_count: int):
+    start_time = time.perf_counter()
+    for index in range(validations_count):
+        errors = validate(records[index % len(records)])
+        assert not errors, errors
+    duration = time.perf_counter() - start_time
+    print("{:<12} {:10.2f} us/validation {:12.0f} validations/s".format(
+        name,
+        duration / validations_count * 1e6,
+        validations_count / duration
+    ))
+
+
+def main():
+    validations_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = create_api_payload(0.2)["data"]
+    data_schema = JsonSchemaForm.from_records(records, items_are_required=False, detect_formats=True).get_data_schema()
+    start_time = time.perf_counter()
+    compiled_validator = ValidatorCompiler(data_schema).compile()
+    print("compilation  {:10.2f} us".format((time.perf_counter() - start_time) * 1e6))
+    measure("interpreted", lambda record: interpret_schema(data_schema, record), records, validations_count)
+    measure("compiled", compiled_validator, records, validations_count)
+    # the schema submitted with every request (hashed and looked up in the validators cache)
+    measure("cached", lambda record: get_validator(data_schema)(record), records, validations_count)
+
+
+if __name__ == "__main__":
+    main()
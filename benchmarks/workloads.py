@@ -0,0 +1,121 @@
+"""
+Synthetic workload generators of the benchmark suite
+    - documents are deterministic (seeded), so the timings are comparable across the runs
+    - scale multiplies the documents sizes (not the nesting depth)
+"""
+import random
+
+
+def create_wide_object(scale: float = 1.0) -> dict:
+    """
+    One object with a lot of properties of mixed types
+    """
+    generator = random.Random(1)
+    values = ["foo", 1, 1.5, True, {"nested": "foo"}, [1, 2]]
+    return {
+        "wideObject": {
+            "property_" + str(index): generator.choice(values) for index in range(int(20000 * scale))
+        }
+    }
+
+
+def create_deep_nesting(scale: float = 1.0) -> dict:
+    """
+    Objects and arrays nested deep (within the recursion limit of the recursive engine)
+    """
+    document = value = {}
+    for level in range(150):
+        if level % 2:
+            value["level" + str(level)] = [{"id": level, "name": "foo"}]
+            value = value["level" + str(level)][0]
+        else:
+            value["level" + str(level)] = {"id": level}
+            value = value["level" + str(level)]
+    return {"deepNesting": document, "repeated": [document] * max(1, int(10 * scale))}
+
+
+def create_long_homogeneous_array(scale: float = 1.0) -> dict:
+    """
+    Long array of the items with the same structure
+    """
+    generator = random.Random(2)
+    return {
+        "homogeneousItems": [
+            {
+                "id": index,
+                "name": "item" + str(index),
+                "price": generator.random() * 100,
+                "inStock": generator.random() > 0.5,
+                "tags": ["foo", "bar"],
+                "dimensions": {"width": generator.randint(1, 100), "height": generator.randint(1, 100)}
+            }
+            for index in range(int(50000 * scale))
+        ]
+    }
+
+
+def create_heterogeneous_array(scale: float = 1.0) -> dict:
+    """
+    Long array of the objects with varying properties (the items are merged)
+    """
+    generator = random.Random(3)
+    keys = ["key" + str(index) for index in range(200)]
+    values = ["foo", 1, True, {"nested": "foo"}, {"nested": "foo", "other": 1}, ["foo"]]
+    return {
+        "heterogeneousItems": [
+            {key: values[keys.index(key) % len(values)] for key in generator.sample(keys, generator.randint(1, 20))}
+            for _ in range(int(10000 * scale))
+        ]
+    }
+
+
+def create_api_payload(scale: float = 1.0) -> dict:
+    """
+    Realistic API response - paginated users with addresses, orders and optional fields
+    """
+    generator = random.Random(4)
+    users = []
+    for index in range(int(5000 * scale)):
+        user = {
+            "id": index,
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": "john.doe" + str(index) + "@example.com",
+            "isActive": generator.random() > 0.2,
+            "createdAt": "2024-01-01T00:00:00Z",
+            "address": {
+                "street": "Main Street " + str(index),
+                "city": "Prague",
+                "zipCode": "110 00",
+                "geo": {"lat": 50.08, "lng": 14.43}
+            },
+            "orders": [
+                {
+                    "orderId": "order" + str(order),
+                    "total": generator.random() * 1000,
+                    "items": [{"sku": "sku" + str(item), "quantity": item + 1} for item in range(3)],
+                    "shipping": {"method": "express", "trackingNumber": "123"}
+                }
+                for order in range(generator.randint(0, 4))
+            ],
+            "tags": ["customer", "newsletter"][0:generator.randint(0, 2)]
+        }
+        if generator.random() > 0.7:
+            user["company"] = {"name": "Acme", "vatId": "CZ123", "employees": 10}
+        if generator.random() > 0.9:
+            user["preferences"] = {"language": "cs", "notifications": {"email": True, "sms": False}}
+        users.append(user)
+    return {
+        "data": users,
+        "pagination": {"page": 1, "perPage": len(users), "total": len(users) * 10, "nextCursor": "abc"},
+        "meta": {"requestId": "req-1", "durationMs": 12}
+    }
+
+
+WORKLOADS = {
+    "wide_object": create_wide_object,
+    "deep_nesting": create_deep_nesting,
+    "long_homogeneous_array": create_long_homogeneous_array,
+    "heterogeneous_array": create_heterogeneous_array,
+    "api_payload": create_api_payload
+}
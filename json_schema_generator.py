@@ -1,43 +1,195 @@
 import os
 import sys
-import json
+from itertools import repeat
 from pathlib import Path
-from src.cli_arguments import CliArguments, ArgumentNotFound
-from src.json_schema_form import JsonSchemaForm
+from src.cli_arguments import CliArguments, ArgumentNotFound, ArgumentValueNotDefined
+from src.batch_generator import BatchGenerator, load_json_schema_form, load_json_schema_document, find_json_paths, \
+    get_json_schema_document, get_schema_paths
+from src.json_lines import ProgressReporter, read_json_lines
+from src.sharded_inference import ShardedSchemaInference
+from src.schema_server import SchemaServer
+from src.schema_cache import SchemaCache
+from src.incremental_update import IncrementalSchemaUpdater
+from src.schema_writer import JsonSchemaWriter, write_json_schema_document
+from src.json_backend import get_json_backend, JSON_BACKEND_ENVIRONMENT_VARIABLE
+from src.generation_stats import GenerationStats, measure_phase
+from src.input_budget import InputBudget, BudgetNotSupported
+from src.json_pointer import PointerNotSupported
 
 
 try:
     # parsing the CLI arguments
     cli_arguments = CliArguments(
         sys.argv[1:],
-        mandatory_arguments=["input"],
-        optional_arguments=["required-items", "invisible-items", "cast-types"]
+        optional_arguments=[
+            "input", "required-items", "invisible-items", "cast-types", "detect-formats", "stream", "jsonl", "progress",
+            "batch", "workers", "output-dir", "sharded", "iterative",
+            "shared-definitions", "serve", "host", "port", "max-body-size",
+            "cache", "cache-size", "cache-bypass", "cache-clear", "update-schema",
+            "compact", "json-backend", "stats", "max-depth", "max-properties", "max-array-items", "timeout",
+            "pointer"
+        ]
     )
+    if cli_arguments.is_argument_set("json-backend"):
+        # validated here, used by all the worker processes then
+        get_json_backend(cli_arguments.get_argument_value("json-backend"))
+        os.environ[JSON_BACKEND_ENVIRONMENT_VARIABLE] = cli_arguments.get_argument_value("json-backend")
+    json_backend = get_json_backend()
+    json_schema_form_options = {
+        "items_are_required": cli_arguments.is_argument_set("required-items"),
+        "items_are_invisible": cli_arguments.is_argument_set("invisible-items"),
+        "cast_types": cli_arguments.is_argument_set("cast-types"),
+        "detect_formats": cli_arguments.is_argument_set("detect-formats")
+    }
+    budget_limits = {
+        limit.replace("-", "_"): (float if limit == "timeout" else int)(cli_arguments.get_argument_value(limit))
+        for limit in ["max-depth", "max-properties", "max-array-items", "timeout"]
+        if cli_arguments.is_argument_set(limit)
+    }
+    if budget_limits:
+        # limits of the untrusted inputs inference
+        json_schema_form_options["budget"] = InputBudget(**budget_limits)
+    load_options = {
+        "stream": cli_arguments.is_argument_set("stream"),
+        "json_lines": cli_arguments.is_argument_set("jsonl"),
+        "iterative": cli_arguments.is_argument_set("iterative"),
+        **json_schema_form_options
+    }
+    if cli_arguments.is_argument_set("pointer"):
+        # only the object the JSON pointer refers to is inferred
+        load_options["pointer"] = cli_arguments.get_argument_value("pointer")
+    document_options = {
+        "shared_definitions": cli_arguments.is_argument_set("shared-definitions")
+    }
+    # pretty or compact output
+    indent = None if cli_arguments.is_argument_set("compact") else 2
+    schema_cache = None
+    if cli_arguments.is_argument_set("cache"):
+        try:
+            cache_dir = cli_arguments.get_argument_value("cache")
+        except ArgumentValueNotDefined:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "json-schema-generator")
+        cache_size = SchemaCache.default_max_size
+        if cli_arguments.is_argument_set("cache-size"):
+            # defined in megabytes
+            cache_size = int(float(cli_arguments.get_argument_value("cache-size")) * 1024 * 1024)
+        schema_cache = SchemaCache(cache_dir, cache_size, bypass=cli_arguments.is_argument_set("cache-bypass"))
+        if cli_arguments.is_argument_set("cache-clear"):
+            schema_cache.clear()
+            if not cli_arguments.is_argument_set("input"):
+                sys.exit(0)
+    if cli_arguments.is_argument_set("serve"):
+        # serving the schema requests until interrupted
+        host = cli_arguments.get_argument_value("host") if cli_arguments.is_argument_set("host") else "127.0.0.1"
+        port = int(cli_arguments.get_argument_value("port")) if cli_arguments.is_argument_set("port") else 8000
+        max_body_size = SchemaServer.default_max_body_size
+        if cli_arguments.is_argument_set("max-body-size"):
+            # megabytes
+            max_body_size = int(float(cli_arguments.get_argument_value("max-body-size")) * 1024 * 1024)
+        SchemaServer(
+            (host, port),
+            json_schema_form_options,
+            iterative=load_options["iterative"],
+            document_options=document_options,
+            max_body_size=max_body_size
+        ).serve_until_interrupted()
+        sys.exit(0)
     # input JSON path detection and validation
     try:
         json_path = cli_arguments.get_argument_value("input")
     except ArgumentNotFound:
         raise Exception("JSON file path must be set as a first argument")
-    if not os.path.isfile(json_path):
-        raise Exception("Defined JSON file doesn't exist")
-    # loading JSON file content
-    json_string = Path(json_path).read_text()
-    # generating the schema
-    json_schema_form = JsonSchemaForm(
-        json.loads(json_string),
-        items_are_required=cli_arguments.is_argument_set("required-items"),
-        items_are_invisible=cli_arguments.is_argument_set("invisible-items"),
-        cast_types=cli_arguments.is_argument_set("cast-types")
-    )
-    # printing the schema on the standard output
-    print(
-        json.dumps(
-            {
-                "dataschema": json_schema_form.get_data_schema(),
-                "uischema": json_schema_form.get_ui_schema()
-            },
-            indent=2
+    workers_count = None
+    if cli_arguments.is_argument_set("workers"):
+        workers_count = int(cli_arguments.get_argument_value("workers"))
+    if cli_arguments.is_argument_set("update-schema"):
+        if "budget" in json_schema_form_options:
+            raise BudgetNotSupported("schema update")
+        if "pointer" in load_options:
+            raise PointerNotSupported("schema update")
+        # folding the input records into the previously generated schema
+        schema_updater = IncrementalSchemaUpdater(
+            json_backend.loads(Path(cli_arguments.get_argument_value("update-schema")).read_bytes())["dataschema"],
+            **json_schema_form_options
         )
-    )
+        changes = []
+        with open(json_path) as json_file:
+            if load_options["json_lines"]:
+                records = read_json_lines(json_file)
+            else:
+                records = [json_backend.loads(json_file.read())]
+            for record in records:
+                changes += schema_updater.update(record)
+        JsonSchemaWriter(sys.stdout, indent).write(
+            {**get_json_schema_document(schema_updater.json_schema_form, **document_options), "changes": changes}
+        )
+        print()
+    elif cli_arguments.is_argument_set("batch"):
+        # generating the schemas of all the input files in parallel
+        batch_generator = BatchGenerator(
+            load_options,
+            workers_count=workers_count,
+            document_options=document_options,
+            schema_cache=schema_cache
+        )
+        output_dir = None
+        if cli_arguments.is_argument_set("output-dir"):
+            output_dir = cli_arguments.get_argument_value("output-dir")
+            os.makedirs(output_dir, exist_ok=True)
+        json_paths = find_json_paths(json_path)
+        schema_paths = get_schema_paths(json_paths, output_dir) if output_dir is not None else repeat(None)
+        for result, schema_path in zip(batch_generator.generate(json_paths), schema_paths):
+            if output_dir is None:
+                # one JSON line per input file on the standard output
+                print(json_backend.dumps(result))
+            elif "error" in result:
+                print("Error: " + result["input"] + ": " + result["error"], file=sys.stderr)
+            else:
+                # one schema file per input file (unique even for the inputs of the same name)
+                del result["input"]
+                Path(schema_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(schema_path).write_text(json_backend.dumps(result, indent))
+    else:
+        # generating the schema
+        generation_stats = GenerationStats() if cli_arguments.is_argument_set("stats") else None
+        load_arguments = {
+            "progress_reporter": ProgressReporter() if cli_arguments.is_argument_set("progress") else None,
+            "sharded_inference": (
+                ShardedSchemaInference(json_schema_form_options, workers_count=workers_count)
+                if cli_arguments.is_argument_set("sharded") else None
+            ),
+            # the collector isn't a part of the cache key (it doesn't affect the document)
+            "stats": generation_stats
+        }
+        if generation_stats is not None:
+            generation_stats.start()
+        if schema_cache is None and generation_stats is None:
+            # writing the schema on the standard output while its definitions are created
+            write_json_schema_document(
+                load_json_schema_form(json_path, **load_options, **load_arguments),
+                sys.stdout,
+                indent,
+                **document_options
+            )
+        else:
+            # the document is built as a whole (cached document or separately measured emission and serialization)
+            json_schema_document = load_json_schema_document(
+                json_path,
+                load_options,
+                document_options,
+                schema_cache,
+                **load_arguments
+            )
+            with measure_phase(generation_stats, "serialization"):
+                # written without recursion (the deep documents of the iterative inference)
+                JsonSchemaWriter(sys.stdout, indent).write(json_schema_document)
+        print()
+        if generation_stats is not None:
+            generation_stats.stop()
+            try:
+                stats_path = cli_arguments.get_argument_value("stats")
+                Path(stats_path).write_text(json_backend.dumps(generation_stats.get_report(), indent=2))
+            except ArgumentValueNotDefined:
+                generation_stats.write_report(sys.stderr)
 except Exception as e:
     print("Error: " + str(e))
@@ -8,5 +8,8 @@ setup(
     license='https://opensource.org/licenses/MIT',
     author='Ondrej Tom',
     author_email='odis@meiro.io',
-    description='JSON schema generator'
+    description='JSON schema generator',
+    extras_require={
+        'orjson': ['orjson']
+    }
 )
@@ -0,0 +1,165 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, Callable, Iterable, List, Tuple, Union
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, JsonSchemaFormInputFactory, SchemaIsNotObject
+from src.sharded_inference import infer_array_shard
+from src.batch_generator import get_json_schema_document
+from src.input_budget import BudgetNotSupported
+
+
+def infer_inputs(items: List[Tuple[str, object]], json_schema_form_options: dict) -> List[JsonSchemaFormInput]:
+    """
+    Infers the inputs of the document items (key, value)
+    """
+    inputs_factory = JsonSchemaFormInputFactory(
+        json_schema_form_options.get("items_are_required", True),
+        json_schema_form_options.get("cast_types", False),
+        json_schema_form_options.get("detect_formats", False)
+    )
+    return [inputs_factory.create_input(key, value) for key, value in items]
+
+
+def infer_records(records: List[dict], json_schema_form_options: dict) -> JsonSchemaForm:
+    return JsonSchemaForm.from_records(records, **json_schema_form_options)
+
+
+class AsyncSchemaGenerator:
+    """
+    Generates the schema documents ({"dataschema": ..., "uischema": ...}) in the asyncio applications without
+    blocking the event loop
+        - inference and emission run in the executor (default executor of the event loop if None),
+          process pool executor can be used as well (the jobs and their results are picklable)
+        - at most max_concurrency generations run at a time, the others wait for their turn
+        - large inputs are inferred by chunks of chunk_items (top level arrays items, document keys or records),
+          every chunk is a separate executor job, so one big input doesn't stall the other generations
+        - cancelling the generation task stops it after the currently running job (running jobs can't be interrupted)
+        - the result is the same as get_json_schema_document of JsonSchemaForm(document, **json_schema_form_options)
+    """
+
+    default_max_concurrency = 4
+    default_chunk_items = 1000
+
+    def __init__(self, json_schema_form_options: dict = None, executor: Executor = None,
+                 max_concurrency: int = default_max_concurrency, chunk_items: int = default_chunk_items):
+        """
+        json_schema_form_options: items_are_required, items_are_invisible, cast_types, detect_formats
+            (see JsonSchemaForm)
+
+        :raises InvalidAsyncParameter if the concurrency or chunk items is not a positive number
+        :raises BudgetNotSupported if the form options contain a budget (the chunks are inferred separately)
+        """
+        if (json_schema_form_options or {}).get("budget") is not None:
+            raise BudgetNotSupported("async generator")
+        if max_concurrency < 1:
+            raise InvalidAsyncParameter("max concurrency", max_concurrency)
+        if chunk_items < 1:
+            raise InvalidAsyncParameter("chunk items", chunk_items)
+        self.json_schema_form_options = json_schema_form_options or {}
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.chunk_items = chunk_items
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate(self, document: dict, shared_definitions: bool = False) -> dict:
+        """
+        :raises SchemaIsNotObject if the document is not an object
+        """
+        if not isinstance(document, dict):
+            raise SchemaIsNotObject()
+        async with self.semaphore:
+            json_schema_form = JsonSchemaForm.from_inputs(
+                await self._infer_document_inputs(document),
+                **self.json_schema_form_options
+            )
+            return await self._run(get_json_schema_document, json_schema_form, shared_definitions)
+
+    async def generate_from_records(self, records: Union[Iterable[dict], AsyncIterable[dict]],
+                                    shared_definitions: bool = False) -> dict:
+        """
+        Generates the schema fitting all the records (see JsonSchemaForm.from_records)
+            - records can be an async iterable (e.g. a request body stream), they are consumed chunk by chunk
+
+        :raises SchemaIsNotObject if any of the records is not an object
+        """
+        async with self.semaphore:
+            json_schema_form = None
+            async for records_chunk in self._iterate_chunks(records):
+                chunk_form = await self._run(infer_records, records_chunk, self.json_schema_form_options)
+                if json_schema_form is None:
+                    json_schema_form = chunk_form
+                else:
+                    json_schema_form.merge(chunk_form)
+            if json_schema_form is None:
+                json_schema_form = JsonSchemaForm({}, **self.json_schema_form_options)
+            return await self._run(get_json_schema_document, json_schema_form, shared_definitions)
+
+    async def _infer_document_inputs(self, document: dict) -> List[JsonSchemaFormInput]:
+        """
+        Long top level arrays are inferred by chunks (merged in order), the other items are inferred in groups
+        """
+        inputs = []
+        pending_items = []
+        for key, value in document.items():
+            if isinstance(value, list) and len(value) > self.chunk_items:
+                if pending_items:
+                    inputs += await self._run(infer_inputs, pending_items, self.json_schema_form_options)
+                    pending_items = []
+                inputs.append(await self._infer_array_input(key, value))
+                continue
+            pending_items.append((key, value))
+            if len(pending_items) >= self.chunk_items:
+                inputs += await self._run(infer_inputs, pending_items, self.json_schema_form_options)
+                pending_items = []
+        if pending_items:
+            inputs += await self._run(infer_inputs, pending_items, self.json_schema_form_options)
+        return inputs
+
+    async def _infer_array_input(self, key: str, items: list) -> JsonSchemaFormInput:
+        array_input = None
+        for start in range(0, len(items), self.chunk_items):
+            chunk_input = await self._run(
+                infer_array_shard,
+                key,
+                items[start:start + self.chunk_items],
+                self.json_schema_form_options
+            )
+            # merging is proportional to the schema size (not the data size), it runs in the event loop
+            if array_input is None:
+                array_input = chunk_input
+            else:
+                array_input.merge(chunk_input)
+        return array_input
+
+    async def _iterate_chunks(self, records: Union[Iterable[dict], AsyncIterable[dict]]):
+        records_chunk = []
+        if isinstance(records, AsyncIterable):
+            async for record in records:
+                records_chunk.append(record)
+                if len(records_chunk) >= self.chunk_items:
+                    yield records_chunk
+                    records_chunk = []
+        else:
+            for record in records:
+                records_chunk.append(record)
+                if len(records_chunk) >= self.chunk_items:
+                    yield records_chunk
+                    records_chunk = []
+        if records_chunk:
+            yield records_chunk
+
+    async def _run(self, function: Callable, *arguments):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *arguments)
+
+
+class AsyncGeneratorException(Exception):
+    pass
+
+
+class InvalidAsyncParameter(AsyncGeneratorException):
+
+    def __init__(self, parameter_name: str, value: int):
+        self.parameter_name = parameter_name
+        self.value = value
+
+    def __str__(self) -> str:
+        return "Async generator " + self.parameter_name + " must be a positive number, " + str(self.value) + " given"
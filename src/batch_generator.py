@@ -0,0 +1,280 @@
+import os
+import glob
+from itertools import repeat
+from typing import List, Iterator
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from src.json_schema_form import JsonSchemaForm
+from src.json_lines import ProgressReporter, read_json_lines
+from src.sharded_inference import ShardedSchemaInference
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.shared_definitions import SharedDefinitionsEmitter
+from src.schema_cache import SchemaCache
+from src.json_backend import get_json_backend
+from src.input_budget import InputBudget, BudgetNotSupported
+from src.json_pointer import PointerNotSupported
+from src.generation_stats import GenerationStats, measure_phase
+
+
+def load_json_schema_form(json_path: str, stream: bool = False, json_lines: bool = False, iterative: bool = False,
+                          progress_reporter: ProgressReporter = None, sharded_inference: ShardedSchemaInference = None,
+                          pointer: str = None, **json_schema_form_options) -> JsonSchemaForm:
+    """
+    Creates the form from the JSON file
+        - stream: parses the file as a stream (the whole document is never loaded into memory)
+        - json_lines: the file contains one record per line, the form fits all of them
+        - iterative: uses the explicit stack engine (nesting depth isn't limited by the recursion limit)
+        - progress_reporter: reports the JSON lines processing progress
+        - sharded_inference: infers the form in multiple processes (its form options are used)
+        - pointer: JSON pointer of the object the form is created for, the rest of the document isn't inferred
+          (see JsonSchemaForm.from_pointer)
+        - json_schema_form_options: JsonSchemaForm keyword arguments (budget isn't supported by the stream and
+          sharded inference, the inputs inferred by the sharded inference workers aren't collected by the stats)
+
+    :raises JsonFileNotFound if the file doesn't exist
+    :raises BudgetNotSupported if the budget is used with the stream or sharded inference
+    :raises PointerNotSupported if the pointer is used with the stream, JSON lines or sharded inference
+    """
+    if not os.path.isfile(json_path):
+        raise JsonFileNotFound(json_path)
+    check_load_options(stream, json_lines, sharded_inference, pointer, json_schema_form_options.get("budget"))
+    stats = json_schema_form_options.get("stats")
+    if sharded_inference is not None:
+        if json_lines:
+            with measure_phase(stats, "inference"):
+                json_schema_form = sharded_inference.infer_json_lines(json_path)
+        else:
+            document = load_json_document(json_path, stats)
+            with measure_phase(stats, "inference"):
+                json_schema_form = sharded_inference.infer_document(document, stats)
+        # the emission of the merged form is collected
+        json_schema_form.stats = stats
+        return json_schema_form
+    form_class = IterativeJsonSchemaForm if iterative else JsonSchemaForm
+    if json_lines:
+        # the records are read and parsed during the inference
+        with open(json_path) as json_lines_stream, measure_phase(stats, "inference"):
+            return form_class.from_records(
+                read_json_lines(json_lines_stream, progress_reporter),
+                **json_schema_form_options
+            )
+    if stream:
+        # the stream is read and parsed during the inference
+        with open(json_path) as json_stream, measure_phase(stats, "inference"):
+            return form_class.from_json_stream(json_stream, **json_schema_form_options)
+    document = load_json_document(json_path, stats)
+    with measure_phase(stats, "inference"):
+        if pointer is not None:
+            return form_class.from_pointer(document, pointer, **json_schema_form_options)
+        return form_class(document, **json_schema_form_options)
+
+
+def check_load_options(stream: bool = False, json_lines: bool = False,
+                       sharded_inference: ShardedSchemaInference = None, pointer: str = None,
+                       budget: InputBudget = None, **load_options):
+    """
+    Checks the combination of the load_json_schema_form options
+
+    :raises BudgetNotSupported if the budget is used with the stream or sharded inference
+    :raises PointerNotSupported if the pointer is used with the stream, JSON lines or sharded inference
+    """
+    if budget is not None and (stream or sharded_inference is not None):
+        raise BudgetNotSupported("stream inference" if stream else "sharded inference")
+    if pointer is not None and (stream or json_lines or sharded_inference is not None):
+        raise PointerNotSupported(
+            "stream inference" if stream else "JSON lines inference" if json_lines else "sharded inference"
+        )
+
+
+def load_json_document(json_path: str, stats: GenerationStats = None):
+    """
+    Parses the memory-mapped file (see JsonBackend.load_file), so the file is read while it's parsed
+    """
+    with measure_phase(stats, "parse"):
+        return get_json_backend().load_file(json_path)
+
+
+def get_json_schema_document(json_schema_form: JsonSchemaForm, shared_definitions: bool = False) -> dict:
+    """
+    shared_definitions: structurally identical objects are defined only once (see SharedDefinitionsEmitter)
+    """
+    if shared_definitions:
+        with measure_phase(json_schema_form.stats, "data_schema"):
+            data_schema = SharedDefinitionsEmitter().get_data_schema(json_schema_form)
+        ui_schema = json_schema_form.get_ui_schema()
+    else:
+        # both schemas are created in one walk of the inputs tree
+        data_schema, ui_schema = json_schema_form.get_schemas()
+    if json_schema_form.stats is not None:
+        json_schema_form.stats.count_kept_inputs(json_schema_form)
+    json_schema_document = {
+        "dataschema": data_schema,
+        "uischema": ui_schema
+    }
+    if json_schema_form.exceeded_budget:
+        # the schema has been inferred from a part of the input only
+        json_schema_document["budget"] = json_schema_form.exceeded_budget
+    return json_schema_document
+
+
+def load_json_schema_document(json_path: str, load_options: dict, document_options: dict,
+                              schema_cache: SchemaCache = None, **load_arguments) -> dict:
+    """
+    Creates the schema document of the JSON file
+        - load_options: load_json_schema_form keyword arguments (including the form options)
+        - document_options: get_json_schema_document keyword arguments
+        - schema_cache: cached document is returned without loading the file (generated document is cached)
+        - load_arguments: load_json_schema_form arguments not affecting the document (progress reporter, stats, ...)
+
+    :raises JsonFileNotFound if the file doesn't exist
+    :raises BudgetNotSupported if the budget is used with the stream or sharded inference
+    :raises PointerNotSupported if the pointer is used with the stream, JSON lines or sharded inference
+    """
+    if schema_cache is None:
+        return get_json_schema_document(
+            load_json_schema_form(json_path, **load_options, **load_arguments),
+            **document_options
+        )
+    if not os.path.isfile(json_path):
+        raise JsonFileNotFound(json_path)
+    # the cached document of the same options without the stream inference must not hide the unsupported options
+    check_load_options(**load_options, **load_arguments)
+    cache_key = schema_cache.get_key(json_path, {**load_options, **document_options})
+    json_schema_document = schema_cache.get(cache_key)
+    if json_schema_document is None:
+        json_schema_document = get_json_schema_document(
+            load_json_schema_form(json_path, **load_options, **load_arguments),
+            **document_options
+        )
+        # the input part inferred before the deadline depends on the machine load
+        if "timeout" not in json_schema_document.get("budget", {}):
+            schema_cache.set(cache_key, json_schema_document)
+    return json_schema_document
+
+
+def find_json_paths(input_pattern: str) -> List[str]:
+    """
+    Resolves the batch input - comma separated list of file paths, directories (their *.json files) and glob patterns
+    """
+    json_paths = []
+    for pattern in input_pattern.split(","):
+        if os.path.isdir(pattern):
+            json_paths += sorted(glob.glob(os.path.join(glob.escape(pattern), "*.json")))
+        elif glob.has_magic(pattern):
+            json_paths += sorted(glob.glob(pattern, recursive=True))
+        else:
+            # non-existing files are reported as the file errors
+            json_paths.append(pattern)
+    return json_paths
+
+
+def get_schema_paths(json_paths: List[str], output_dir: str) -> List[str]:
+    """
+    Returns the paths of the batch inputs schema files in the output directory (<input name>.schema.json)
+        - inputs of the same name are placed in the subdirectories of their paths relative to the common directory
+          of those inputs (a/s.json, b/s.json -> a/s.schema.json, b/s.schema.json)
+        - the rest of the names collisions (e.g. the input listed twice) get a numeric suffix (s-2.schema.json)
+    """
+    # input name -> directories of the inputs of the name
+    names_directories = {}
+    for json_path in json_paths:
+        names_directories.setdefault(Path(json_path).stem, []).append(os.path.dirname(os.path.abspath(json_path)))
+    schema_paths = []
+    schema_names = set()
+    for json_path in json_paths:
+        schema_name = Path(json_path).stem
+        if len(names_directories[schema_name]) > 1:
+            try:
+                common_directory = os.path.commonpath(names_directories[schema_name])
+                schema_name = os.path.normpath(os.path.join(
+                    os.path.relpath(os.path.dirname(os.path.abspath(json_path)), common_directory),
+                    schema_name
+                ))
+            except ValueError:
+                # the inputs on different drives - only the suffix tells them apart
+                pass
+        unique_schema_name = schema_name
+        suffix = 1
+        while unique_schema_name in schema_names:
+            suffix += 1
+            unique_schema_name = schema_name + "-" + str(suffix)
+        schema_names.add(unique_schema_name)
+        schema_paths.append(os.path.join(output_dir, unique_schema_name + ".schema.json"))
+    return schema_paths
+
+
+def generate_batch_item(json_path: str, load_options: dict, document_options: dict,
+                        schema_cache: SchemaCache = None) -> dict:
+    """
+    Generates the schema document of one batch file (see load_json_schema_document)
+        - errors are returned in the result, so they don't abort the batch
+    """
+    try:
+        return {
+            "input": json_path,
+            **load_json_schema_document(json_path, load_options, document_options, schema_cache)
+        }
+    except Exception as e:
+        return {"input": json_path, "error": str(e)}
+
+
+class BatchGenerator:
+    """
+    Generates schemas of multiple JSON files in a pool of processes
+    """
+
+    def __init__(self, load_options: dict, workers_count: int = None, document_options: dict = None,
+                 schema_cache: SchemaCache = None):
+        """
+        load_options: load_json_schema_form keyword arguments (including the form options)
+        workers_count: number of worker processes (CPU count by default)
+        document_options: get_json_schema_document keyword arguments
+        schema_cache: cache of the generated documents shared by the workers
+        """
+        if workers_count is not None and workers_count < 1:
+            raise InvalidWorkersCount(workers_count)
+        self.load_options = load_options
+        self.document_options = document_options or {}
+        self.schema_cache = schema_cache
+        self.workers_count = workers_count or os.cpu_count() or 1
+
+    def generate(self, json_paths: List[str]) -> Iterator[dict]:
+        """
+        Yields the results in the order of the given paths:
+            {"input": ..., "dataschema": ..., "uischema": ...} or {"input": ..., "error": ...}
+        """
+        if len(json_paths) == 0:
+            return
+        # bigger chunks lower the inter-process communication overhead for the small files
+        chunk_size = max(1, len(json_paths) // (self.workers_count * 4))
+        with ProcessPoolExecutor(max_workers=self.workers_count) as executor:
+            yield from executor.map(
+                generate_batch_item,
+                json_paths,
+                repeat(self.load_options),
+                repeat(self.document_options),
+                repeat(self.schema_cache),
+                chunksize=chunk_size
+            )
+
+
+class BatchGeneratorException(Exception):
+    pass
+
+
+class JsonFileNotFound(BatchGeneratorException):
+
+    def __init__(self, json_path: str):
+        self.json_path = json_path
+
+    def __str__(self) -> str:
+        return "Defined JSON file doesn't exist"
+
+
+class InvalidWorkersCount(BatchGeneratorException):
+
+    def __init__(self, workers_count: int):
+        self.workers_count = workers_count
+
+    def __str__(self) -> str:
+        return "Workers count must be a positive number, " + str(self.workers_count) + " given"
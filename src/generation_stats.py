@@ -0,0 +1,150 @@
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, TextIO
+
+
+# collector tracing the peak memory (tracemalloc is process-wide), None when the memory isn't traced
+memory_tracing_stats = None
+
+
+class GenerationStats:
+    """
+    Collects the schema generation statistics of the forms it's passed to (stats option of JsonSchemaForm), so the
+    concurrent generations are collected separately
+        - wall time of the phases (parsing, inference, schemas emission, serialization)
+        - number of the created and discarded inputs by type and number of the merges
+        - peak memory while it's started (see start/stop or use it as a context manager) - tracemalloc is
+          process-wide, so it slows down all the generations and only one collector can trace it at a time
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases_times = {}
+        self.created_inputs = Counter()
+        self.kept_inputs = Counter()
+        self.merges_count = 0
+        self.peak_memory = None
+        self.total_time = 0.0
+        self.start_time = None
+        self.tracemalloc_started = False
+
+    def __enter__(self) -> "GenerationStats":
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        :raises MemoryAlreadyTraced if the collector traces the memory and another collector already does
+        """
+        global memory_tracing_stats
+        if self.trace_memory:
+            if memory_tracing_stats is not None:
+                raise MemoryAlreadyTraced()
+            memory_tracing_stats = self
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.tracemalloc_started = True
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        global memory_tracing_stats
+        if self.start_time is None:
+            return
+        self.total_time += time.perf_counter() - self.start_time
+        self.start_time = None
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self.tracemalloc_started:
+                tracemalloc.stop()
+                self.tracemalloc_started = False
+            memory_tracing_stats = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measures the wall time of the phase (times of the repeated phases are summed)
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases_times[name] = self.phases_times.get(name, 0.0) + time.perf_counter() - start_time
+
+    def on_input_created(self, form_input):
+        self.created_inputs[type(form_input).__name__] += 1
+
+    def on_merge(self):
+        self.merges_count += 1
+
+    def count_kept_inputs(self, json_schema_form):
+        """
+        Counts the inputs of the resulting form - the rest of the created inputs has been discarded by the merges
+        """
+        stack = list(json_schema_form.inputs)
+        while stack:
+            form_input = stack.pop()
+            self.kept_inputs[type(form_input).__name__] += 1
+            stack += form_input.get_child_inputs()
+
+    def get_report(self) -> dict:
+        return {
+            "phases": {name: round(phase_time, 6) for name, phase_time in self.phases_times.items()},
+            "total_time": round(self.total_time, 6),
+            "inputs": {
+                "created": dict(self.created_inputs),
+                "kept": dict(self.kept_inputs),
+                "discarded": dict(self.created_inputs - self.kept_inputs)
+            },
+            "merges": self.merges_count,
+            "peak_memory": self.peak_memory
+        }
+
+    def write_report(self, output: TextIO = sys.stderr):
+        """
+        Writes human readable report (see get_report for the machine readable one)
+        """
+        report = self.get_report()
+        lines = ["Phases [s]:"]
+        lines += ["    {:<16} {:10.4f}".format(name, phase_time) for name, phase_time in report["phases"].items()]
+        lines.append("    {:<16} {:10.4f}".format("total", report["total_time"]))
+        lines.append("Inputs (created / kept / discarded):")
+        # the inputs inferred in the other processes (sharded inference) are kept without being created here
+        for input_type in sorted(set(report["inputs"]["created"]) | set(report["inputs"]["kept"])):
+            lines.append("    {:<16} {:>10} {:>10} {:>10}".format(
+                input_type,
+                report["inputs"]["created"].get(input_type, 0),
+                report["inputs"]["kept"].get(input_type, 0),
+                report["inputs"]["discarded"].get(input_type, 0)
+            ))
+        lines.append("Merges: {}".format(report["merges"]))
+        if report["peak_memory"] is not None:
+            lines.append("Peak memory [MB]: {:.2f}".format(report["peak_memory"] / 1024 / 1024))
+        print("\n".join(lines), file=output)
+
+
+@contextmanager
+def measure_phase(stats: Optional[GenerationStats], name: str):
+    """
+    Measures the phase by the collector (does nothing when the statistics aren't collected)
+    """
+    if stats is None:
+        yield
+    else:
+        with stats.phase(name):
+            yield
+
+
+class GenerationStatsException(Exception):
+    pass
+
+
+class MemoryAlreadyTraced(GenerationStatsException):
+
+    def __str__(self) -> str:
+        return "Peak memory is already traced by another generation statistics collector"
@@ -0,0 +1,69 @@
+from typing import Iterable, List, Tuple
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, StringInput
+
+
+class IncrementalSchemaUpdater:
+    """
+    Folds new samples into previously generated data schema without its full regeneration
+        - the schema is loaded back into the form once, the samples are folded as the next records (see from_records)
+        - only the new properties of a sample (and the properties with string formats) are inferred
+        - cached definitions of the unchanged inputs are reused, so the schema emission rebuilds only the changed paths
+    """
+
+    def __init__(self, data_schema: dict, **json_schema_form_options):
+        """
+        json_schema_form_options: options the data schema has been generated with
+
+        :raises SchemaIsNotObject if the data schema is not an object schema
+        :raises UnknownInputType if any of the definitions type is unknown
+        """
+        self.json_schema_form = JsonSchemaForm.from_data_schema(data_schema, **json_schema_form_options)
+        # caching all the definitions, so the first update doesn't rebuild the whole schema
+        self.json_schema_form.get_data_schema()
+
+    def update(self, sample: dict) -> List[dict]:
+        """
+        Folds the sample into the schema, returns the summary of the changes:
+            [{"pointer": <JSON pointer of the added definition in the data schema>, "type": ...}, ...]
+            - string definitions whose format has been dropped are listed with "dropped_format": <format>
+
+        :raises SchemaIsNotObject if the sample is not an object
+        """
+        added_inputs, dropped_formats = self.json_schema_form.fold_record(sample)
+        return [self._get_change(form_input) for form_input in added_inputs] + [
+            self._get_dropped_format_change(string_input, string_format)
+            for string_input, string_format in dropped_formats
+        ]
+
+    def get_data_schema(self) -> dict:
+        return self.json_schema_form.get_data_schema()
+
+    def get_ui_schema(self) -> dict:
+        return self.json_schema_form.get_ui_schema()
+
+    @staticmethod
+    def _get_change(form_input: JsonSchemaFormInput) -> dict:
+        return {
+            "pointer": form_input.get_schema_pointer(),
+            "type": form_input.get_type()
+        }
+
+    @staticmethod
+    def _get_dropped_format_change(string_input: StringInput, string_format: str) -> dict:
+        return {
+            "pointer": string_input.get_schema_pointer(),
+            "type": string_input.get_type(),
+            "dropped_format": string_format
+        }
+
+
+def update_data_schema(data_schema: dict, samples: Iterable[dict],
+                       **json_schema_form_options) -> Tuple[dict, List[dict]]:
+    """
+    Returns the data schema with the samples folded in and the summary of the changes (see IncrementalSchemaUpdater)
+    """
+    schema_updater = IncrementalSchemaUpdater(data_schema, **json_schema_form_options)
+    changes = []
+    for sample in samples:
+        changes += schema_updater.update(sample)
+    return schema_updater.get_data_schema(), changes
@@ -0,0 +1,234 @@
+import math
+import time
+import random
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+
+class InputBudget:
+    """
+    Limits of the untrusted inputs inference - the parts of the input beyond the limits are left out (and reported,
+    see BudgetTracker.get_report) instead of failing or running indefinitely
+        - max_depth: containers nested deeper are inferred as empty (document properties are on the depth 1)
+        - max_properties: properties of an object over the limit are left out
+        - max_array_items: longer arrays are inferred from a uniform random sample of their items (reservoir
+          sampling seeded by the seed, so the result is reproducible), sampled items keep their order
+        - timeout: wall-clock seconds, the rest of the input is left out when the deadline passes
+        - the budget holds only the limits, so it can be shared by concurrent inferences (see start)
+    """
+
+    limits_names = ("max_depth", "max_properties", "max_array_items", "timeout")
+
+    def __init__(self, max_depth: int = None, max_properties: int = None, max_array_items: int = None,
+                 timeout: float = None, seed: int = 0):
+        """
+        :raises InvalidBudgetLimit if any of the limits is not a positive number
+        """
+        for limit_name, limit in zip(self.limits_names, (max_depth, max_properties, max_array_items, timeout)):
+            if limit is not None and limit <= 0:
+                raise InvalidBudgetLimit(limit_name, limit)
+        self.max_depth = max_depth
+        self.max_properties = max_properties
+        self.max_array_items = max_array_items
+        self.timeout = timeout
+        self.seed = seed
+
+    def start(self) -> "BudgetTracker":
+        """
+        Starts the inference of one input (its deadline is measured from now)
+        """
+        return BudgetTracker(self)
+
+
+class BudgetTracker:
+    """
+    Applies the budget to the values of one inference and records the exceeded limits
+        - the values are limited before the inference (see limit_value and limit_properties), so the limits work
+          the same way for both inference engines
+        - the deadline is checked during the inference as well (see check_inference_deadline)
+    """
+
+    # number of the locations of every exceeded limit listed in the report
+    max_reported_pointers = 10
+    # values copied (or inputs inferred) between the deadline checks
+    deadline_check_interval = 1024
+
+    def __init__(self, budget: InputBudget):
+        self.budget = budget
+        self.deadline = None if budget.timeout is None else time.monotonic() + budget.timeout
+        self.random = random.Random(budget.seed)
+        self.expired = False
+        self.values_count = 0
+        self.inferred_values_count = 0
+        # JSON pointer of the value being inferred (see start_inference)
+        self.inference_pointer = ""
+        # limit name -> [count, JSON pointers of the first locations]
+        self.exceeded_limits = {}
+
+    def limit_properties(self, value: dict, pointer: str = "") -> Iterator[Tuple[str, object, str]]:
+        """
+        Yields the properties of the object (key, limited value, JSON pointer) - the values are limited one by one
+        (see limit_value), so the properties limited before the deadline are kept, the properties left out after
+        it are reported at their pointers
+            - pointer: JSON pointer of the object in the input
+        """
+        for key, item in self._iterate_items(value, pointer):
+            item_pointer = pointer + "/" + escape_pointer_key(key)
+            if self.check_deadline(item_pointer, report_expired=True):
+                continue
+            yield key, self.limit_value(item, item_pointer, 1), item_pointer
+
+    def limit_value(self, value, pointer: str = "", depth: int = 0):
+        """
+        Returns the value within the limits - the value itself isn't changed, its containers are copied
+        (without recursion, so the deep values can be limited as well)
+            - pointer: JSON pointer of the value in the input (locations of the exceeded limits are reported with it)
+            - depth: depth of the value in the input (see InputBudget.max_depth)
+        """
+        if not isinstance(value, (dict, list)):
+            return value
+        limited_value = {} if isinstance(value, dict) else []
+        # stack items: container, its limited copy, depth of the container, JSON pointer of the container
+        stack = [(value, limited_value, depth, pointer)]
+        while stack:
+            container, limited_container, depth, container_pointer = stack.pop()
+            if self.check_deadline(container_pointer):
+                break
+            if self.budget.max_depth is not None and depth >= self.budget.max_depth:
+                if container:
+                    self._record("max_depth", container_pointer)
+                continue
+            for key, item in self._iterate_items(container, container_pointer):
+                if isinstance(item, (dict, list)):
+                    limited_item = {} if isinstance(item, dict) else []
+                    stack.append((item, limited_item, depth + 1, container_pointer + "/" + escape_pointer_key(key)))
+                else:
+                    limited_item = item
+                if isinstance(limited_container, dict):
+                    limited_container[key] = limited_item
+                else:
+                    limited_container.append(limited_item)
+                self.values_count += 1
+                if self.values_count % self.deadline_check_interval == 0 and self.check_deadline(container_pointer):
+                    break
+        return limited_value
+
+    def check_deadline(self, pointer: str, report_expired: bool = False) -> bool:
+        """
+        Returns True if the deadline has passed (the first expiration is recorded at the pointer)
+            - report_expired: the pointer is recorded after the expiration as well (the value is left out)
+        """
+        if self.expired:
+            if report_expired:
+                self._record("timeout", pointer)
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.expired = True
+            self._record("timeout", pointer)
+        return self.expired
+
+    def start_inference(self, pointer: str):
+        """
+        Starts the inference of the (limited) value - the expiration during its inference is recorded at the pointer
+        """
+        self.inference_pointer = pointer
+
+    def check_inference_deadline(self) -> bool:
+        """
+        Counts the inferred value, returns True if the deadline has passed (checked every deadline_check_interval
+        values, so the inputs factory can call it for every value)
+        """
+        if self.expired:
+            return True
+        if self.deadline is None:
+            return False
+        self.inferred_values_count += 1
+        if self.inferred_values_count % self.deadline_check_interval != 0:
+            return False
+        return self.check_deadline(self.inference_pointer)
+
+    def get_report(self) -> dict:
+        """
+        Returns the exceeded limits - {"<limit name>": {"limit": ..., "count": ..., "pointers": [...]}, ...}
+            - count: number of the locations the limit has been exceeded at (the first of them are listed)
+            - pointers: JSON pointers of the values (the truncated containers) in the input
+        """
+        return {
+            limit_name: {
+                "limit": getattr(self.budget, limit_name),
+                "count": count,
+                "pointers": pointers
+            }
+            for limit_name, (count, pointers) in self.exceeded_limits.items()
+        }
+
+    def _iterate_items(self, container, container_pointer: str) -> Iterator[Tuple[object, object]]:
+        if isinstance(container, dict):
+            if self.budget.max_properties is not None and len(container) > self.budget.max_properties:
+                self._record("max_properties", container_pointer)
+                return islice(container.items(), self.budget.max_properties)
+            return iter(container.items())
+        if self.budget.max_array_items is not None and len(container) > self.budget.max_array_items:
+            self._record("max_array_items", container_pointer)
+            return ((index, container[index]) for index in self._sample_indexes(len(container)))
+        return enumerate(container)
+
+    def _sample_indexes(self, items_count: int) -> List[int]:
+        """
+        Returns sorted indexes of the uniform random sample of max_array_items items (reservoir sampling,
+        algorithm L - the skipped items are not visited, so it's fast for the very long arrays)
+        """
+        sample_size = self.budget.max_array_items
+        reservoir = list(range(sample_size))
+        # the weight is kept as its logarithm (log(1 - weight) is computed precisely for the weights close to 1)
+        log_weight = math.log(self._random_open()) / sample_size
+        index = sample_size - 1
+        while True:
+            index += math.floor(math.log(self._random_open()) / math.log(-math.expm1(log_weight))) + 1
+            if index >= items_count:
+                break
+            reservoir[self.random.randrange(sample_size)] = index
+            log_weight += math.log(self._random_open()) / sample_size
+        return sorted(reservoir)
+
+    def _random_open(self) -> float:
+        """
+        Returns a random number from the open interval (0, 1)
+        """
+        while True:
+            number = self.random.random()
+            if number > 0.0:
+                return number
+
+    def _record(self, limit_name: str, pointer: str):
+        exceeded_limit = self.exceeded_limits.setdefault(limit_name, [0, []])
+        exceeded_limit[0] += 1
+        if len(exceeded_limit[1]) < self.max_reported_pointers:
+            exceeded_limit[1].append(pointer)
+
+
+def escape_pointer_key(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+class InputBudgetException(Exception):
+    pass
+
+
+class InvalidBudgetLimit(InputBudgetException):
+
+    def __init__(self, limit_name: str, limit: float):
+        self.limit_name = limit_name
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return "Budget limit " + self.limit_name + " must be a positive number, " + str(self.limit) + " given"
+
+
+class BudgetNotSupported(InputBudgetException):
+
+    def __init__(self, inference_name: str):
+        self.inference_name = inference_name
+
+    def __str__(self) -> str:
+        return "Input budget can't be used with the " + self.inference_name
@@ -0,0 +1,294 @@
+from typing import Iterator, Optional, Tuple
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, JsonSchemaFormInputFactory, ObjectInput, \
+    ArrayInput
+from src.generation_stats import GenerationStats
+
+
+# interned structural shapes remembered by the factory (cleared when exceeded)
+SHAPES_CACHE_SIZE = 65536
+
+
+def get_definition(form_input: JsonSchemaFormInput) -> dict:
+    """
+    Returns the input definition (see JsonSchemaFormInput.get_definition) without recursion
+        - descendants definitions are created (and cached) first, so every input creates its own definition only
+    """
+    stack = [form_input]
+    while stack:
+        stack_input = stack[-1]
+        if stack_input.definition is not None:
+            stack.pop()
+            continue
+        child_inputs = [child_input for child_input in stack_input.get_child_inputs() if child_input.definition is None]
+        if child_inputs:
+            stack += child_inputs
+            continue
+        stack_input.get_definition()
+        stack.pop()
+    return form_input.get_definition()
+
+
+def get_ui_hidden_definition(form_input: JsonSchemaFormInput) -> dict:
+    """
+    Returns the input UI hidden definition (see JsonSchemaFormInput.get_ui_hidden_definition) without recursion
+    """
+    stack = [form_input]
+    while stack:
+        stack_input = stack[-1]
+        if stack_input.ui_hidden_definition is not None:
+            stack.pop()
+            continue
+        child_inputs = [
+            child_input for child_input in stack_input.get_child_inputs() if child_input.ui_hidden_definition is None
+        ]
+        if child_inputs:
+            stack += child_inputs
+            continue
+        stack_input.get_ui_hidden_definition()
+        stack.pop()
+    return form_input.get_ui_hidden_definition()
+
+
+def get_definitions(form_input: JsonSchemaFormInput) -> Tuple[dict, dict]:
+    """
+    Returns the input definition and UI hidden definition (see JsonSchemaFormInput.get_definitions) without recursion
+    """
+    stack = [form_input]
+    while stack:
+        stack_input = stack[-1]
+        if stack_input.definition is not None and stack_input.ui_hidden_definition is not None:
+            stack.pop()
+            continue
+        child_inputs = [
+            child_input for child_input in stack_input.get_child_inputs()
+            if child_input.definition is None or child_input.ui_hidden_definition is None
+        ]
+        if child_inputs:
+            stack += child_inputs
+            continue
+        stack_input.get_definitions()
+        stack.pop()
+    return form_input.get_definitions()
+
+
+class IterativeJsonSchemaFormInputFactory(JsonSchemaFormInputFactory):
+    """
+    Form inputs factory with explicit stack instead of the recursion
+        - nesting depth is not limited by the recursion limit
+        - creates the same inputs as JsonSchemaFormInputFactory (the containers of the registered creators are
+          created by their creators)
+    """
+
+    # the creators of the containers inferred from the stack (see _has_container_input_creator)
+    container_input_creators = frozenset(
+        [JsonSchemaFormInputFactory._create_object_input, JsonSchemaFormInputFactory._create_array_input]
+    )
+
+    def __init__(self, items_are_required: bool, cast_types: bool, detect_formats: bool = False,
+                 stats: GenerationStats = None):
+        super().__init__(items_are_required, cast_types, detect_formats, stats)
+        # interned structural shapes (shape -> fingerprint), bounded by SHAPES_CACHE_SIZE
+        self.shapes = {}
+        # fingerprints are never reused, so the fingerprints of the forgotten shapes can't match other shapes
+        self.shapes_count = 0
+
+    def create_input(self, input_name: str, input_value) -> JsonSchemaFormInput:
+        """
+        :raises UnknownInputType if the input type is unknown
+        """
+        if not self._has_container_input_creator(input_name, input_value):
+            return super().create_input(input_name, input_value)
+        if self.fingerprints_cache is not None:
+            # called by a registered creator during the inference (the running inference keeps its cache)
+            return self._create_container_input_tree(input_name, input_value)
+        # the value isn't changed (and its containers can't be garbage collected) during the inference
+        self.fingerprints_cache = {}
+        try:
+            return self._create_container_input_tree(input_name, input_value)
+        finally:
+            self.fingerprints_cache = None
+
+    def _create_container_input_tree(self, input_name: str, input_value) -> JsonSchemaFormInput:
+        root_input = self._create_container_input(input_name, input_value)
+        # stack items: container input, iterator of its (child name, child value), fingerprints of the array items
+        stack = [(root_input, self._iterate_children(root_input, input_value), set())]
+        while stack:
+            input_item, children, items_fingerprints = stack[-1]
+            for child_name, child_value in children:
+                if self.is_inference_expired():
+                    # the rest of the value is left out - the started containers are completed as they are
+                    stack[-1] = (input_item, iter(()), items_fingerprints)
+                    break
+                if isinstance(input_item, ArrayInput):
+                    # see JsonSchemaFormInputFactory.add_array_item
+                    item_fingerprint = self._get_structure_fingerprint(child_value)
+                    if item_fingerprint is not None:
+                        if item_fingerprint in items_fingerprints:
+                            continue
+                        items_fingerprints.add(item_fingerprint)
+                if self._has_container_input_creator(child_name, child_value):
+                    child_input = self._create_container_input(child_name, child_value)
+                    stack.append((child_input, self._iterate_children(child_input, child_value), set()))
+                    break
+                self._add_child_input(input_item, super().create_input(child_name, child_value))
+            else:
+                # all the children are processed - the input is complete
+                stack.pop()
+                if stack:
+                    self._add_child_input(stack[-1][0], input_item)
+        return root_input
+
+    def create_input_from_events(self, input_name: str, event: str, value,
+                                 events: Iterator[Tuple[str, object]]) -> JsonSchemaFormInput:
+        """
+        See JsonSchemaFormInputFactory.create_input_from_events
+
+        :raises UnknownInputType if the input type is unknown
+        """
+        stack = []
+        while True:
+            if event == "start_map":
+                stack.append(self.on_input_created(ObjectInput(input_name, self.items_are_required)))
+            elif event == "start_array":
+                stack.append(self.on_input_created(ArrayInput(input_name)))
+            elif stack:
+                self._add_child_input(stack[-1], self.create_input(input_name, value))
+            else:
+                return self.create_input(input_name, value)
+            # closing the complete containers and moving to the next child
+            event, value = next(events)
+            while event in ("end_map", "end_array"):
+                input_item = stack.pop()
+                if not stack:
+                    return input_item
+                self._add_child_input(stack[-1], input_item)
+                event, value = next(events)
+            if event == "map_key":
+                input_name = value
+                event, value = next(events)
+            else:
+                input_name = stack[-1].get_name()[0:-1]
+
+    def _get_structure_fingerprint(self, value) -> Optional[int]:
+        """
+        See JsonSchemaFormInputFactory._get_structure_fingerprint
+            - shapes are interned to numbers, so the fingerprint of a deep value is hashed in constant time
+        """
+        if not isinstance(value, (dict, list)):
+            return self._intern_shape(self._get_scalar_shape(value))
+        if self.fingerprints_cache is not None and id(value) in self.fingerprints_cache:
+            return self.fingerprints_cache[id(value)]
+        if not self._has_type_input_creator(value):
+            return None
+        # stack items: container, iterator of its items, collected items fingerprints, key in the parent container
+        stack = [(value, self._iterate_items(value), [] if isinstance(value, dict) else {}, None)]
+        while True:
+            container, items, items_fingerprints, container_key = stack[-1]
+            for key, item in items:
+                if self.fingerprints_cache is not None and id(item) in self.fingerprints_cache:
+                    item_fingerprint = self.fingerprints_cache[id(item)]
+                elif isinstance(item, (dict, list)) and self._has_type_input_creator(item):
+                    stack.append((item, self._iterate_items(item), [] if isinstance(item, dict) else {}, key))
+                    break
+                elif isinstance(item, (dict, list)):
+                    item_fingerprint = None
+                else:
+                    item_fingerprint = self._intern_shape(self._get_scalar_shape(item))
+                if item_fingerprint is None:
+                    # the containers of the stack contain the item, so they have no fingerprint either
+                    return self._cache_missing_fingerprints(stack)
+                self._add_item_fingerprint(items_fingerprints, key, item_fingerprint)
+            else:
+                stack.pop()
+                fingerprint = self._intern_shape(
+                    ((dict if isinstance(container, dict) else list), tuple(items_fingerprints))
+                )
+                if self.fingerprints_cache is not None:
+                    self.fingerprints_cache[id(container)] = fingerprint
+                if not stack:
+                    return fingerprint
+                self._add_item_fingerprint(stack[-1][2], container_key, fingerprint)
+
+    def _cache_missing_fingerprints(self, stack: list) -> None:
+        if self.fingerprints_cache is not None:
+            for container, _, _, _ in stack:
+                self.fingerprints_cache[id(container)] = None
+        return None
+
+    def _intern_shape(self, shape: Optional[tuple]) -> Optional[int]:
+        """
+        Returns the shape fingerprint - the shapes are forgotten all at once when there are too many of them, the
+        forgotten shape gets a new fingerprint (the same structures may have different fingerprints then, so the
+        deduplication of their values is only missed)
+            - None shape has no fingerprint (see JsonSchemaFormInputFactory._get_scalar_shape)
+        """
+        if shape is None:
+            return None
+        fingerprint = self.shapes.get(shape)
+        if fingerprint is None:
+            if len(self.shapes) >= SHAPES_CACHE_SIZE:
+                self.shapes.clear()
+            fingerprint = self.shapes[shape] = self.shapes_count
+            self.shapes_count += 1
+        return fingerprint
+
+    def _has_container_input_creator(self, input_name: str, input_value) -> bool:
+        """
+        Returns True if the value is a container inferred from the stack (not by a registered creator)
+
+        :raises UnknownInputType if the input type is unknown
+        """
+        return isinstance(input_value, (dict, list)) and \
+            self._get_input_creator(input_name, type(input_value)) in self.container_input_creators
+
+    def _create_container_input(self, input_name: str, input_value) -> JsonSchemaFormInput:
+        if isinstance(input_value, dict):
+            return self.on_input_created(ObjectInput(input_name, self.items_are_required))
+        return self.on_input_created(ArrayInput(input_name))
+
+    @staticmethod
+    def _iterate_children(input_item: JsonSchemaFormInput, input_value) -> Iterator[Tuple[str, object]]:
+        if isinstance(input_item, ObjectInput):
+            return iter(input_value.items())
+        items_name = input_item.get_name()[0:-1]
+        return ((items_name, list_item) for list_item in input_value)
+
+    @staticmethod
+    def _iterate_items(value) -> Iterator[Tuple[object, object]]:
+        if isinstance(value, dict):
+            return iter(value.items())
+        return ((None, item) for item in value)
+
+    @staticmethod
+    def _add_item_fingerprint(items_fingerprints, key, fingerprint: int):
+        if isinstance(items_fingerprints, list):
+            items_fingerprints.append((key, fingerprint))
+        else:
+            # distinct list items fingerprints in the order of their first occurrence
+            items_fingerprints[fingerprint] = None
+
+    def _add_child_input(self, input_item: JsonSchemaFormInput, child_input: JsonSchemaFormInput):
+        if isinstance(input_item, ObjectInput):
+            input_item.add_property(child_input)
+        else:
+            self.add_items_input(input_item, child_input)
+
+
+class IterativeJsonSchemaForm(JsonSchemaForm):
+    """
+    JSON schema form inferred and emitted without recursion (see IterativeJsonSchemaFormInputFactory)
+    """
+
+    inputs_factory_class = IterativeJsonSchemaFormInputFactory
+
+    @staticmethod
+    def _get_input_definition(form_input: JsonSchemaFormInput) -> dict:
+        return get_definition(form_input)
+
+    @staticmethod
+    def _get_input_ui_hidden_definition(form_input: JsonSchemaFormInput) -> dict:
+        return get_ui_hidden_definition(form_input)
+
+    @staticmethod
+    def _get_input_definitions(form_input: JsonSchemaFormInput) -> Tuple[dict, dict]:
+        return get_definitions(form_input)
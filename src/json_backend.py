@@ -0,0 +1,234 @@
+import os
+import re
+import json
+import mmap
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# environment variable selecting the backend (inherited by the worker processes)
+JSON_BACKEND_ENVIRONMENT_VARIABLE = "JSON_SCHEMA_GENERATOR_JSON_BACKEND"
+# integers out of the 64-bit range (orjson parses them as floats) have 20+ digits, the negative ones 19+ digits -
+# the digits are translated to "1" and the run of 19 ones is searched (much faster than a regular expression, the
+# 19 digits positive integers are left to the stdlib as well)
+BIG_NUMBER_DIGITS = "1" * 19
+DIGITS_TRANSLATION = str.maketrans("0123456789", "1" * 10)
+DIGITS_BYTES_TRANSLATION = bytes.maketrans(b"0123456789", b"1" * 10)
+# buffers are checked for the big integers by chunks (the translation copies the data)
+BIG_NUMBER_CHUNK_SIZE = 1024 * 1024
+NON_ASCII_CHARACTER_RE = re.compile("[\x7f-\U0010ffff]")
+# orjson writes every float with "." or an exponent ("e-" or "e16" - "e308", the floats below 1e16 without "."
+# aren't written in the exponent form), NaN and infinities as null - the output containing none of them has no
+# floats (the markers in the strings only make the stdlib serialize the value)
+FLOAT_MARKERS = (b".", b"null", b"e-", b"e1", b"e2", b"e3")
+
+
+class JsonBackend:
+    """
+    JSON parser/serializer
+        - loads: same values as json.loads (buffers like memoryview are accepted as well)
+        - load_file: parses the memory-mapped file (see map_file)
+        - dumps: same output as json.dumps(value, indent=indent) for the pretty output,
+          json.dumps(value, separators=(",", ":")) for the compact output (indent is None),
+          the keys are sorted if sort_keys is set
+    """
+
+    name = "stdlib"
+
+    def loads(self, data: Union[str, bytes, memoryview]):
+        """
+        :raises ValueError if the data isn't a valid JSON
+        """
+        if not isinstance(data, (str, bytes, bytearray)):
+            data = decode_buffer(data)
+        return json.loads(data)
+
+    def load_file(self, json_path: str):
+        """
+        Parses the JSON file - the file is decoded straight from its memory mapping and unmapped before parsing,
+        so only the decoded str is held in memory (not the file bytes as well)
+
+        :raises ValueError if the file isn't a valid JSON
+        """
+        with map_file(json_path) as buffer:
+            data = decode_buffer(buffer)
+        return json.loads(data)
+
+    def dumps(self, value, indent: int = None, sort_keys: bool = False) -> str:
+        if indent is None:
+            return json.dumps(value, separators=(",", ":"), sort_keys=sort_keys)
+        return json.dumps(value, indent=indent, sort_keys=sort_keys)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    orjson backend (https://github.com/ijl/orjson)
+        - values orjson handles differently (big integers, NaN, invalid documents, ...) are left to the stdlib,
+          so the errors are the same as well
+        - floats are formatted differently, so the values with floats (e.g. the budget timeout or the statistics
+          timings) are serialized by the stdlib
+    """
+
+    name = "orjson"
+
+    def loads(self, data: Union[str, bytes, memoryview]):
+        """
+        :raises ValueError if the data isn't a valid JSON
+        """
+        if has_big_number(data):
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def load_file(self, json_path: str):
+        """
+        Parses the JSON file straight from its memory mapping (the file content is never copied as a whole)
+
+        :raises ValueError if the file isn't a valid JSON
+        """
+        with map_file(json_path) as buffer:
+            if not has_big_number(buffer):
+                try:
+                    return orjson.loads(buffer)
+                except orjson.JSONDecodeError:
+                    pass
+        return super().load_file(json_path)
+
+    def dumps(self, value, indent: int = None, sort_keys: bool = False) -> str:
+        if indent not in (None, 2):
+            return super().dumps(value, indent, sort_keys)
+        option = (orjson.OPT_INDENT_2 if indent == 2 else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            dumped_bytes = orjson.dumps(value, option=option)
+        except TypeError:
+            return super().dumps(value, indent, sort_keys)
+        if may_have_float(dumped_bytes):
+            return super().dumps(value, indent, sort_keys)
+        dumped_value = dumped_bytes.decode()
+        if dumped_value.isascii() and "\x7f" not in dumped_value:
+            return dumped_value
+        # non-ASCII characters (and DEL) are escaped by the stdlib (they can be only in the strings)
+        return NON_ASCII_CHARACTER_RE.sub(self._escape_character, dumped_value)
+
+    @staticmethod
+    def _escape_character(match: re.Match) -> str:
+        code_point = ord(match.group())
+        if code_point < 0x10000:
+            return "\\u{0:04x}".format(code_point)
+        # surrogate pair
+        code_point -= 0x10000
+        return "\\u{0:04x}\\u{1:04x}".format(0xd800 | (code_point >> 10), 0xdc00 | (code_point & 0x3ff))
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[memoryview]:
+    """
+    Maps the file into memory read-only - the pages are read on demand from the page cache (they are not a copy
+    owned by the process and the system can drop them), the buffer must not be used after the context exits
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty file can't be mapped
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            buffer = memoryview(mapped_file)
+            try:
+                yield buffer
+            finally:
+                buffer.release()
+
+
+def decode_buffer(buffer: memoryview) -> str:
+    """
+    Decodes the JSON buffer to str the same way as json.loads decodes the bytes (UTF-8, UTF-16 or UTF-32)
+    """
+    return str(buffer, json.detect_encoding(bytes(buffer[:4])), "surrogatepass")
+
+
+def has_big_number(data: Union[str, bytes, memoryview]) -> bool:
+    """
+    Checks if the data contains 19+ digits (integers out of the 64-bit range orjson parses as floats)
+    """
+    if isinstance(data, str):
+        return BIG_NUMBER_DIGITS in data.translate(DIGITS_TRANSLATION)
+    if isinstance(data, (bytes, bytearray)):
+        return BIG_NUMBER_DIGITS.encode() in data.translate(DIGITS_BYTES_TRANSLATION)
+    # the chunks overlap, so the runs across the chunks boundaries are found as well
+    overlap = len(BIG_NUMBER_DIGITS) - 1
+    for start in range(0, len(data), BIG_NUMBER_CHUNK_SIZE):
+        chunk = data[max(start - overlap, 0):start + BIG_NUMBER_CHUNK_SIZE].tobytes()
+        if BIG_NUMBER_DIGITS.encode() in chunk.translate(DIGITS_BYTES_TRANSLATION):
+            return True
+    return False
+
+
+def may_have_float(data: bytes) -> bool:
+    """
+    Checks if the orjson output may contain a float (see FLOAT_MARKERS)
+    """
+    for float_marker in FLOAT_MARKERS:
+        if float_marker in data:
+            return True
+    return False
+
+
+JSON_BACKENDS = {
+    JsonBackend.name: JsonBackend,
+    OrjsonBackend.name: OrjsonBackend
+}
+
+
+def get_json_backend(name: str = None) -> JsonBackend:
+    """
+    Returns the JSON backend by name ("stdlib", "orjson" or "auto")
+        - the name is taken from JSON_SCHEMA_GENERATOR_JSON_BACKEND environment variable by default
+        - auto: orjson if it's installed, stdlib otherwise
+
+    :raises UnknownJsonBackend if the backend name is unknown
+    :raises JsonBackendNotInstalled if the backend package isn't installed
+    """
+    if name is None:
+        name = os.environ.get(JSON_BACKEND_ENVIRONMENT_VARIABLE, "auto")
+    return _create_json_backend(name)
+
+
+@lru_cache(maxsize=None)
+def _create_json_backend(name: str) -> JsonBackend:
+    if name == "auto":
+        return OrjsonBackend() if orjson is not None else JsonBackend()
+    if name not in JSON_BACKENDS:
+        raise UnknownJsonBackend(name)
+    if name == OrjsonBackend.name and orjson is None:
+        raise JsonBackendNotInstalled(name)
+    return JSON_BACKENDS[name]()
+
+
+class JsonBackendException(Exception):
+    pass
+
+
+class UnknownJsonBackend(JsonBackendException):
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __str__(self) -> str:
+        return "Unknown JSON backend '" + self.name + "' (use " + ", ".join(["auto"] + list(JSON_BACKENDS)) + ")"
+
+
+class JsonBackendNotInstalled(JsonBackendException):
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __str__(self) -> str:
+        return "JSON backend '" + self.name + "' isn't installed (pip install " + self.name + ")"
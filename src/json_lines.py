@@ -0,0 +1,80 @@
+import sys
+import time
+from typing import Iterator, TextIO
+from src.json_backend import get_json_backend
+
+
+class ProgressReporter:
+    """
+    Reports the number of processed records and the processing speed
+    """
+
+    default_interval = 1.0
+
+    def __init__(self, output: TextIO = sys.stderr, interval: float = default_interval):
+        """
+        interval: minimal number of seconds between two reports
+        """
+        self.output = output
+        self.interval = interval
+        self.records_count = 0
+        self.start_time = time.monotonic()
+        self.last_report_time = self.start_time
+
+    def update(self, records_count: int = 1):
+        self.records_count += records_count
+        current_time = time.monotonic()
+        if current_time - self.last_report_time >= self.interval:
+            self.last_report_time = current_time
+            self._report(current_time)
+
+    def finish(self):
+        self._report(time.monotonic())
+
+    def get_records_per_second(self, current_time: float) -> float:
+        elapsed_time = current_time - self.start_time
+        return self.records_count / elapsed_time if elapsed_time > 0 else 0.0
+
+    def _report(self, current_time: float):
+        print(
+            "Processed {} records ({:.0f} records/s)".format(
+                self.records_count,
+                self.get_records_per_second(current_time)
+            ),
+            file=self.output
+        )
+
+
+def read_json_lines(json_lines_stream: TextIO, progress_reporter: ProgressReporter = None) -> Iterator:
+    """
+    Yields the records of the JSON lines stream one by one (empty lines are skipped)
+
+    :raises InvalidJsonLine if any of the lines isn't a valid JSON
+    """
+    json_backend = get_json_backend()
+    for line_number, line in enumerate(json_lines_stream, start=1):
+        if line.strip() == "":
+            continue
+        try:
+            record = json_backend.loads(line)
+        except ValueError as e:
+            raise InvalidJsonLine(line_number, str(e))
+        yield record
+        if progress_reporter is not None:
+            progress_reporter.update()
+    if progress_reporter is not None:
+        progress_reporter.finish()
+
+
+class JsonLinesException(Exception):
+    pass
+
+
+class InvalidJsonLine(JsonLinesException):
+
+    def __init__(self, line_number: int, message: str):
+        self.line_number = line_number
+        self.message = message
+
+    def __str__(self) -> str:
+        return "Line " + str(self.line_number) + " is not a valid JSON: " + self.message
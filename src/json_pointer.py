@@ -0,0 +1,68 @@
+import re
+from typing import List
+
+
+# array index token (no leading zeros, "-" points behind the last item, so it never exists)
+ARRAY_INDEX_RE = re.compile(r"0|[1-9][0-9]*")
+
+
+def get_pointer_tokens(pointer: str) -> List[str]:
+    """
+    Splits the JSON pointer (RFC 6901) into the unescaped reference tokens ("" is the whole document)
+
+    :raises InvalidJsonPointer if the pointer is not empty and doesn't start with "/"
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise InvalidJsonPointer(pointer)
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def resolve_json_pointer(document, pointer: str):
+    """
+    Returns the value the JSON pointer refers to - only the containers on the path are visited
+
+    :raises InvalidJsonPointer if the pointer is not empty and doesn't start with "/"
+    :raises JsonPointerNotFound if the document doesn't contain the value
+    """
+    value = document
+    for token in get_pointer_tokens(pointer):
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and ARRAY_INDEX_RE.fullmatch(token) and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            raise JsonPointerNotFound(pointer)
+    return value
+
+
+class JsonPointerException(Exception):
+    pass
+
+
+class InvalidJsonPointer(JsonPointerException):
+
+    def __init__(self, pointer: str):
+        self.pointer = pointer
+
+    def __str__(self) -> str:
+        return "JSON pointer '" + self.pointer + "' must be empty or start with '/'"
+
+
+class JsonPointerNotFound(JsonPointerException):
+
+    def __init__(self, pointer: str):
+        self.pointer = pointer
+
+    def __str__(self) -> str:
+        return "JSON pointer '" + self.pointer + "' doesn't exist in the document"
+
+
+class PointerNotSupported(JsonPointerException):
+
+    def __init__(self, inference_name: str):
+        self.inference_name = inference_name
+
+    def __str__(self) -> str:
+        return "JSON pointer can't be used with the " + self.inference_name
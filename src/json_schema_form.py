@@ -1,16 +1,41 @@
-from typing import List
+import re
+import sys
+from typing import Callable, Dict, List, Iterable, Iterator, Optional, TextIO, Tuple
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from src.json_stream_parser import JsonStreamParser
+from src.generation_stats import GenerationStats, measure_phase
+from src.input_budget import InputBudget
+from src.string_formats import StringFormatDetector, default_format_detector
+from src.schema_validator import get_validator
+from src.json_pointer import resolve_json_pointer
+
+
+TITLE_CACHE_SIZE = 4096
+# distinct record structures remembered by from_records (cleared when exceeded)
+RECORDS_FINGERPRINTS_CACHE_SIZE = 4096
+CAMEL_CASE_BOUNDARY_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
 
 
 class JsonSchemaFormInput(ABC):
     """
     Form input base
+        - inputs are slotted and their names and titles are interned (large trees hold a lot of them)
     """
 
+    __slots__ = ("name", "title", "parent", "definition", "ui_hidden_definition", "shape")
+
     def __init__(self, name: str):
-        self.name = name
+        self.name = sys.intern(name)
         # Name to title conversion
-        self.title = self._get_title_from_name(name)
+        self.title = sys.intern(self._get_title_from_name(name))
+        # parent input (or form) - it's notified when the input changes
+        self.parent = None
+        # cached definitions - invalidated when the input or its descendants change
+        self.definition = None
+        self.ui_hidden_definition = None
+        # cached structural shape of the subtree (see shared_definitions.get_input_shape) - invalidated with them
+        self.shape = None
 
     @abstractmethod
     def get_type(self) -> str:
@@ -19,70 +44,272 @@ class JsonSchemaFormInput(ABC):
     def get_name(self) -> str:
         return self.name
 
+    def set_parent(self, parent):
+        self.parent = parent
+
+    def get_child_inputs(self) -> List["JsonSchemaFormInput"]:
+        return []
+
+    def get_shape_key(self) -> tuple:
+        """
+        Returns the values the input definition is created from (except the child inputs)
+        """
+        return type(self), self.name
+
     def get_definition(self) -> dict:
+        """
+        Definition is cached - it must not be modified
+        """
+        if self.definition is None:
+            self.definition = self.create_definition()
+        return self.definition
+
+    def get_ui_hidden_definition(self) -> dict:
+        """
+        Definition is cached - it must not be modified
+        """
+        if self.ui_hidden_definition is None:
+            self.ui_hidden_definition = self.create_ui_hidden_definition()
+        return self.ui_hidden_definition
+
+    def get_definitions(self) -> Tuple[dict, dict]:
+        """
+        Returns the definition and the UI hidden definition created in one visit of the descendants
+        (see create_definitions) - definitions are cached, they must not be modified
+        """
+        if self.definition is None or self.ui_hidden_definition is None:
+            self.definition, self.ui_hidden_definition = self.create_definitions()
+        return self.definition, self.ui_hidden_definition
+
+    def merge(self, form_input: "JsonSchemaFormInput") -> List["JsonSchemaFormInput"]:
+        """
+        Merges the input inferred from another part of the data (e.g. another shard of the records)
+            - the result is the same as if the input was inferred from both parts at once
+            - the operation is associative, so the parts can be merged in any grouping (keep the parts order)
+            - merged input must not be used afterwards (its descendants might be moved to this input)
+            - returns the inputs added to the tree (their descendants are not listed)
+
+        :raises IncompatibleInputs if the input is in incompatible type
+        """
+        if not isinstance(form_input, type(self)):
+            raise IncompatibleInputs(self.get_name())
+        return []
+
+    def has_string_formats(self) -> bool:
+        """
+        Returns False if no input of the subtree has a string format (True means it may have one)
+        """
+        return False
+
+    def merge_string_formats(self, form_input: "JsonSchemaFormInput") -> List[Tuple["StringInput", str]]:
+        """
+        Keeps the string formats of the input tree only where the merged input has the same format at the same place
+            - descendants missing in the merged input keep their formats (there are no values to disagree with)
+            - all the formats under the input of incompatible type are dropped (so merging stays associative)
+            - only the subtrees with formats present in both trees are visited (without recursion), so the walk
+              costs no more than the merge itself (the subtree of incompatible type is visited once)
+            - returns the string inputs whose formats have been dropped (with the dropped format)
+        """
+        dropped_formats = []
+        # stack items: kept input, merged input at the same place (None if incompatible)
+        stack = [(self, form_input)]
+        while stack:
+            kept_input, merged_input = stack.pop()
+            if not kept_input.has_string_formats():
+                continue
+            if isinstance(kept_input, StringInput):
+                dropped_format = kept_input.merge_string_format(merged_input)
+                if dropped_format is not None:
+                    dropped_formats.append((kept_input, dropped_format))
+            elif not isinstance(merged_input, type(kept_input)):
+                # all the formats of the subtree are dropped
+                kept_input.string_formats_added = False
+                stack += [(child_input, None) for child_input in kept_input.get_child_inputs()]
+            elif isinstance(kept_input, ObjectInput):
+                stack += [
+                    (kept_input.properties[name], object_property)
+                    for name, object_property in merged_input.properties.items()
+                    if name in kept_input.properties
+                ]
+            elif isinstance(kept_input, ArrayInput) and kept_input.has_items_input() and merged_input.has_items_input():
+                stack.append((kept_input.get_items_input(), merged_input.get_items_input()))
+        return dropped_formats
+
+    def on_child_input_added(self, child_input: "JsonSchemaFormInput"):
+        """
+        Marks the container input and its ancestors as the subtrees with string formats if the child input has some
+        """
+        if not child_input.has_string_formats():
+            return
+        form_input = self
+        while isinstance(form_input, JsonSchemaFormInput) and not form_input.has_string_formats():
+            form_input.string_formats_added = True
+            form_input = form_input.parent
+
+    def get_schema_pointer(self) -> str:
+        """
+        Returns the JSON pointer of the input definition in the data schema
+        """
+        pointer = ""
+        form_input = self
+        while isinstance(form_input, JsonSchemaFormInput):
+            if isinstance(form_input.parent, ArrayInput):
+                pointer = "/items" + pointer
+            else:
+                pointer = "/properties/" + form_input.name.replace("~", "~0").replace("/", "~1") + pointer
+            form_input = form_input.parent
+        return pointer
+
+    def invalidate_definitions(self):
+        """
+        Drops cached definitions (and the shape) of the input and its ancestors
+            - ancestor definitions can be cached only if the input definitions are cached, so we can stop early
+        """
+        form_input = self
+        while isinstance(form_input, JsonSchemaFormInput):
+            if form_input.definition is None and form_input.ui_hidden_definition is None and form_input.shape is None:
+                return
+            form_input.definition = None
+            form_input.ui_hidden_definition = None
+            form_input.shape = None
+            form_input = form_input.parent
+        # the form
+        if form_input is not None:
+            form_input.invalidate_definitions()
+
+    def create_definition(self, get_child_definition: Callable[["JsonSchemaFormInput"], dict] = None) -> dict:
+        """
+        Creates new (not cached) definition
+            - get_child_definition: provides the child inputs definitions (their cached definitions by default)
+        """
         return {
             "title": self.title,
             "type": self.get_type()
         }
 
-    def get_ui_hidden_definition(self) -> dict:
+    def create_ui_hidden_definition(
+            self, get_child_ui_hidden_definition: Callable[["JsonSchemaFormInput"], dict] = None) -> dict:
+        """
+        Creates new (not cached) UI hidden definition (see create_definition)
+        """
         return {
             "ui:widget": "hidden"
         }
 
+    def create_definitions(
+            self, get_child_definitions: Callable[["JsonSchemaFormInput"], Tuple[dict, dict]] = None
+    ) -> Tuple[dict, dict]:
+        """
+        Creates new (not cached) definition and UI hidden definition, the child inputs are visited once for both
+            - get_child_definitions: provides both child inputs definitions (their cached definitions by default)
+        """
+        return self.create_definition(), self.create_ui_hidden_definition()
+
     @staticmethod
     def _get_title_from_name(name: str) -> str:
-        """
-        Converts given name to title:
-            name -> Name
-            snake_name -> Snake Name
-            camelName -> Camel Name
-        """
-        # remove special symbols
-        name = name.replace("#", "")
-        # snake case
-        if "_" in name:
-            return " ".join(name.split("_")).title()
-        # camel case
-        words = []
-        word = ""
-        previous_letter_is_lower = False
-        for letter in name:
-            if letter.isupper() and previous_letter_is_lower:
-                words.append(word)
-                word = letter
-            else:
-                word += letter
-            previous_letter_is_lower = letter.islower()
-        if len(word) > 0:
+        return get_title_from_name(name)
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def get_title_from_name(name: str) -> str:
+    """
+    Converts given name to title:
+        name -> Name
+        snake_name -> Snake Name
+        camelName -> Camel Name
+        - titles are cached (names repeat a lot across the documents)
+    """
+    # remove special symbols
+    name = name.replace("#", "")
+    # snake case
+    if "_" in name:
+        return " ".join(name.split("_")).title()
+    # camel case
+    if name.isascii():
+        return CAMEL_CASE_BOUNDARY_RE.sub(" ", name).title()
+    # camel case with non-ASCII letters (regular expression classes don't cover them)
+    words = []
+    word = ""
+    previous_letter_is_lower = False
+    for letter in name:
+        if letter.isupper() and previous_letter_is_lower:
             words.append(word)
-        return " ".join(words).title()
+            word = letter
+        else:
+            word += letter
+        previous_letter_is_lower = letter.islower()
+    if len(word) > 0:
+        words.append(word)
+    return " ".join(words).title()
+
+
+def get_title_cache_info():
+    """
+    Returns the titles cache statistics (hits, misses, maxsize, currsize)
+    """
+    return get_title_from_name.cache_info()
 
 
 class StringInput(JsonSchemaFormInput):
     """
     String input
+        - string_format: JSON schema format of the values (see StringFormatDetector)
     """
 
-    def __init__(self, name: str, cast_type: str = None):
+    __slots__ = ("cast_type", "string_format")
+
+    def __init__(self, name: str, cast_type: str = None, string_format: str = None):
         super().__init__(name=name)
         self.cast_type = cast_type
+        self.string_format = string_format
 
     def get_type(self) -> str:
         return "string"
 
-    def get_definition(self) -> dict:
-        definition = super().get_definition()
+    def get_shape_key(self) -> tuple:
+        return super().get_shape_key() + (self.cast_type, self.string_format)
+
+    def create_definition(self, get_child_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        definition = super().create_definition(get_child_definition)
         if self.cast_type:
             definition["cast_type"] = self.cast_type
+        if self.string_format:
+            definition["format"] = self.string_format
         return definition
 
+    def merge(self, form_input: JsonSchemaFormInput) -> List[JsonSchemaFormInput]:
+        """
+        Format is kept only if both inputs have the same format (see merge_string_formats)
+        """
+        added_inputs = super().merge(form_input)
+        self.merge_string_format(form_input)
+        return added_inputs
+
+    def has_string_formats(self) -> bool:
+        return self.string_format is not None
+
+    def merge_string_format(self, form_input: JsonSchemaFormInput = None) -> Optional[str]:
+        """
+        Drops the format unless the input is a string input of the same format (None means incompatible values)
+            - returns the dropped format
+        """
+        if self.string_format is None:
+            return None
+        if not isinstance(form_input, StringInput) or form_input.string_format != self.string_format:
+            dropped_format = self.string_format
+            self.string_format = None
+            self.invalidate_definitions()
+            return dropped_format
+        return None
+
 
 class IntegerInput(JsonSchemaFormInput):
     """
     Integer input
     """
 
+    __slots__ = ()
+
     def get_type(self) -> str:
         return "integer"
 
@@ -92,6 +319,8 @@ class FloatInput(JsonSchemaFormInput):
     Float input
     """
 
+    __slots__ = ()
+
     def get_type(self) -> str:
         return "float"
 
@@ -101,6 +330,8 @@ class BooleanInput(JsonSchemaFormInput):
     Boolean input
     """
 
+    __slots__ = ()
+
     def get_type(self) -> str:
         return "boolean"
 
@@ -110,49 +341,97 @@ class ObjectInput(JsonSchemaFormInput):
     Object input
     """
 
+    __slots__ = ("items_are_required", "properties", "string_formats_added")
+
     def __init__(self, name: str, items_are_required: bool):
         super().__init__(name)
         self.items_are_required = items_are_required
-        self.properties = []
+        # properties indexed by name (insertion ordered)
+        self.properties = {}
+        # descendants may have string formats (see merge_string_formats)
+        self.string_formats_added = False
 
     def get_type(self) -> str:
         return "object"
 
-    def get_definition(self) -> dict:
-        definition = super().get_definition()
+    def create_definition(self, get_child_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        definition = super().create_definition(get_child_definition)
+        if get_child_definition is None:
+            get_child_definition = JsonSchemaFormInput.get_definition
         definition["properties"] = {}
         definition["required"] = []
-        for form_input in self.properties:
-            definition["properties"][form_input.get_name()] = form_input.get_definition()
+        for form_input in self.properties.values():
+            definition["properties"][form_input.get_name()] = get_child_definition(form_input)
             if self.items_are_required:
                 definition["required"].append(form_input.get_name())
         return definition
 
-    def get_ui_hidden_definition(self) -> dict:
-        definition = {
-            "ui:widget": "hidden"
-        }
-        for form_input in self.properties:
-            definition[form_input.get_name()] = form_input.get_ui_hidden_definition()
+    def create_ui_hidden_definition(
+            self, get_child_ui_hidden_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        definition = super().create_ui_hidden_definition(get_child_ui_hidden_definition)
+        if get_child_ui_hidden_definition is None:
+            get_child_ui_hidden_definition = JsonSchemaFormInput.get_ui_hidden_definition
+        for form_input in self.properties.values():
+            definition[form_input.get_name()] = get_child_ui_hidden_definition(form_input)
         return definition
 
+    def create_definitions(
+            self, get_child_definitions: Callable[[JsonSchemaFormInput], Tuple[dict, dict]] = None
+    ) -> Tuple[dict, dict]:
+        if get_child_definitions is None:
+            get_child_definitions = JsonSchemaFormInput.get_definitions
+        definition = super().create_definition()
+        ui_hidden_definition = super().create_ui_hidden_definition()
+        definition["properties"] = {}
+        definition["required"] = []
+        for form_input in self.properties.values():
+            name = form_input.get_name()
+            definition["properties"][name], ui_hidden_definition[name] = get_child_definitions(form_input)
+            if self.items_are_required:
+                definition["required"].append(name)
+        return definition, ui_hidden_definition
+
     def get_properties(self) -> List[JsonSchemaFormInput]:
-        return self.properties
+        return list(self.properties.values())
+
+    def has_string_formats(self) -> bool:
+        return self.string_formats_added
+
+    def get_child_inputs(self) -> List[JsonSchemaFormInput]:
+        return self.get_properties()
+
+    def get_shape_key(self) -> tuple:
+        return super().get_shape_key() + (self.items_are_required,)
 
     def add_property(self, form_input: JsonSchemaFormInput):
-        self.properties.append(form_input)
+        """
+        Adds the property or replaces the property with the same name (keeps its position)
+        """
+        self.properties[form_input.get_name()] = form_input
+        form_input.set_parent(self)
+        self.on_child_input_added(form_input)
+        self.invalidate_definitions()
 
     def has_property(self, form_input: JsonSchemaFormInput) -> bool:
-        for properties_item in self.properties:
-            if properties_item.get_name() == form_input.get_name():
-                return True
-        return False
+        return form_input.get_name() in self.properties
 
     def get_property_by_name(self, property_name: str) -> JsonSchemaFormInput:
-        for properties_item in self.properties:
-            if properties_item.get_name() == property_name:
-                return properties_item
-        raise ObjectInputPropertyNotFound(property_name)
+        if property_name not in self.properties:
+            raise ObjectInputPropertyNotFound(property_name)
+        return self.properties[property_name]
+
+    def merge(self, form_input: JsonSchemaFormInput) -> List[JsonSchemaFormInput]:
+        """
+        Missing properties are added (existing properties are kept as they are - same as the array items merging,
+        only their string formats are merged, see merge_string_formats)
+        """
+        added_inputs = super().merge(form_input)
+        self.merge_string_formats(form_input)
+        for object_property in form_input.get_properties():
+            if not self.has_property(object_property):
+                self.add_property(object_property)
+                added_inputs.append(object_property)
+        return added_inputs
 
 
 class ArrayInput(JsonSchemaFormInput):
@@ -161,37 +440,79 @@ class ArrayInput(JsonSchemaFormInput):
         - array items must be of the same type
     """
 
+    __slots__ = ("items_input", "string_formats_added")
+
     def __init__(self, name: str):
         super().__init__(name)
         self.items_input = None
+        # descendants may have string formats (see merge_string_formats)
+        self.string_formats_added = False
 
     def get_type(self) -> str:
         return "array"
 
-    def get_definition(self) -> dict:
-        definition = super().get_definition()
+    def create_definition(self, get_child_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        definition = super().create_definition(get_child_definition)
+        if get_child_definition is None:
+            get_child_definition = JsonSchemaFormInput.get_definition
         if not self.has_items_input():
             definition["items"] = {}
         else:
-            definition["items"] = self.items_input.get_definition()
+            definition["items"] = get_child_definition(self.items_input)
         return definition
 
-    def get_ui_hidden_definition(self) -> dict:
-        return {
-            "ui:widget": "hidden",
-            "items": {} if self.items_input is None else self.items_input.get_ui_hidden_definition()
-        }
+    def create_ui_hidden_definition(
+            self, get_child_ui_hidden_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        definition = super().create_ui_hidden_definition(get_child_ui_hidden_definition)
+        if get_child_ui_hidden_definition is None:
+            get_child_ui_hidden_definition = JsonSchemaFormInput.get_ui_hidden_definition
+        definition["items"] = {} if self.items_input is None else get_child_ui_hidden_definition(self.items_input)
+        return definition
+
+    def create_definitions(
+            self, get_child_definitions: Callable[[JsonSchemaFormInput], Tuple[dict, dict]] = None
+    ) -> Tuple[dict, dict]:
+        if get_child_definitions is None:
+            get_child_definitions = JsonSchemaFormInput.get_definitions
+        definition = super().create_definition()
+        ui_hidden_definition = super().create_ui_hidden_definition()
+        if self.items_input is None:
+            definition["items"] = {}
+            ui_hidden_definition["items"] = {}
+        else:
+            definition["items"], ui_hidden_definition["items"] = get_child_definitions(self.items_input)
+        return definition, ui_hidden_definition
 
     def has_items_input(self) -> bool:
         return self.items_input is not None
 
     def set_items_input(self, items_input: JsonSchemaFormInput):
         self.items_input = items_input
+        items_input.set_parent(self)
+        self.on_child_input_added(items_input)
+        self.invalidate_definitions()
 
     def get_items_input(self) -> JsonSchemaFormInput:
         return self.items_input
 
-    def merge_items_input(self, items_input: JsonSchemaFormInput):
+    def has_string_formats(self) -> bool:
+        return self.string_formats_added
+
+    def get_child_inputs(self) -> List[JsonSchemaFormInput]:
+        return [] if self.items_input is None else [self.items_input]
+
+    def add_items_input(self, items_input: JsonSchemaFormInput) -> List[JsonSchemaFormInput]:
+        """
+        Sets the first items input, merges the next ones (returns the inputs added to the tree)
+
+        :raises IncompatibleArrayItemsInput if the item is in incompatible type
+        """
+        if not self.has_items_input():
+            self.set_items_input(items_input)
+            return [items_input]
+        return self.merge_items_input(items_input)
+
+    def merge_items_input(self, items_input: JsonSchemaFormInput) -> List[JsonSchemaFormInput]:
         """
         :raises IncompatibleArrayItemsInput if the item is in incompatible type
         """
@@ -199,98 +520,744 @@ class ArrayInput(JsonSchemaFormInput):
             raise IncompatibleArrayItemsInput(self.get_name())
         # object properties merging
         if isinstance(items_input, ObjectInput):
-            for object_property in items_input.get_properties():
-                if not self.items_input.has_property(object_property):
-                    self.items_input.add_property(object_property)
+            return self.items_input.merge(items_input)
+        self.items_input.merge_string_formats(items_input)
+        return []
+
+    def merge(self, form_input: JsonSchemaFormInput) -> List[JsonSchemaFormInput]:
+        """
+        Items are merged the same way as the items of a single array
+
+        :raises IncompatibleArrayItemsInput if the items are in incompatible types
+        """
+        added_inputs = super().merge(form_input)
+        if form_input.has_items_input():
+            added_inputs += self.add_items_input(form_input.get_items_input())
+        return added_inputs
 
 
 class JsonSchemaFormInputFactory:
     """
     Form inputs factory
+        - inputs are created by the input creators of the value types (see register_input_creator)
+        - detect_formats: string inputs get the format of their values (see register_string_format)
+        - stats: collector of the created inputs and the array items merges (see GenerationStats)
     """
 
-    def __init__(self, items_are_required: bool, cast_types: bool):
+    def __init__(self, items_are_required: bool, cast_types: bool, detect_formats: bool = False,
+                 stats: GenerationStats = None):
         self.items_are_required = items_are_required
         self.cast_types = cast_types
+        self.stats = stats
+        self.format_detector = default_format_detector if detect_formats else None
+        # value type -> input creator (registered creators are copied, so the registration is local to the factory)
+        self.input_creators = dict(self.default_input_creators)
+        # value type -> input creator of the type or its nearest registered base type (resolved on the first use)
+        self.resolved_input_creators = dict(self.input_creators)
+        # budget tracker of the running inference (the rest of the value is left out when its deadline passes)
+        self.budget_tracker = None
+        # fingerprints of the containers (by id) of the array being inferred - the nested array items are
+        # fingerprinted on every level otherwise
+        self.fingerprints_cache = None
 
     def create_input(self, input_name: str, input_value) -> JsonSchemaFormInput:
         """
         :raises UnknownInputType if the input type is unknown
         """
-        if isinstance(input_value, bool):
-            return BooleanInput(input_name)
-        if isinstance(input_value, str):
+        form_input = self._get_input_creator(input_name, type(input_value))(self, input_name, input_value)
+        if self.stats is not None:
+            self.stats.on_input_created(form_input)
+        return form_input
+
+    def on_input_created(self, form_input: JsonSchemaFormInput) -> JsonSchemaFormInput:
+        """
+        Counts the input created without create_input (returns the input)
+        """
+        if self.stats is not None:
+            self.stats.on_input_created(form_input)
+        return form_input
+
+    def add_items_input(self, input_item: ArrayInput, items_input: JsonSchemaFormInput):
+        """
+        Adds the items input to the array (see ArrayInput.add_items_input), counts the merge
+
+        :raises IncompatibleArrayItemsInput if the item is in incompatible type
+        """
+        if self.stats is not None and input_item.has_items_input():
+            self.stats.on_merge()
+        input_item.add_items_input(items_input)
+
+    def register_input_creator(
+            self, value_type: type,
+            input_creator: Callable[["JsonSchemaFormInputFactory", str, object], JsonSchemaFormInput]):
+        """
+        Registers the input creator (factory, input name, value) -> input of the values of the type
+            - creator of the type is used for its subclasses as well (unless they have their own creator),
+              the nearest base type in the method resolution order wins (e.g. bool values aren't integers)
+            - creator of a registered type is replaced (e.g. the dates can be created as the formatted strings)
+        """
+        self.input_creators[value_type] = input_creator
+        self.resolved_input_creators = dict(self.input_creators)
+
+    def register_string_format(self, format_name: str, pattern: str, min_length: int, max_length: int,
+                               marker: str = ""):
+        """
+        Registers the format detected in the string values (see StringFormatDetector.register_format)
+            - formats are detected after the registration even if the factory has been created without detection
+            - the registration is local to the factory (the default formats detector isn't changed)
+
+        :raises InvalidStringFormat if the length range is empty or the pattern is invalid
+        """
+        format_detector = StringFormatDetector() if self.format_detector is None else self.format_detector.copy()
+        format_detector.register_format(format_name, pattern, min_length, max_length, marker)
+        self.format_detector = format_detector
+
+    def is_inference_expired(self) -> bool:
+        """
+        Returns True if the deadline of the running inference has passed (called for every child value)
+        """
+        return self.budget_tracker is not None and self.budget_tracker.check_inference_deadline()
+
+    def _get_input_creator(
+            self, input_name: str, value_type: type
+    ) -> Callable[["JsonSchemaFormInputFactory", str, object], JsonSchemaFormInput]:
+        """
+        :raises UnknownInputType if neither the type nor any of its base types has an input creator
+        """
+        input_creator = self.resolved_input_creators.get(value_type)
+        if input_creator is None:
+            input_creator = self._resolve_input_creator(input_name, value_type)
+        return input_creator
+
+    def _resolve_input_creator(
+            self, input_name: str, value_type: type
+    ) -> Callable[["JsonSchemaFormInputFactory", str, object], JsonSchemaFormInput]:
+        """
+        :raises UnknownInputType if neither the type nor any of its base types has an input creator
+        """
+        for base_type in value_type.__mro__:
+            if base_type in self.input_creators:
+                self.resolved_input_creators[value_type] = self.input_creators[base_type]
+                return self.input_creators[base_type]
+        raise UnknownInputType(input_name)
+
+    def _create_boolean_input(self, input_name: str, input_value: bool) -> JsonSchemaFormInput:
+        return BooleanInput(input_name)
+
+    def _create_string_input(self, input_name: str, input_value: str) -> JsonSchemaFormInput:
+        if self.format_detector is None:
             return StringInput(input_name)
-        if isinstance(input_value, int):
-            if self.cast_types:
-                return StringInput(input_name, cast_type="integer")
+        return StringInput(input_name, string_format=self.format_detector.detect(input_value))
+
+    def _create_integer_input(self, input_name: str, input_value: int) -> JsonSchemaFormInput:
+        if self.cast_types:
+            return StringInput(input_name, cast_type="integer")
+        return IntegerInput(input_name)
+
+    def _create_float_input(self, input_name: str, input_value: float) -> JsonSchemaFormInput:
+        if self.cast_types:
+            return StringInput(input_name, cast_type="float")
+        return FloatInput(input_name)
+
+    def _create_object_input(self, input_name: str, input_value: dict) -> JsonSchemaFormInput:
+        input_item = ObjectInput(input_name, self.items_are_required)
+        for key, value in input_value.items():
+            if self.is_inference_expired():
+                break
+            input_item.add_property(self.create_input(key, value))
+        return input_item
+
+    def _create_array_input(self, input_name: str, input_value: list) -> JsonSchemaFormInput:
+        if self.fingerprints_cache is not None:
+            return self._create_array_items_input(input_name, input_value)
+        # the value isn't changed (and its containers can't be garbage collected) during the inference
+        self.fingerprints_cache = {}
+        try:
+            return self._create_array_items_input(input_name, input_value)
+        finally:
+            self.fingerprints_cache = None
+
+    def _create_array_items_input(self, input_name: str, input_value: list) -> JsonSchemaFormInput:
+        input_item = ArrayInput(input_name)
+        items_fingerprints = set()
+        for list_item in input_value:
+            if self.is_inference_expired():
+                break
+            self.add_array_item(input_item, list_item, items_fingerprints)
+        return input_item
+
+    # the creators of the built-in JSON value types (the subclasses are resolved by create_input)
+    default_input_creators: Dict[type, Callable] = {
+        bool: _create_boolean_input,
+        str: _create_string_input,
+        int: _create_integer_input,
+        float: _create_float_input,
+        dict: _create_object_input,
+        list: _create_array_input
+    }
+
+    # the creators of the inputs depending only on the value type (and the string format), see add_array_item
+    type_input_creators = frozenset(default_input_creators.values())
+
+    def add_array_item(self, input_item: ArrayInput, item_value, items_fingerprints: set):
+        """
+        Creates the array item input and adds it to the array
+            - items_fingerprints: structural fingerprints of the already added items (updated by the method),
+              merging of an item with already seen structure has no effect, so its input doesn't have to be created
+            - the items containing values of registered creators are never skipped (their inputs may depend on
+              the values, not only on their types)
+
+        :raises UnknownInputType if the input type is unknown
+        :raises IncompatibleArrayItemsInput if the item is in incompatible type
+        """
+        item_fingerprint = self._get_structure_fingerprint(item_value)
+        if item_fingerprint is not None:
+            if item_fingerprint in items_fingerprints:
+                return
+            items_fingerprints.add(item_fingerprint)
+        self.add_items_input(
+            input_item,
+            self.create_input(
+                input_item.get_name()[0:-1],
+                item_value
+            )
+        )
+
+    def _get_structure_fingerprint(self, value) -> Optional[tuple]:
+        """
+        Returns hashable structural shape of the value (keys and leaf types)
+            - list is represented by the distinct shapes of its items (in the order of their first occurrence)
+            - None if the value contains a value whose input doesn't depend on its type only (see _get_scalar_shape)
+            - fingerprints of the containers are cached while an array is inferred, so the nested arrays items
+              are visited once (the tuple fingerprints are still hashed on every level, the iterative engine
+              interns them to numbers)
+        """
+        if not isinstance(value, (dict, list)):
+            return self._get_scalar_shape(value)
+        if self.fingerprints_cache is None:
+            return self._create_structure_fingerprint(value)
+        if id(value) not in self.fingerprints_cache:
+            self.fingerprints_cache[id(value)] = self._create_structure_fingerprint(value)
+        return self.fingerprints_cache[id(value)]
+
+    def _create_structure_fingerprint(self, value) -> Optional[tuple]:
+        if not self._has_type_input_creator(value):
+            return None
+        if isinstance(value, dict):
+            items_fingerprints = []
+            for key, item in value.items():
+                item_fingerprint = self._get_structure_fingerprint(item)
+                if item_fingerprint is None:
+                    return None
+                items_fingerprints.append((key, item_fingerprint))
+            return dict, tuple(items_fingerprints)
+        if isinstance(value, list):
+            items_fingerprints = {}
+            for item in value:
+                item_fingerprint = self._get_structure_fingerprint(item)
+                if item_fingerprint is None:
+                    return None
+                items_fingerprints[item_fingerprint] = None
+            return list, tuple(items_fingerprints)
+
+    def _get_scalar_shape(self, value) -> Optional[tuple]:
+        """
+        Returns the shape of the leaf value (its type, strings of different formats have different shapes)
+            - None if the input of the value is created by a registered creator (it may depend on the value)
+        """
+        if not self._has_type_input_creator(value):
+            return None
+        if self.format_detector is not None and isinstance(value, str):
+            return str, self.format_detector.detect(value)
+        return type(value),
+
+    def _has_type_input_creator(self, value) -> bool:
+        """
+        Returns False if the input of the value is created by a registered creator (the values of unknown types
+        have no input, so their shape is their type)
+        """
+        input_creator = self.resolved_input_creators.get(type(value))
+        if input_creator is None:
+            try:
+                input_creator = self._resolve_input_creator("", type(value))
+            except UnknownInputType:
+                return True
+        return input_creator in self.type_input_creators
+
+    def create_input_from_definition(self, input_name: str, definition: dict,
+                                     definitions: dict = None) -> JsonSchemaFormInput:
+        """
+        Creates the input from its data schema definition (the inverse of JsonSchemaFormInput.create_definition)
+            - definitions: shared definitions referenced by "$ref" (see SharedDefinitionsEmitter)
+
+        :raises UnknownInputType if the definition type is unknown
+        """
+        return self.on_input_created(self._create_input_from_definition(input_name, definition, definitions))
+
+    def _create_input_from_definition(self, input_name: str, definition: dict,
+                                      definitions: dict = None) -> JsonSchemaFormInput:
+        if "$ref" in definition:
+            definition_name = definition["$ref"][len("#/definitions/"):]
+            if not definition["$ref"].startswith("#/definitions/") or definition_name not in (definitions or {}):
+                raise UnknownInputType(input_name)
+            definition = definitions[definition_name]
+        input_type = definition.get("type")
+        if input_type == "string":
+            return StringInput(
+                input_name,
+                cast_type=definition.get("cast_type"),
+                string_format=definition.get("format")
+            )
+        if input_type == "integer":
             return IntegerInput(input_name)
-        if isinstance(input_value, float):
-            if self.cast_types:
-                return StringInput(input_name, cast_type="float")
+        if input_type == "float":
             return FloatInput(input_name)
-        if isinstance(input_value, dict):
+        if input_type == "boolean":
+            return BooleanInput(input_name)
+        if input_type == "object":
             input_item = ObjectInput(input_name, self.items_are_required)
-            for key, value in input_value.items():
-                input_item.add_property(self.create_input(key, value))
+            for key, property_definition in definition.get("properties", {}).items():
+                input_item.add_property(self.create_input_from_definition(key, property_definition, definitions))
             return input_item
-        if isinstance(input_value, list):
+        if input_type == "array":
             input_item = ArrayInput(input_name)
-            for list_item in input_value:
-                array_item_input = self.create_input(
-                    input_item.get_name()[0:-1],
-                    list_item
+            # items of the empty (or truncated) arrays are defined as {}
+            if definition.get("items"):
+                input_item.set_items_input(
+                    self.create_input_from_definition(input_item.get_name()[0:-1], definition["items"], definitions)
                 )
-                if not input_item.has_items_input():
-                    input_item.set_items_input(array_item_input)
-                else:
-                    input_item.merge_items_input(array_item_input)
             return input_item
         raise UnknownInputType(input_name)
 
+    def create_input_from_events(self, input_name: str, event: str, value,
+                                 events: Iterator[Tuple[str, object]]) -> JsonSchemaFormInput:
+        """
+        Creates the input from the parse events (see JsonStreamParser) without materializing the whole value
+            - event and value are the first event of the input, the rest is consumed from the events iterator
+
+        :raises UnknownInputType if the input type is unknown
+        """
+        if event == "start_map":
+            input_item = self.on_input_created(ObjectInput(input_name, self.items_are_required))
+            for event, value in events:
+                if event == "end_map":
+                    break
+                # duplicate keys - the last value wins (as in json.loads)
+                input_item.add_property(self.create_input_from_events(value, *next(events), events))
+            return input_item
+        if event == "start_array":
+            input_item = self.on_input_created(ArrayInput(input_name))
+            for event, value in events:
+                if event == "end_array":
+                    break
+                self.add_items_input(
+                    input_item,
+                    self.create_input_from_events(
+                        input_item.get_name()[0:-1],
+                        event,
+                        value,
+                        events
+                    )
+                )
+            return input_item
+        return self.create_input(input_name, value)
+
 
 class JsonSchemaForm:
     """
     JSON schema form
     """
 
+    inputs_factory_class = JsonSchemaFormInputFactory
+
     def __init__(self, schema: dict, items_are_required: bool = True, items_are_invisible: bool = False,
-                 cast_types: bool = False):
+                 cast_types: bool = False, budget: InputBudget = None, detect_formats: bool = False,
+                 lazy: bool = False, schema_pointer: str = "", stats: GenerationStats = None):
+        """
+        budget: limits of the inference of untrusted inputs (see InputBudget)
+        detect_formats: string inputs get the format of their values (date-time, email, uuid, uri)
+        lazy: inputs are inferred on their first use (see load_inputs), not by the constructor
+        schema_pointer: JSON pointer of the schema in the whole document (see from_pointer)
+        stats: collector of the form generation statistics (see GenerationStats)
+
+        :raises SchemaIsNotObject if the schema is not an object
+        """
         self.schema = schema
+        self.schema_pointer = schema_pointer
         self.items_are_required = items_are_required
         self.items_are_invisible = items_are_invisible
-        self.inputs = []
-        self.inputs_factory = JsonSchemaFormInputFactory(self.items_are_required, cast_types)
+        self.form_inputs = []
+        self.inputs_loaded = False
+        self.stats = stats
+        self.inputs_factory = self.inputs_factory_class(self.items_are_required, cast_types, detect_formats, stats)
         self.data_schema = None
         self.ui_schema = None
-        self._load_inputs_from_schema()
+        self.validator = None
+        self.budget = budget
+        # limits of the budget exceeded by the input (see BudgetTracker.get_report), filled when it's inferred
+        self.exceeded_budget = {}
+        if not lazy:
+            self.load_inputs()
+
+    @property
+    def inputs(self) -> List[JsonSchemaFormInput]:
+        """
+        Inputs of the lazy form are inferred on the first access
+        """
+        if not self.inputs_loaded:
+            self.load_inputs()
+        return self.form_inputs
 
-    def _load_inputs_from_schema(self):
-        for key, value in self.schema.items():
-            self.inputs.append(
-                self.inputs_factory.create_input(key, value)
+    def load_inputs(self):
+        """
+        Infers the inputs from the schema (only once, the next calls have no effect)
+            - the inputs are left empty if the inference fails, so the next call raises the same error
+        """
+        if self.inputs_loaded:
+            return
+        # the inputs are already accessed while they are being inferred
+        self.inputs_loaded = True
+        try:
+            self._load_inputs_from_schema()
+        except Exception:
+            self.form_inputs = []
+            self.exceeded_budget = {}
+            self.inputs_loaded = False
+            raise
+
+    @classmethod
+    def from_pointer(cls, document, pointer: str, **json_schema_form_options) -> "JsonSchemaForm":
+        """
+        Creates the form of the object the JSON pointer refers to (e.g. "/payload/customer")
+            - only the containers on the path are visited, the other branches of the document aren't inferred
+            - json_schema_form_options: JsonSchemaForm keyword arguments (the budget limits the object only,
+              the exceeded limits are reported with the pointers in the whole document)
+
+        :raises InvalidJsonPointer if the pointer is not empty and doesn't start with "/"
+        :raises JsonPointerNotFound if the document doesn't contain the value
+        :raises SchemaIsNotObject if the value is not an object
+        """
+        schema = resolve_json_pointer(document, pointer)
+        if not isinstance(schema, dict):
+            raise SchemaIsNotObject()
+        return cls(schema, schema_pointer=pointer, **json_schema_form_options)
+
+    @classmethod
+    def from_json_stream(cls, json_stream: TextIO, items_are_required: bool = True,
+                         items_are_invisible: bool = False, cast_types: bool = False,
+                         detect_formats: bool = False, stats: GenerationStats = None) -> "JsonSchemaForm":
+        """
+        Creates the form directly from the JSON stream (the JSON document is never loaded as a whole)
+
+        :raises InvalidJsonStream if the stream doesn't contain a valid JSON document
+        :raises SchemaIsNotObject if the JSON document is not an object
+        """
+        form = cls({}, items_are_required, items_are_invisible, cast_types, detect_formats=detect_formats, stats=stats)
+        form._load_inputs_from_events(JsonStreamParser(json_stream).parse())
+        return form
+
+    @classmethod
+    def from_data_schema(cls, data_schema: dict, items_are_required: bool = True, items_are_invisible: bool = False,
+                         cast_types: bool = False, detect_formats: bool = False,
+                         stats: GenerationStats = None) -> "JsonSchemaForm":
+        """
+        Creates the form from previously generated data schema (use the options it has been generated with)
+
+        :raises SchemaIsNotObject if the data schema is not an object schema
+        :raises UnknownInputType if any of the definitions type is unknown
+        """
+        if not isinstance(data_schema, dict) or data_schema.get("type") != "object":
+            raise SchemaIsNotObject()
+        form = cls({}, items_are_required, items_are_invisible, cast_types, detect_formats=detect_formats, stats=stats)
+        for key, definition in data_schema.get("properties", {}).items():
+            form._add_input(
+                form.inputs_factory.create_input_from_definition(key, definition, data_schema.get("definitions"))
             )
+        return form
+
+    @classmethod
+    def from_inputs(cls, inputs: List[JsonSchemaFormInput], items_are_required: bool = True,
+                    items_are_invisible: bool = False, cast_types: bool = False,
+                    detect_formats: bool = False, stats: GenerationStats = None) -> "JsonSchemaForm":
+        """
+        Creates the form from already created inputs (stats: they have been created without the collector, so only
+        the emission is collected)
+        """
+        form = cls({}, items_are_required, items_are_invisible, cast_types, detect_formats=detect_formats, stats=stats)
+        for form_input in inputs:
+            form._add_input(form_input)
+        return form
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], items_are_required: bool = True,
+                     items_are_invisible: bool = False, cast_types: bool = False,
+                     budget: InputBudget = None, detect_formats: bool = False,
+                     stats: GenerationStats = None) -> "JsonSchemaForm":
+        """
+        Creates one form fitting all the records
+            - records are merged the same way as the array items (see ArrayInput.merge_items_input)
+            - records are processed one by one, so they can be read lazily
+            - records of already seen structure aren't inferred again, at most RECORDS_FINGERPRINTS_CACHE_SIZE
+              structures are remembered (forgotten all at once when exceeded), so the memory stays bounded even
+              if the records structures keep changing (e.g. optional keys) - the forgotten structure is only
+              inferred and merged again with no effect
+            - budget limits every record, the rest of the records is skipped when its deadline passes
+
+        :raises SchemaIsNotObject if any of the records is not an object
+        """
+        form = cls({}, items_are_required, items_are_invisible, cast_types, budget, detect_formats, stats=stats)
+        form._load_inputs_from_records(records)
+        return form
+
+    def merge(self, form: "JsonSchemaForm") -> List[JsonSchemaFormInput]:
+        """
+        Merges the form inferred from another part of the records (see from_records)
+            - the result is the same as if the form was inferred from all the records at once
+            - the operation is associative, so the parts can be merged in any grouping (keep the parts order)
+            - merged form must not be used afterwards (its inputs might be moved to this form)
+            - returns the inputs added to the form
+        """
+        if self.stats is not None:
+            self.stats.on_merge()
+        inputs_by_name = {form_input.get_name(): form_input for form_input in self.inputs}
+        added_inputs = []
+        for form_input in form.inputs:
+            if form_input.get_name() not in inputs_by_name:
+                self._add_input(form_input)
+                added_inputs.append(form_input)
+            else:
+                # existing inputs are kept as they are, only their string formats are merged (see ObjectInput.merge)
+                inputs_by_name[form_input.get_name()].merge_string_formats(form_input)
+        return added_inputs
+
+    def add_record(self, record: dict) -> List[JsonSchemaFormInput]:
+        """
+        Folds the record into the form - the result is the same as if the record was the last one of from_records
+            - returns the inputs added to the form (see fold_record)
+
+        :raises SchemaIsNotObject if the record is not an object
+        """
+        return self.fold_record(record)[0]
+
+    def fold_record(self, record: dict) -> Tuple[List[JsonSchemaFormInput], List[Tuple[StringInput, str]]]:
+        """
+        Folds the record into the form - the result is the same as if the record was the last one of from_records
+            - only the values of the new properties and of the properties with string formats are inferred
+              (existing properties are kept as they are, only their string formats are merged)
+            - returns the inputs added to the form and the string inputs whose formats have been dropped
+
+        :raises SchemaIsNotObject if the record is not an object
+        """
+        if not isinstance(record, dict):
+            raise SchemaIsNotObject()
+        inputs_by_name = {form_input.get_name(): form_input for form_input in self.inputs}
+        # all the inputs are created first, so the form isn't changed when the record is invalid
+        record_inputs = [
+            (inputs_by_name.get(key), self.inputs_factory.create_input(key, value))
+            for key, value in record.items()
+            if key not in inputs_by_name or inputs_by_name[key].has_string_formats()
+        ]
+        added_inputs = []
+        dropped_formats = []
+        for existing_input, form_input in record_inputs:
+            if existing_input is None:
+                self._add_input(form_input)
+                added_inputs.append(form_input)
+            else:
+                dropped_formats += existing_input.merge_string_formats(form_input)
+        return added_inputs, dropped_formats
+
+    def invalidate_definitions(self):
+        """
+        Drops cached schemas (called by the inputs when they change)
+        """
+        self.data_schema = None
+        self.ui_schema = None
+        self.validator = None
+
+    def _load_inputs_from_schema(self):
+        if not isinstance(self.schema, dict):
+            raise SchemaIsNotObject()
+        if self.budget is None:
+            for key, value in self.schema.items():
+                self._add_input(
+                    self.inputs_factory.create_input(key, value)
+                )
+            return
+        budget_tracker = self.budget.start()
+        # the factory checks the deadline while the inputs are created
+        self.inputs_factory.budget_tracker = budget_tracker
+        try:
+            for key, value, pointer in budget_tracker.limit_properties(self.schema, self.schema_pointer):
+                budget_tracker.start_inference(pointer)
+                self._add_input(
+                    self.inputs_factory.create_input(key, value)
+                )
+        finally:
+            self.inputs_factory.budget_tracker = None
+            self.exceeded_budget = budget_tracker.get_report()
+
+    def _load_inputs_from_records(self, records: Iterable[dict]):
+        records_input = self.inputs_factory.on_input_created(ArrayInput("records"))
+        records_fingerprints = set()
+        budget_tracker = self.budget.start() if self.budget is not None else None
+        # the factory checks the deadline while the inputs are created
+        self.inputs_factory.budget_tracker = budget_tracker
+        try:
+            for index, record in enumerate(records):
+                if not isinstance(record, dict):
+                    raise SchemaIsNotObject()
+                if budget_tracker is not None:
+                    if budget_tracker.check_deadline("/" + str(index)):
+                        break
+                    record = budget_tracker.limit_value(record, "/" + str(index))
+                    budget_tracker.start_inference("/" + str(index))
+                if len(records_fingerprints) >= RECORDS_FINGERPRINTS_CACHE_SIZE:
+                    records_fingerprints.clear()
+                self.inputs_factory.add_array_item(records_input, record, records_fingerprints)
+        finally:
+            self.inputs_factory.budget_tracker = None
+        if budget_tracker is not None:
+            self.exceeded_budget = budget_tracker.get_report()
+        if records_input.has_items_input():
+            for form_input in records_input.get_items_input().get_properties():
+                self._add_input(form_input)
+
+    def _add_input(self, form_input: JsonSchemaFormInput):
+        self.inputs.append(form_input)
+        form_input.set_parent(self)
+        self.invalidate_definitions()
+
+    def _load_inputs_from_events(self, events: Iterator[Tuple[str, object]]):
+        event, _ = next(events)
+        if event != "start_map":
+            raise SchemaIsNotObject()
+        inputs_positions = {}
+        for event, value in events:
+            if event == "end_map":
+                break
+            form_input = self.inputs_factory.create_input_from_events(value, *next(events), events)
+            # duplicate keys - the last value wins (as in json.loads)
+            if form_input.get_name() in inputs_positions:
+                self.inputs[inputs_positions[form_input.get_name()]] = form_input
+                form_input.set_parent(self)
+                self.invalidate_definitions()
+            else:
+                inputs_positions[form_input.get_name()] = len(self.inputs)
+                self._add_input(form_input)
+        # the rest of the stream must be validated as well
+        for _ in events:
+            pass
 
     def get_data_schema(self) -> dict:
+        """
+        Schema is cached until any of the inputs changes - the same dict is returned by the next calls and its
+        definitions are shared with the next schemas and the validator (see get_validator), so it must not be
+        modified (copy.deepcopy it first)
+        """
+        if self.data_schema is None:
+            with measure_phase(self.stats, "data_schema"):
+                self.data_schema = self.create_data_schema()
+        return self.data_schema
+
+    def get_ui_schema(self) -> dict:
+        """
+        Schema is cached until any of the inputs changes - it must not be modified (see get_data_schema)
+        """
+        if self.ui_schema is None:
+            with measure_phase(self.stats, "ui_schema"):
+                self.ui_schema = self.create_ui_schema()
+        return self.ui_schema
+
+    def get_validator(self) -> Callable[[object], List[dict]]:
+        """
+        Returns the validator of the data submitted by the form - the data schema compiled into a Python function
+        (see ValidatorCompiler), it's cached until any of the inputs changes
+        """
+        if self.validator is None:
+            self.validator = get_validator(self.get_data_schema())
+        return self.validator
+
+    def get_schemas(self) -> Tuple[dict, dict]:
+        """
+        Returns the data schema and the UI schema (see get_data_schema and get_ui_schema) created in one walk
+        of the inputs tree
+            - UI schema is empty if the items aren't invisible, the inputs are visited for the data schema only then
+            - schemas are cached, they must not be modified (see get_data_schema)
+        """
+        if not self.items_are_invisible:
+            return self.get_data_schema(), self.get_ui_schema()
+        if self.data_schema is None or self.ui_schema is None:
+            with measure_phase(self.stats, "schemas"):
+                self.data_schema, self.ui_schema = self.create_schemas()
+        return self.data_schema, self.ui_schema
+
+    def create_schemas(
+            self, get_input_definitions: Callable[[JsonSchemaFormInput], Tuple[dict, dict]] = None
+    ) -> Tuple[dict, dict]:
+        """
+        Creates new (not cached) data schema and UI schema in one walk of the inputs tree (see create_data_schema)
+        """
+        if not self.items_are_invisible:
+            return self.create_data_schema(), self.create_ui_schema()
+        if get_input_definitions is None:
+            get_input_definitions = self._get_input_definitions
+        data_schema = {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+        ui_schema = {}
+        for form_input in self.inputs:
+            name = form_input.get_name()
+            data_schema["properties"][name], ui_schema[name] = get_input_definitions(form_input)
+            if self.items_are_required:
+                data_schema["required"].append(name)
+        return data_schema, ui_schema
+
+    def create_data_schema(self, get_input_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        """
+        Creates new (not cached) data schema
+            - get_input_definition: provides the inputs definitions (their cached definitions by default)
+        """
+        if get_input_definition is None:
+            get_input_definition = self._get_input_definition
         data_schema = {
             "type": "object",
             "properties": {},
             "required": []
         }
         for form_input in self.inputs:
-            data_schema["properties"][form_input.get_name()] = form_input.get_definition()
+            data_schema["properties"][form_input.get_name()] = get_input_definition(form_input)
             if self.items_are_required:
                 data_schema["required"].append(form_input.get_name())
         return data_schema
 
-    def get_ui_schema(self) -> dict:
+    def create_ui_schema(self, get_input_ui_hidden_definition: Callable[[JsonSchemaFormInput], dict] = None) -> dict:
+        """
+        Creates new (not cached) UI schema (see create_data_schema)
+        """
         if not self.items_are_invisible:
             return {}
+        if get_input_ui_hidden_definition is None:
+            get_input_ui_hidden_definition = self._get_input_ui_hidden_definition
         ui_schema = {}
         for form_input in self.inputs:
-            ui_schema[form_input.get_name()] = form_input.get_ui_hidden_definition()
+            ui_schema[form_input.get_name()] = get_input_ui_hidden_definition(form_input)
         return ui_schema
 
+    @staticmethod
+    def _get_input_definition(form_input: JsonSchemaFormInput) -> dict:
+        return form_input.get_definition()
+
+    @staticmethod
+    def _get_input_ui_hidden_definition(form_input: JsonSchemaFormInput) -> dict:
+        return form_input.get_ui_hidden_definition()
+
+    @staticmethod
+    def _get_input_definitions(form_input: JsonSchemaFormInput) -> Tuple[dict, dict]:
+        return form_input.get_definitions()
+
 
 class JsonSchemaFormException(Exception):
     pass
@@ -300,6 +1267,12 @@ class JsonSchemaFormInputFactoryException(JsonSchemaFormException):
     pass
 
 
+class SchemaIsNotObject(JsonSchemaFormException):
+
+    def __str__(self) -> str:
+        return "JSON schema must be an object"
+
+
 class UnknownInputType(JsonSchemaFormInputFactoryException):
 
     def __init__(self, input_name: str):
@@ -309,6 +1282,15 @@ class UnknownInputType(JsonSchemaFormInputFactoryException):
         return "Input '" + self.input_name + "' has unknown type"
 
 
+class IncompatibleInputs(JsonSchemaFormException):
+
+    def __init__(self, input_name: str):
+        self.input_name = input_name
+
+    def __str__(self) -> str:
+        return "Input '" + self.input_name + "' can't be merged with an input of incompatible type"
+
+
 class IncompatibleArrayItemsInput(JsonSchemaFormInputFactoryException):
 
     def __init__(self, input_name: str):
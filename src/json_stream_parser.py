@@ -0,0 +1,172 @@
+import re
+from json.decoder import scanstring
+from typing import Iterator, TextIO, Tuple
+
+
+NUMBER_RE = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+NUMBER_CHARACTERS_RE = re.compile(r"[-+0-9.eE]*")
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+# the longest literal ("-Infinity") - we need at least this amount of characters to recognize any literal
+LITERAL_MAX_LENGTH = 9
+LITERALS = [
+    ("null", "null", None),
+    ("true", "boolean", True),
+    ("false", "boolean", False),
+    ("NaN", "number", float("nan")),
+    ("Infinity", "number", float("inf")),
+    ("-Infinity", "number", float("-inf"))
+]
+
+
+class JsonStreamParser:
+    """
+    Incremental JSON parser
+        - reads the stream by chunks and produces the parse events, so the whole document is never held in memory
+        - events: start_map, map_key, end_map, start_array, end_array, string, number, boolean, null
+        - values are decoded the same way as json.loads does it
+    """
+
+    default_chunk_size = 65536
+
+    def __init__(self, stream: TextIO, chunk_size: int = default_chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        # absolute position of the buffer start (for the error messages)
+        self.offset = 0
+        self.eof = False
+
+    def parse(self) -> Iterator[Tuple[str, object]]:
+        """
+        :raises InvalidJsonStream if the stream doesn't contain a valid JSON document
+        """
+        containers = []
+        state = "value"
+        while True:
+            char = self._peek()
+            if state == "after_value":
+                if not containers:
+                    if char:
+                        raise InvalidJsonStream("Extra data", self._get_absolute_position())
+                    return
+                if char == ",":
+                    self.position += 1
+                    state = "key" if containers[-1] == "map" else "value"
+                elif char == ("}" if containers[-1] == "map" else "]"):
+                    self.position += 1
+                    yield "end_" + containers.pop(), None
+                else:
+                    raise InvalidJsonStream("Expecting ',' delimiter", self._get_absolute_position())
+                continue
+            if (state == "key_or_end" and char == "}") or (state == "value_or_end" and char == "]"):
+                self.position += 1
+                yield "end_" + containers.pop(), None
+                state = "after_value"
+                continue
+            if state in ("key", "key_or_end"):
+                if char != '"':
+                    raise InvalidJsonStream(
+                        "Expecting property name enclosed in double quotes",
+                        self._get_absolute_position()
+                    )
+                key = self._read_string()
+                if self._peek() != ":":
+                    raise InvalidJsonStream("Expecting ':' delimiter", self._get_absolute_position())
+                self.position += 1
+                yield "map_key", key
+                state = "value"
+                continue
+            # value
+            if char == "{":
+                self.position += 1
+                containers.append("map")
+                yield "start_map", None
+                state = "key_or_end"
+            elif char == "[":
+                self.position += 1
+                containers.append("array")
+                yield "start_array", None
+                state = "value_or_end"
+            else:
+                yield self._read_scalar(char)
+                state = "after_value"
+
+    def _peek(self) -> str:
+        """
+        Skips the whitespaces and returns the next character without consuming it (empty string at the end)
+        """
+        while True:
+            self.position = WHITESPACE_RE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+
+    def _fill(self) -> bool:
+        """
+        Reads next chunk into the buffer (consumed part of the buffer is dropped)
+            - chunk size grows with the unconsumed buffer, so very long tokens are read in linear time
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.position))
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.position
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def _read_string(self) -> str:
+        while True:
+            try:
+                value, self.position = scanstring(self.buffer, self.position + 1)
+                return value
+            except ValueError as e:
+                # the string might continue in the next chunk
+                if not self._fill():
+                    raise InvalidJsonStream(e.msg, self.offset + e.pos)
+
+    def _read_scalar(self, char: str) -> Tuple[str, object]:
+        if char == '"':
+            return "string", self._read_string()
+        # make sure the whole token is in the buffer (number characters are followed by something else)
+        while True:
+            end = max(
+                NUMBER_CHARACTERS_RE.match(self.buffer, self.position).end() + 1,
+                self.position + LITERAL_MAX_LENGTH
+            )
+            if end <= len(self.buffer) or not self._fill():
+                break
+        match = NUMBER_RE.match(self.buffer, self.position)
+        if match is not None:
+            integer, fraction, exponent = match.groups()
+            self.position = match.end()
+            if fraction or exponent:
+                return "number", float(integer + (fraction or "") + (exponent or ""))
+            return "number", int(integer)
+        for literal, event, value in LITERALS:
+            if self.buffer.startswith(literal, self.position):
+                self.position += len(literal)
+                return event, value
+        raise InvalidJsonStream("Expecting value", self._get_absolute_position())
+
+    def _get_absolute_position(self) -> int:
+        return self.offset + self.position
+
+
+class JsonStreamParserException(Exception):
+    pass
+
+
+class InvalidJsonStream(JsonStreamParserException):
+
+    def __init__(self, message: str, position: int):
+        self.message = message
+        self.position = position
+
+    def __str__(self) -> str:
+        return self.message + " (char " + str(self.position) + ")"
@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Optional
+from src.json_backend import get_json_backend
+
+
+class SchemaCache:
+    """
+    On-disk cache of the generated schema documents
+        - content-addressed: the key is a hash of the input file bytes, the generator options and the documents
+          format version
+        - the least recently used documents are evicted when the cache exceeds its size
+        - the size of the cache is counted by the writes, the directory is scanned only by the first write and
+          when the size is exceeded (the writes of the concurrent processes are noticed by the next scan)
+    """
+
+    default_max_size = 256 * 1024 * 1024
+    hash_chunk_size = 1024 * 1024
+    # version of the generated documents (increased whenever the generator output changes, so the documents of
+    # the older versions are never read)
+    format_version = 1
+    # options changing the way of the inference, not the generated document
+    output_independent_options = ("stream", "iterative")
+
+    def __init__(self, cache_dir: str, max_size: int = default_max_size, bypass: bool = False):
+        """
+        max_size: maximal total size of the cached documents (in bytes)
+        bypass: cached documents are never read (generated documents are still stored)
+        """
+        if max_size < 0:
+            raise InvalidCacheSize(max_size)
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.bypass = bypass
+        # total size of the cached documents (counted by the last scan and the writes since then)
+        self.size = None
+
+    def get_key(self, json_path: str, options: dict) -> str:
+        key_options = {
+            **{key: value for key, value in options.items() if key not in self.output_independent_options},
+            "format_version": self.format_version
+        }
+        # the objects options (e.g. InputBudget) are hashed by their attributes
+        key_hash = hashlib.sha256(json.dumps(key_options, sort_keys=True, default=vars).encode())
+        with open(json_path, "rb") as json_file:
+            for chunk in iter(lambda: json_file.read(self.hash_chunk_size), b""):
+                key_hash.update(chunk)
+        return key_hash.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        if self.bypass:
+            return None
+        document_path = self._get_document_path(key)
+        try:
+            document = get_json_backend().loads(document_path.read_bytes())
+            # the modification time is the last usage time
+            os.utime(document_path)
+        except (FileNotFoundError, ValueError):
+            # missing, evicted in the meantime or incompletely written by an older version
+            return None
+        return document
+
+    def set(self, key: str, document: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        document_path = self._get_document_path(key)
+        # written under a temporary name first, so the concurrent readers never see a partial document
+        temporary_path = document_path.with_name(document_path.name + "." + str(os.getpid()) + ".tmp")
+        try:
+            document_bytes = get_json_backend().dumps(document).encode()
+        except RecursionError:
+            # too deep document (iterative inference) couldn't be parsed when read, so it isn't cached
+            return
+        temporary_path.write_bytes(document_bytes)
+        try:
+            replaced_size = document_path.stat().st_size
+        except FileNotFoundError:
+            replaced_size = 0
+        os.replace(temporary_path, document_path)
+        if self.size is None or self.size + len(document_bytes) - replaced_size > self.max_size:
+            self._evict()
+        else:
+            self.size += len(document_bytes) - replaced_size
+
+    def clear(self):
+        for document_path in self._get_documents_paths():
+            self._remove(document_path)
+        self.size = None
+
+    def _evict(self):
+        """
+        Scans the directory and removes the least recently used documents over the size
+        """
+        documents = []
+        total_size = 0
+        for document_path in self._get_documents_paths():
+            try:
+                stat = document_path.stat()
+            except FileNotFoundError:
+                continue
+            documents.append((stat.st_mtime_ns, stat.st_size, document_path))
+            total_size += stat.st_size
+        documents.sort()
+        for _, size, document_path in documents:
+            if total_size <= self.max_size:
+                break
+            self._remove(document_path)
+            total_size -= size
+        self.size = total_size
+
+    def _get_documents_paths(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return self.cache_dir.glob("*.json")
+
+    def _get_document_path(self, key: str) -> Path:
+        return self.cache_dir / (key + ".json")
+
+    @staticmethod
+    def _remove(document_path: Path):
+        try:
+            document_path.unlink()
+        except FileNotFoundError:
+            # removed by a concurrent process
+            pass
+
+
+class SchemaCacheException(Exception):
+    pass
+
+
+class InvalidCacheSize(SchemaCacheException):
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+    def __str__(self) -> str:
+        return "Cache size can't be negative, " + str(self.max_size) + " given"
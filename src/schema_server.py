@@ -0,0 +1,257 @@
+import sys
+import json
+import math
+import time
+import threading
+from collections import deque
+from typing import List, Tuple
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.json_schema_form import JsonSchemaForm, SchemaIsNotObject
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.batch_generator import get_json_schema_document
+from src.json_backend import get_json_backend
+from src.schema_validator import get_validator
+
+
+# query parameters (same as the CLI arguments) -> form options
+FORM_OPTIONS_PARAMETERS = {
+    "required-items": "items_are_required",
+    "invisible-items": "items_are_invisible",
+    "cast-types": "cast_types",
+    "detect-formats": "detect_formats"
+}
+
+FALSE_PARAMETER_VALUES = ("0", "false", "no")
+
+
+class LatencyRecorder:
+    """
+    Collects the requests latencies (in seconds) and computes their percentiles
+        - only the latest samples are kept, so the percentiles reflect the current load
+    """
+
+    default_max_samples = 10000
+
+    def __init__(self, max_samples: int = default_max_samples):
+        self.samples = deque(maxlen=max_samples)
+        self.requests_count = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self.lock:
+            self.samples.append(latency)
+            self.requests_count += 1
+
+    def get_percentile(self, percentile: float) -> float:
+        with self.lock:
+            samples = sorted(self.samples)
+        return self._get_sorted_samples_percentile(samples, percentile)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            samples = sorted(self.samples)
+            requests_count = self.requests_count
+        return {
+            "requests": requests_count,
+            "p50_ms": round(self._get_sorted_samples_percentile(samples, 50) * 1000, 3),
+            "p99_ms": round(self._get_sorted_samples_percentile(samples, 99) * 1000, 3)
+        }
+
+    @staticmethod
+    def _get_sorted_samples_percentile(samples: List[float], percentile: float) -> float:
+        # nearest-rank method
+        if not samples:
+            return 0.0
+        return samples[max(0, math.ceil(percentile / 100 * len(samples)) - 1)]
+
+
+class SchemaRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the schema server requests
+        - POST /schema: JSON document in the body, {"dataschema": ..., "uischema": ...} in the response
+          (query parameters required-items, invisible-items, cast-types, detect-formats override the server form
+          options, pointer query parameter limits the schema to the object the JSON pointer refers to)
+        - POST /validate: {"dataschema": ..., "data": ...} in the body, {"valid": ..., "errors": [...]} in the response
+          (the data schema is compiled into the validator once, see ValidatorCache)
+        - GET /stats: number of the schema requests and their p50/p99 latency, the same of the validation requests
+          in "validate"
+        - bodies larger than the server maximum are rejected with 413 without reading them
+    """
+
+    server: "SchemaServer"
+
+    def do_POST(self):
+        start_time = time.perf_counter()
+        url = urlsplit(self.path)
+        if url.path == "/schema":
+            self._send_json(*self._create_schema(url.query))
+            self.server.latency_recorder.record(time.perf_counter() - start_time)
+        elif url.path == "/validate":
+            self._send_json(*self._validate())
+            self.server.validate_latency_recorder.record(time.perf_counter() - start_time)
+        else:
+            self._send_json(404, {"error": "Unknown path " + url.path})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/stats":
+            self._send_json(404, {"error": "Unknown path " + url.path})
+            return
+        self._send_json(200, {
+            **self.server.latency_recorder.get_stats(),
+            "validate": self.server.validate_latency_recorder.get_stats()
+        })
+
+    def log_message(self, format: str, *args):
+        # access log on every request would dominate the latency of the small documents
+        pass
+
+    def _create_schema(self, url_query: str) -> Tuple[int, dict]:
+        try:
+            query = parse_qs(url_query, keep_blank_values=True)
+            json_schema_form_options = self._get_form_options(query)
+            document = get_json_backend().loads(self._read_body())
+            if "pointer" in query:
+                json_schema_form = self.server.form_class.from_pointer(
+                    document,
+                    query["pointer"][-1],
+                    **json_schema_form_options
+                )
+            else:
+                if not isinstance(document, dict):
+                    raise SchemaIsNotObject()
+                json_schema_form = self.server.form_class(document, **json_schema_form_options)
+            return 200, get_json_schema_document(json_schema_form, **self.server.document_options)
+        except RequestBodyTooLarge as e:
+            return 413, {"error": str(e)}
+        except Exception as e:
+            return 400, {"error": str(e)}
+
+    def _validate(self) -> Tuple[int, dict]:
+        try:
+            request = get_json_backend().loads(self._read_body())
+            if not isinstance(request, dict) or "dataschema" not in request or "data" not in request:
+                raise InvalidValidationRequest()
+            errors = get_validator(request["dataschema"])(request["data"])
+            return 200, {"valid": not errors, "errors": errors}
+        except RequestBodyTooLarge as e:
+            return 413, {"error": str(e)}
+        except Exception as e:
+            return 400, {"error": str(e)}
+
+    def _read_body(self) -> bytes:
+        """
+        :raises InvalidContentLength if the Content-Length header isn't a non-negative integer
+        :raises RequestBodyTooLarge if the body is larger than the server maximum
+        """
+        content_length = self.headers.get("Content-Length", "0")
+        if not content_length.isdigit():
+            # the body can't be read, so the connection can't be reused
+            self.close_connection = True
+            raise InvalidContentLength(content_length)
+        if int(content_length) > self.server.max_body_size:
+            # the body isn't read, so the connection can't be reused
+            self.close_connection = True
+            raise RequestBodyTooLarge(int(content_length), self.server.max_body_size)
+        return self.rfile.read(int(content_length))
+
+    def _get_form_options(self, query: dict) -> dict:
+        json_schema_form_options = dict(self.server.json_schema_form_options)
+        for parameter, option in FORM_OPTIONS_PARAMETERS.items():
+            if parameter in query:
+                json_schema_form_options[option] = query[parameter][-1].lower() not in FALSE_PARAMETER_VALUES
+        return json_schema_form_options
+
+    def _send_json(self, status: int, data: dict):
+        body = get_json_backend().dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SchemaServer(ThreadingHTTPServer):
+    """
+    Long-running schema generator (no interpreter startup and imports per request)
+        - every request is handled in its own thread
+    """
+
+    daemon_threads = True
+    default_max_body_size = 64 * 1024 * 1024
+
+    def __init__(self, server_address: Tuple[str, int], json_schema_form_options: dict, iterative: bool = False,
+                 document_options: dict = None, max_body_size: int = default_max_body_size):
+        """
+        json_schema_form_options: default form options of the requests
+        iterative: uses the explicit stack engine (see IterativeJsonSchemaForm)
+        document_options: get_json_schema_document keyword arguments
+        max_body_size: maximal size of the requests bodies (in bytes)
+        """
+        if max_body_size < 0:
+            raise InvalidMaxBodySize(max_body_size)
+        self.json_schema_form_options = json_schema_form_options
+        self.form_class = IterativeJsonSchemaForm if iterative else JsonSchemaForm
+        self.document_options = document_options or {}
+        self.max_body_size = max_body_size
+        self.latency_recorder = LatencyRecorder()
+        self.validate_latency_recorder = LatencyRecorder()
+        super().__init__(server_address, SchemaRequestHandler)
+
+    def serve_until_interrupted(self):
+        """
+        Serves until the keyboard interrupt, reports the latency stats on the standard error output then
+        """
+        host, port = self.server_address[0:2]
+        print("Serving on http://" + host + ":" + str(port), file=sys.stderr)
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            print("Latency stats: " + json.dumps(self.latency_recorder.get_stats()), file=sys.stderr)
+            print(
+                "Validation latency stats: " + json.dumps(self.validate_latency_recorder.get_stats()),
+                file=sys.stderr
+            )
+
+
+class SchemaServerException(Exception):
+    pass
+
+
+class InvalidValidationRequest(SchemaServerException):
+
+    def __str__(self) -> str:
+        return "Validation request must be an object with the dataschema and data"
+
+
+class InvalidContentLength(SchemaServerException):
+
+    def __init__(self, content_length: str):
+        self.content_length = content_length
+
+    def __str__(self) -> str:
+        return "Content-Length must be a non-negative integer, " + self.content_length + " given"
+
+
+class RequestBodyTooLarge(SchemaServerException):
+
+    def __init__(self, body_size: int, max_body_size: int):
+        self.body_size = body_size
+        self.max_body_size = max_body_size
+
+    def __str__(self) -> str:
+        return "Request body has " + str(self.body_size) + " bytes, at most " + str(self.max_body_size) + \
+            " bytes are accepted"
+
+
+class InvalidMaxBodySize(SchemaServerException):
+
+    def __init__(self, max_body_size: int):
+        self.max_body_size = max_body_size
+
+    def __str__(self) -> str:
+        return "Maximal body size can't be negative, " + str(self.max_body_size) + " given"
@@ -0,0 +1,314 @@
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, List
+from src.string_formats import DEFAULT_STRING_FORMATS
+from src.json_backend import get_json_backend
+
+
+VALIDATOR_CACHE_SIZE = 256
+
+# cast type -> pattern of the strings castable to the type
+CAST_TYPE_PATTERNS = {
+    "integer": r"[+-]?[0-9]+",
+    "float": r"[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+}
+
+# input type -> condition of the valid values (Python expression of the value variable)
+TYPE_CONDITIONS = {
+    "string": "isinstance({value}, str)",
+    "integer": "(isinstance({value}, int) and not isinstance({value}, bool)"
+               " or isinstance({value}, float) and {value}.is_integer())",
+    "float": "(isinstance({value}, (int, float)) and not isinstance({value}, bool))",
+    "boolean": "isinstance({value}, bool)",
+    "object": "isinstance({value}, dict)",
+    "array": "isinstance({value}, list)"
+}
+
+CONTAINER_TYPES = ("object", "array")
+
+# the value is missing in the validated object
+MISSING = object()
+
+
+class ValidatorCompiler:
+    """
+    Compiles the data schema (see JsonSchemaForm.get_data_schema) into the Python validation function
+        - every object and array definition is compiled into its own function with the type checks, required
+          properties, cast types and string formats baked in (the schema isn't interpreted during the validation)
+        - scalar properties and items are checked inline, the nested containers are validated from an explicit
+          stack (nesting depth of the values isn't limited by the recursion limit)
+        - shared definitions ("$ref") are compiled once
+    """
+
+    def __init__(self, data_schema: dict):
+        self.data_schema = data_schema
+        # generated functions sources and the names they reference (compiled patterns, ...)
+        self.sources = []
+        self.namespace = {"MISSING": MISSING, "get_error": get_error, "get_pointer": get_pointer}
+        # id of the container definition -> name of its function
+        self.functions_names = {}
+        # container definitions waiting for their functions (definition, pointer in the schema)
+        self.pending_definitions = []
+
+    def compile(self) -> Callable[[object], List[dict]]:
+        """
+        :raises InvalidValidatedSchema if the data schema isn't an object schema or any of its types is unknown
+        """
+        if not isinstance(self.data_schema, dict) or self.data_schema.get("type") != "object":
+            raise InvalidValidatedSchema("", "the schema must be an object schema")
+        root_function_name = self._get_function_name(self.data_schema, "")
+        while self.pending_definitions:
+            definition, schema_pointer = self.pending_definitions.pop()
+            self.sources.append(self._create_function_source(definition, schema_pointer))
+        exec(compile("\n\n".join(self.sources), "<validator>", "exec"), self.namespace)
+        return create_validator(self.namespace[root_function_name])
+
+    def _get_function_name(self, definition: dict, schema_pointer: str) -> str:
+        if id(definition) not in self.functions_names:
+            self.functions_names[id(definition)] = "validate_" + str(len(self.functions_names))
+            self.pending_definitions.append((definition, schema_pointer))
+        return self.functions_names[id(definition)]
+
+    def _resolve_definition(self, definition: dict, schema_pointer: str) -> dict:
+        """
+        :raises InvalidValidatedSchema if the referenced definition doesn't exist or the type is unknown
+        """
+        if not isinstance(definition, dict):
+            raise InvalidValidatedSchema(schema_pointer, "the definition must be an object")
+        if "$ref" in definition:
+            definition_name = definition["$ref"][len("#/definitions/"):]
+            definitions = self.data_schema.get("definitions") or {}
+            if not definition["$ref"].startswith("#/definitions/") or definition_name not in definitions:
+                raise InvalidValidatedSchema(schema_pointer, "unknown reference " + definition["$ref"])
+            definition = definitions[definition_name]
+        if "type" in definition and definition["type"] not in TYPE_CONDITIONS:
+            raise InvalidValidatedSchema(schema_pointer, "unknown type " + str(definition["type"]))
+        return definition
+
+    def _create_function_source(self, definition: dict, schema_pointer: str) -> str:
+        lines = [
+            "def " + self.functions_names[id(definition)] + "(value, parent_pointer, key, errors, stack):",
+            "    if not " + TYPE_CONDITIONS[definition["type"]].format(value="value") + ":",
+            "        errors.append(get_error(parent_pointer, key, " + repr("must be " + definition["type"]) + "))",
+            "        return"
+        ]
+        if definition["type"] == "object":
+            lines += self._create_properties_lines(definition, schema_pointer)
+        else:
+            lines += self._create_items_lines(definition, schema_pointer)
+        return "\n".join(lines)
+
+    def _create_properties_lines(self, definition: dict, schema_pointer: str) -> List[str]:
+        properties = definition.get("properties", {})
+        required = definition.get("required", [])
+        pointer = self._get_pointer_expression(properties.values(), schema_pointer)
+        lines = ["    pointer = get_pointer(parent_pointer, key)"] if pointer == "pointer" else []
+        for name in list(properties) + [name for name in required if name not in properties]:
+            # the keys are escaped in the JSON pointers of the errors
+            escaped_name = name.replace("~", "~0").replace("/", "~1")
+            check_lines = []
+            if name in properties:
+                check_lines = self._create_value_lines(
+                    properties[name],
+                    schema_pointer + "/properties/" + escaped_name,
+                    pointer,
+                    repr(escaped_name)
+                )
+            if name not in required and not check_lines:
+                continue
+            lines.append("    item = value.get(" + repr(name) + ", MISSING)")
+            if name in required:
+                lines += [
+                    "    if item is MISSING:",
+                    "        errors.append(get_error(" + pointer + ", " + repr(escaped_name) + ", 'is required'))"
+                ]
+                if check_lines:
+                    lines.append("    else:")
+            else:
+                lines.append("    if item is not MISSING:")
+            lines += ["    " + line for line in check_lines]
+        return lines
+
+    def _create_items_lines(self, definition: dict, schema_pointer: str) -> List[str]:
+        items_definition = definition.get("items", {})
+        pointer = self._get_pointer_expression([items_definition], schema_pointer + "/items")
+        check_lines = self._create_value_lines(items_definition, schema_pointer + "/items", pointer, "index")
+        if not check_lines:
+            return []
+        return [
+            *(["    pointer = get_pointer(parent_pointer, key)"] if pointer == "pointer" else []),
+            "    for index, item in enumerate(value):",
+            *["    " + line for line in check_lines]
+        ]
+
+    def _get_pointer_expression(self, child_definitions: Iterable[dict], schema_pointer: str) -> str:
+        """
+        The pointer of the container is created in advance only if its child containers are pushed to the stack
+        (the other children need it only when reporting the errors)
+        """
+        for child_definition in child_definitions:
+            if self._resolve_definition(child_definition, schema_pointer).get("type") in CONTAINER_TYPES:
+                return "pointer"
+        return "get_pointer(parent_pointer, key)"
+
+    def _create_value_lines(self, definition: dict, schema_pointer: str, pointer: str, key: str) -> List[str]:
+        """
+        Returns the lines checking the item variable (indented for the function body)
+            - pointer, key: expressions of the item location (used only when reporting the errors)
+        """
+        definition = self._resolve_definition(definition, schema_pointer)
+        if "type" not in definition:
+            # any value (items of an empty array)
+            return []
+        if definition["type"] in CONTAINER_TYPES:
+            function_name = self._get_function_name(definition, schema_pointer)
+            return ["    stack.append((" + function_name + ", item, " + pointer + ", " + key + "))"]
+        condition = TYPE_CONDITIONS[definition["type"]].format(value="item")
+        message = "must be " + definition["type"]
+        if definition.get("cast_type") in CAST_TYPE_PATTERNS:
+            # the string castable to the type or the already cast value
+            matcher_name = self._add_pattern(CAST_TYPE_PATTERNS[definition["cast_type"]])
+            condition = "(isinstance(item, str) and " + matcher_name + "(item) is not None or " + \
+                TYPE_CONDITIONS[definition["cast_type"]].format(value="item") + ")"
+            message = "must be " + definition["cast_type"] + " or string castable to " + definition["cast_type"]
+        elif definition.get("format") in DEFAULT_STRING_FORMATS and definition["type"] == "string":
+            # only the known formats are checked (as the annotations of the others), the pattern runs only for
+            # the values of the format length range containing its marker (as in StringFormatDetector.detect)
+            pattern, min_length, max_length, marker = DEFAULT_STRING_FORMATS[definition["format"]]
+            matcher_name = self._add_pattern(pattern)
+            condition = "(" + condition + " and " + str(min_length) + " <= len(item) <= " + str(max_length) + \
+                " and " + repr(marker) + " in item and " + matcher_name + "(item) is not None)"
+            message = "must be " + definition["format"] + " string"
+        return [
+            "    if not " + condition + ":",
+            "        errors.append(get_error(" + pointer + ", " + key + ", " + repr(message) + "))"
+        ]
+
+    def _add_pattern(self, pattern: str) -> str:
+        matcher_name = "match_" + str(len(self.namespace))
+        self.namespace[matcher_name] = re.compile(pattern).fullmatch
+        return matcher_name
+
+
+def create_validator(root_function: Callable) -> Callable[[object], List[dict]]:
+    def validate(value) -> List[dict]:
+        """
+        Returns the errors of the value - [{"pointer": <JSON pointer of the invalid value>, "message": ...}, ...]
+        (empty list if the value is valid)
+            - errors of the nested containers are listed after the errors of their parents
+        """
+        errors = []
+        stack = [(root_function, value, "", None)]
+        while stack:
+            function, item, parent_pointer, key = stack.pop()
+            function(item, parent_pointer, key, errors, stack)
+        return errors
+
+    return validate
+
+
+def get_pointer(parent_pointer: str, key) -> str:
+    return parent_pointer if key is None else parent_pointer + "/" + str(key)
+
+
+def get_error(parent_pointer: str, key, message: str) -> dict:
+    return {"pointer": get_pointer(parent_pointer, key), "message": message}
+
+
+def get_schema_hash(data_schema: dict) -> str:
+    """
+    Hash of the schema content (the same for the equal schemas regardless of their keys order)
+        - the schema is serialized by the JSON backend (see get_json_backend), the schemas nested deeper than
+          the recursion limit are serialized without recursion
+    """
+    try:
+        serialized_schema = get_json_backend().dumps(data_schema, sort_keys=True)
+    except RecursionError:
+        serialized_schema = "".join(iterate_schema_tokens(data_schema))
+    return hashlib.sha256(serialized_schema.encode()).hexdigest()
+
+
+def iterate_schema_tokens(data_schema: dict) -> Iterator[str]:
+    """
+    Yields the unambiguous serialization of the schema (containers are prefixed by their sizes, keys are sorted)
+    """
+    stack = [data_schema]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            yield "{" + str(len(value))
+            for key, item in sorted(value.items(), reverse=True):
+                stack += [item, key]
+        elif isinstance(value, list):
+            yield "[" + str(len(value))
+            stack += reversed(value)
+        else:
+            yield json.dumps(value) + ";"
+
+
+class ValidatorCache:
+    """
+    Compiled validators cached by the schema hash (the least recently used are evicted)
+        - compiling is much slower than validating, so the schema submitted with every request is compiled once
+        - the cache is shared by the threads
+    """
+
+    def __init__(self, max_size: int = VALIDATOR_CACHE_SIZE):
+        self.max_size = max_size
+        self.validators = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_validator(self, data_schema: dict) -> Callable[[object], List[dict]]:
+        """
+        :raises InvalidValidatedSchema if the data schema can't be compiled
+        """
+        schema_hash = get_schema_hash(data_schema)
+        with self.lock:
+            validator = self.validators.get(schema_hash)
+            if validator is not None:
+                self.validators.move_to_end(schema_hash)
+                self.hits += 1
+                return validator
+            self.misses += 1
+        # concurrent misses of the same schema compile it more than once, the last one is cached
+        validator = ValidatorCompiler(data_schema).compile()
+        with self.lock:
+            self.validators[schema_hash] = validator
+            while len(self.validators) > self.max_size:
+                self.validators.popitem(last=False)
+        return validator
+
+    def get_info(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.validators), "max_size": self.max_size}
+
+
+validator_cache = ValidatorCache()
+
+
+def get_validator(data_schema: dict) -> Callable[[object], List[dict]]:
+    """
+    Returns the compiled validator of the data schema (cached by the schema hash, see ValidatorCache)
+
+    :raises InvalidValidatedSchema if the data schema can't be compiled
+    """
+    return validator_cache.get_validator(data_schema)
+
+
+class SchemaValidatorException(Exception):
+    pass
+
+
+class InvalidValidatedSchema(SchemaValidatorException):
+
+    def __init__(self, schema_pointer: str, reason: str):
+        self.schema_pointer = schema_pointer
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return "Schema can't be compiled into the validator at '" + self.schema_pointer + "': " + self.reason
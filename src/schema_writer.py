@@ -0,0 +1,130 @@
+import json
+from functools import partial
+from json.encoder import encode_basestring_ascii
+from typing import Callable, Iterator, TextIO
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput
+from src.shared_definitions import SharedDefinitionsEmitter
+
+
+END_OF_ITEMS = object()
+
+
+class JsonSchemaWriter:
+    """
+    Writes JSON values straight to the output in chunks
+        - callable values are called when the writer reaches them, so the nested definitions can be created lazily
+          (see write_json_schema_document) and only the definitions on the current path are held in memory
+        - the output is the same as json.dumps(value, indent=indent) for the pretty output,
+          json.dumps(value, separators=(",", ":")) for the compact output (indent is None)
+        - nesting depth is not limited by the recursion limit
+    """
+
+    default_buffer_size = 65536
+
+    def __init__(self, output: TextIO, indent: int = None, buffer_size: int = default_buffer_size):
+        """
+        indent: number of spaces of the pretty output indentation (compact output if None)
+        buffer_size: number of characters collected before they are written to the output
+        """
+        self.output = output
+        self.indent = indent
+        self.buffer_size = buffer_size
+
+    def write(self, value):
+        buffer = []
+        buffer_size = 0
+        for chunk in self._iterate_chunks(value):
+            buffer.append(chunk)
+            buffer_size += len(chunk)
+            if buffer_size >= self.buffer_size:
+                self.output.write("".join(buffer))
+                buffer = []
+                buffer_size = 0
+        self.output.write("".join(buffer))
+
+    def _iterate_chunks(self, value) -> Iterator[str]:
+        if self.indent is None:
+            item_separator, key_separator = ",", ":"
+        else:
+            item_separator, key_separator = ",", ": "
+        # stack items: iterator of the container items, the container is a dict, no item has been written yet
+        stack = []
+        while True:
+            while callable(value):
+                value = value()
+            if isinstance(value, dict) and value:
+                yield "{"
+                stack.append([iter(value.items()), True, True])
+            elif isinstance(value, list) and value:
+                yield "["
+                stack.append([iter(value), False, True])
+            else:
+                yield self._encode_scalar(value)
+            # moving to the next value (closing the complete containers)
+            while stack:
+                frame = stack[-1]
+                item = next(frame[0], END_OF_ITEMS)
+                if item is END_OF_ITEMS:
+                    stack.pop()
+                    yield self._get_line_break(len(stack)) + ("}" if frame[1] else "]")
+                    continue
+                yield ("" if frame[2] else item_separator) + self._get_line_break(len(stack))
+                frame[2] = False
+                if frame[1]:
+                    key, value = item
+                    yield encode_basestring_ascii(key) + key_separator
+                else:
+                    value = item
+                break
+            else:
+                return
+
+    def _get_line_break(self, level: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    @staticmethod
+    def _encode_scalar(value) -> str:
+        if isinstance(value, str):
+            return encode_basestring_ascii(value)
+        if value is True:
+            return "true"
+        if value is False:
+            return "false"
+        if value is None:
+            return "null"
+        if isinstance(value, dict):
+            return "{}"
+        if isinstance(value, list):
+            return "[]"
+        return json.dumps(value)
+
+
+def write_json_schema_document(json_schema_form: JsonSchemaForm, output: TextIO, indent: int = None,
+                               shared_definitions: bool = False):
+    """
+    Writes the schema document ({"dataschema": ..., "uischema": ...}, see get_json_schema_document) to the output
+        - the definitions are created while they are written, the document is never built as a whole
+        - shared_definitions: see SharedDefinitionsEmitter (its data schema is built before writing)
+    """
+    def get_lazy_definition(form_input: JsonSchemaFormInput) -> Callable[[], dict]:
+        return partial(form_input.create_definition, get_lazy_definition)
+
+    def get_lazy_ui_hidden_definition(form_input: JsonSchemaFormInput) -> Callable[[], dict]:
+        return partial(form_input.create_ui_hidden_definition, get_lazy_ui_hidden_definition)
+
+    # the exceeded budget of the lazy form is known only after its inputs are inferred
+    json_schema_form.load_inputs()
+    if shared_definitions:
+        data_schema = SharedDefinitionsEmitter().get_data_schema(json_schema_form)
+    else:
+        data_schema = partial(json_schema_form.create_data_schema, get_lazy_definition)
+    json_schema_document = {
+        "dataschema": data_schema,
+        "uischema": partial(json_schema_form.create_ui_schema, get_lazy_ui_hidden_definition)
+    }
+    if json_schema_form.exceeded_budget:
+        # the schema has been inferred from a part of the input only
+        json_schema_document["budget"] = json_schema_form.exceeded_budget
+    JsonSchemaWriter(output, indent).write(json_schema_document)
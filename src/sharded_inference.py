@@ -0,0 +1,172 @@
+import os
+from itertools import repeat
+from typing import List, Iterator, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, JsonSchemaFormInputFactory, SchemaIsNotObject
+from src.json_backend import get_json_backend
+from src.generation_stats import GenerationStats
+
+
+def infer_json_lines_shard(json_lines_path: str, start: int, end: int,
+                           json_schema_form_options: dict) -> JsonSchemaForm:
+    """
+    Infers the form of the records starting in the given bytes range of the JSON lines file
+    """
+    return JsonSchemaForm.from_records(
+        read_json_lines_range(json_lines_path, start, end),
+        **json_schema_form_options
+    )
+
+
+def read_json_lines_range(json_lines_path: str, start: int, end: int) -> Iterator:
+    """
+    Yields the records of the lines starting in the bytes range (a line belongs to the range of its first byte)
+
+    :raises InvalidJsonRecord if any of the lines isn't a valid JSON
+    """
+    json_backend = get_json_backend()
+    with open(json_lines_path, "rb") as json_lines_file:
+        position = start
+        if start > 0:
+            # skipping the line started in the previous range
+            json_lines_file.seek(start - 1)
+            position += len(json_lines_file.readline()) - 1
+        while position < end:
+            line = json_lines_file.readline()
+            if not line:
+                break
+            if line.strip():
+                try:
+                    yield json_backend.loads(line)
+                except ValueError as e:
+                    raise InvalidJsonRecord(position, str(e))
+            position += len(line)
+
+
+def infer_array_shard(input_name: str, items: list, json_schema_form_options: dict) -> JsonSchemaFormInput:
+    """
+    Infers the array input of the items shard
+    """
+    inputs_factory = JsonSchemaFormInputFactory(
+        json_schema_form_options.get("items_are_required", True),
+        json_schema_form_options.get("cast_types", False),
+        json_schema_form_options.get("detect_formats", False)
+    )
+    return inputs_factory.create_input(input_name, items)
+
+
+def merge_inputs(inputs: Iterator) -> object:
+    """
+    Merges partial forms/inputs (in the shards order)
+    """
+    merged_input = next(inputs)
+    for form_input in inputs:
+        merged_input.merge(form_input)
+    return merged_input
+
+
+class ShardedSchemaInference:
+    """
+    Infers the form in multiple processes
+        - the data is split into shards, workers infer partial forms/inputs, partial results are merged
+        - the result is the same as the single process inference
+    """
+
+    default_min_shard_items = 1000
+
+    def __init__(self, json_schema_form_options: dict, workers_count: int = None, shards_count: int = None,
+                 min_shard_items: int = default_min_shard_items):
+        """
+        workers_count: number of worker processes (CPU count by default)
+        shards_count: number of shards (workers count by default)
+        min_shard_items: arrays shorter than this are not split
+        """
+        if workers_count is not None and workers_count < 1:
+            raise InvalidShardingParameter("workers count", workers_count)
+        if shards_count is not None and shards_count < 1:
+            raise InvalidShardingParameter("shards count", shards_count)
+        self.json_schema_form_options = json_schema_form_options
+        self.workers_count = workers_count or os.cpu_count() or 1
+        self.shards_count = shards_count or self.workers_count
+        self.min_shard_items = min_shard_items
+
+    def infer_json_lines(self, json_lines_path: str) -> JsonSchemaForm:
+        """
+        Infers the form fitting all the records of the JSON lines file (see JsonSchemaForm.from_records)
+            - every worker reads only its own bytes range of the file
+        """
+        file_size = os.path.getsize(json_lines_path)
+        ranges = self._get_shards_ranges(file_size, self.shards_count)
+        with ProcessPoolExecutor(max_workers=self.workers_count) as executor:
+            return merge_inputs(
+                executor.map(
+                    infer_json_lines_shard,
+                    repeat(json_lines_path),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    repeat(self.json_schema_form_options)
+                )
+            )
+
+    def infer_document(self, document: dict, stats: GenerationStats = None) -> JsonSchemaForm:
+        """
+        Infers the form of the JSON document
+            - top level arrays are split into the shards, the rest of the document is inferred directly
+            - stats: collector of the inputs inferred directly (the workers inputs aren't collected)
+
+        :raises SchemaIsNotObject if the document is not an object
+        """
+        if not isinstance(document, dict):
+            raise SchemaIsNotObject()
+        inputs_factory = JsonSchemaFormInputFactory(
+            self.json_schema_form_options.get("items_are_required", True),
+            self.json_schema_form_options.get("cast_types", False),
+            self.json_schema_form_options.get("detect_formats", False),
+            stats
+        )
+        sharded_inputs = {}
+        with ProcessPoolExecutor(max_workers=self.workers_count) as executor:
+            # submitting all the shards first, so the workers are busy while we infer the rest
+            for key, value in document.items():
+                if isinstance(value, list) and len(value) >= self.min_shard_items * 2:
+                    shards_count = min(self.shards_count, len(value) // self.min_shard_items)
+                    sharded_inputs[key] = [
+                        executor.submit(infer_array_shard, key, value[start:end], self.json_schema_form_options)
+                        for start, end in self._get_shards_ranges(len(value), shards_count)
+                    ]
+            inputs = []
+            for key, value in document.items():
+                if key in sharded_inputs:
+                    inputs.append(merge_inputs(future.result() for future in sharded_inputs[key]))
+                else:
+                    inputs.append(inputs_factory.create_input(key, value))
+        return JsonSchemaForm.from_inputs(inputs, **self.json_schema_form_options)
+
+    @staticmethod
+    def _get_shards_ranges(size: int, shards_count: int) -> List[Tuple[int, int]]:
+        boundaries = [size * shard // shards_count for shard in range(shards_count + 1)]
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+class ShardedInferenceException(Exception):
+    pass
+
+
+class InvalidJsonRecord(ShardedInferenceException):
+
+    def __init__(self, position: int, message: str):
+        self.position = position
+        self.message = message
+
+    def __str__(self) -> str:
+        return "Record at byte " + str(self.position) + " is not a valid JSON: " + self.message
+
+
+class InvalidShardingParameter(ShardedInferenceException):
+
+    def __init__(self, parameter_name: str, value: int):
+        self.parameter_name = parameter_name
+        self.value = value
+
+    def __str__(self) -> str:
+        return "Sharding " + self.parameter_name + " must be a positive number, " + str(self.value) + " given"
@@ -0,0 +1,135 @@
+import re
+import threading
+import weakref
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, ObjectInput
+
+
+DEFINITION_NAME_INVALID_CHARACTERS_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class InputShape:
+    """
+    Structural shape of the input subtree - shapes are interned, so the structurally identical subtrees have the same
+    shape object
+        - key: the input shape key with the child inputs shapes (their identity hashes, so it isn't hashed deeply)
+    """
+
+    __slots__ = ("key", "__weakref__")
+
+    def __init__(self, key: tuple):
+        self.key = key
+
+
+# shapes are held by the inputs caching them (and by the parent shapes), unused shapes are dropped
+interned_shapes = weakref.WeakValueDictionary()
+interned_shapes_lock = threading.Lock()
+
+
+def intern_shape(key: tuple) -> InputShape:
+    shape = interned_shapes.get(key)
+    if shape is None:
+        with interned_shapes_lock:
+            shape = interned_shapes.setdefault(key, InputShape(key))
+    return shape
+
+
+def get_input_shape(form_input: JsonSchemaFormInput) -> InputShape:
+    """
+    Returns the input shape - it's cached by the inputs until they change, so only the changed subtrees are visited
+    (without recursion) when the shape is needed again
+    """
+    # stack items: input, its child inputs (None until the children are pushed)
+    stack = [(form_input, None)]
+    while stack:
+        current_input, child_inputs = stack.pop()
+        if current_input.shape is not None:
+            continue
+        if child_inputs is None:
+            child_inputs = current_input.get_child_inputs()
+            if child_inputs:
+                stack.append((current_input, child_inputs))
+                stack += [(child_input, None) for child_input in child_inputs if child_input.shape is None]
+                continue
+        shape_key = current_input.get_shape_key()
+        if child_inputs:
+            shape_key += tuple([child_input.shape for child_input in child_inputs])
+        current_input.shape = intern_shape(shape_key)
+    return form_input.shape
+
+
+class SharedDefinitionsEmitter:
+    """
+    Emits the data schema with structurally identical object inputs defined only once
+        - identical object subtrees are hash-consed into one shape, every shape occurring more than once is emitted
+          under the "definitions" and referenced by "$ref" everywhere else
+        - shapes are cached by the inputs (see get_input_shape), the emission visits only the first input of every
+          shape (the identical subtrees are skipped) and every shape definition is created only once
+    """
+
+    default_min_occurrences = 2
+
+    def __init__(self, min_occurrences: int = default_min_occurrences):
+        """
+        min_occurrences: minimal number of the shape occurrences to emit it as a shared definition
+        """
+        self.min_occurrences = min_occurrences
+
+    def get_data_schema(self, json_schema_form: JsonSchemaForm) -> dict:
+        # shapes in the order of their first occurrence (children first) with their first input
+        shapes_numbers = {}
+        shapes_inputs = []
+        shapes_children = []
+        # stack items: input, its child inputs (None until the children are pushed) (reversed - left-to-right order)
+        stack = [(form_input, None) for form_input in reversed(json_schema_form.inputs)]
+        while stack:
+            form_input, child_inputs = stack.pop()
+            shape = get_input_shape(form_input)
+            if shape in shapes_numbers:
+                continue
+            if child_inputs is None:
+                child_inputs = form_input.get_child_inputs()
+                if child_inputs:
+                    stack.append((form_input, child_inputs))
+                    stack += [(child_input, None) for child_input in reversed(child_inputs)]
+                    continue
+            shapes_numbers[shape] = len(shapes_inputs)
+            shapes_inputs.append(form_input)
+            shapes_children.append([shapes_numbers[child_input.shape] for child_input in child_inputs])
+        # occurrences of the shapes (parents are numbered after their children)
+        shapes_counts = [0] * len(shapes_inputs)
+        for form_input in json_schema_form.inputs:
+            shapes_counts[shapes_numbers[form_input.shape]] += 1
+        for shape_number in reversed(range(len(shapes_inputs))):
+            for child_shape_number in shapes_children[shape_number]:
+                shapes_counts[child_shape_number] += shapes_counts[shape_number]
+        # emitting (children first) - every shape definition is created only once
+        definitions = {}
+        shapes_definitions = []
+
+        def get_child_definition(child_input: JsonSchemaFormInput) -> dict:
+            return shapes_definitions[shapes_numbers[child_input.shape]]
+
+        for shape_number, form_input in enumerate(shapes_inputs):
+            definition = form_input.create_definition(get_child_definition)
+            if isinstance(form_input, ObjectInput) and shapes_counts[shape_number] >= self.min_occurrences:
+                definition_name = self._get_definition_name(form_input, definitions)
+                definitions[definition_name] = definition
+                definition = {"$ref": "#/definitions/" + definition_name}
+            shapes_definitions.append(definition)
+        data_schema = json_schema_form.create_data_schema(get_child_definition)
+        if definitions:
+            data_schema["definitions"] = definitions
+        return data_schema
+
+    @staticmethod
+    def _get_definition_name(form_input: JsonSchemaFormInput, definitions: dict) -> str:
+        """
+        Input name with the characters safe for the JSON pointer (suffixed by a number when already used)
+        """
+        name = DEFINITION_NAME_INVALID_CHARACTERS_RE.sub("_", form_input.get_name()) or "definition"
+        definition_name = name
+        suffix = 2
+        while definition_name in definitions:
+            definition_name = name + str(suffix)
+            suffix += 1
+        return definition_name
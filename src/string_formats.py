@@ -0,0 +1,107 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+class StringFormatDetector:
+    """
+    Detects the JSON schema format of the string values ("date-time", "email", ...)
+        - matchers are precompiled, a matcher runs only for the values of its length range containing its marker,
+          so most of the values are ruled out without running any regular expression
+        - matchers applicable to a value length are cached (the values of a sample have a few distinct lengths)
+        - the first matching format wins (in the registration order)
+    """
+
+    def __init__(self):
+        # format name, compiled pattern, min length, max length, marker
+        self.matchers = []
+        self.max_length = 0
+        # value length -> applicable matchers
+        self.length_matchers = {}
+
+    def register_format(self, format_name: str, pattern: str, min_length: int, max_length: int, marker: str = ""):
+        """
+        Registers the format of the values matching the pattern as a whole
+            - min_length, max_length: length range of the matching values (the longer values are never matched)
+            - marker: substring every matching value contains (cheap check before the pattern matching)
+
+        :raises InvalidStringFormat if the length range is empty or the pattern is invalid
+        """
+        if min_length < 0 or min_length > max_length:
+            raise InvalidStringFormat(format_name, "length range " + str(min_length) + "-" + str(max_length))
+        try:
+            compiled_pattern = re.compile(pattern)
+        except re.error as e:
+            raise InvalidStringFormat(format_name, "pattern (" + str(e) + ")")
+        self.matchers.append((format_name, compiled_pattern, min_length, max_length, marker))
+        self.max_length = max(self.max_length, max_length)
+        self.length_matchers = {}
+
+    def detect(self, value: str) -> Optional[str]:
+        """
+        Returns the format name or None if the value has no registered format
+        """
+        length = len(value)
+        if length > self.max_length:
+            return None
+        matchers = self.length_matchers.get(length)
+        if matchers is None:
+            matchers = self.length_matchers[length] = self._get_length_matchers(length)
+        for format_name, compiled_pattern, marker in matchers:
+            if marker in value and compiled_pattern.fullmatch(value) is not None:
+                return format_name
+        return None
+
+    def copy(self) -> "StringFormatDetector":
+        format_detector = StringFormatDetector()
+        format_detector.matchers = list(self.matchers)
+        format_detector.max_length = self.max_length
+        return format_detector
+
+    def _get_length_matchers(self, length: int) -> List[Tuple[str, re.Pattern, str]]:
+        return [
+            (format_name, compiled_pattern, marker)
+            for format_name, compiled_pattern, min_length, max_length, marker in self.matchers
+            if min_length <= length <= max_length
+        ]
+
+
+# format name -> pattern, min length, max length, marker
+DEFAULT_STRING_FORMATS: Dict[str, Tuple[str, int, int, str]] = {
+    "uuid": (r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}", 36, 36, "-"),
+    # RFC 3339 (the fraction of a second is limited to nanoseconds by the max length)
+    "date-time": (
+        r"[0-9]{4}-[0-9]{2}-[0-9]{2}[Tt][0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]+)?(?:[Zz]|[+-][0-9]{2}:[0-9]{2})",
+        20,
+        35,
+        ":"
+    ),
+    "email": (r"[^@\s]+@(?:[^@\s.]+\.)+[^@\s.]+", 5, 254, "@"),
+    # hierarchical URIs only ("scheme:text" is too common in the plain texts), the authority is only checked
+    # for its first character, so the non-matching values aren't backtracked
+    "uri": (r"[A-Za-z][A-Za-z0-9+.-]*://[^\s/?#][^\s]*", 5, 2048, "://")
+}
+
+
+def create_default_format_detector() -> StringFormatDetector:
+    format_detector = StringFormatDetector()
+    for format_name, (pattern, min_length, max_length, marker) in DEFAULT_STRING_FORMATS.items():
+        format_detector.register_format(format_name, pattern, min_length, max_length, marker)
+    return format_detector
+
+
+# shared by the factories detecting the default formats (see JsonSchemaFormInputFactory.register_string_format)
+default_format_detector = create_default_format_detector()
+
+
+class StringFormatException(Exception):
+    pass
+
+
+class InvalidStringFormat(StringFormatException):
+
+    def __init__(self, format_name: str, reason: str):
+        self.format_name = format_name
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return "String format '" + self.format_name + "' has invalid " + self.reason
@@ -0,0 +1,120 @@
+import json
+import random
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from src.json_schema_form import JsonSchemaForm, SchemaIsNotObject
+from src.batch_generator import get_json_schema_document
+from src.async_generator import AsyncSchemaGenerator, InvalidAsyncParameter
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """
+    Runs the jobs only when the gate is open, counts the submitted jobs
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.gate = threading.Event()
+        self.submitted_jobs_count = 0
+
+    def submit(self, function, *arguments, **keyword_arguments):
+        self.submitted_jobs_count += 1
+
+        def run_gated():
+            self.gate.wait()
+            return function(*arguments, **keyword_arguments)
+
+        return super().submit(run_gated)
+
+
+class AsyncSchemaGeneratorTests(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        generator = random.Random(1)
+        self.records = [
+            {
+                "id": index,
+                "key" + str(generator.randint(0, 30)): {"foo" + str(generator.randint(0, 5)): "bar"},
+                "tags": [{"tag" + str(generator.randint(0, 5)): True}, {"values": [generator.randint(0, 5)]}]
+            }
+            for index in range(100)
+        ]
+        self.document = {
+            "records": self.records,
+            "shortList": [1, 2],
+            **{"key" + str(index): self.records[index] for index in range(10)}
+        }
+
+    async def test_generate(self):
+        options = {"items_are_required": False, "cast_types": True}
+        expected_document = get_json_schema_document(JsonSchemaForm(self.document, **options))
+        for chunk_items in [1, 7, 1000]:
+            generator = AsyncSchemaGenerator(options, chunk_items=chunk_items)
+            self.assertEqual(json.dumps(await generator.generate(self.document)), json.dumps(expected_document))
+
+    async def test_generate_from_records(self):
+        expected_document = get_json_schema_document(JsonSchemaForm.from_records(self.records))
+
+        async def iterate_records():
+            for record in self.records:
+                await asyncio.sleep(0)
+                yield record
+
+        generator = AsyncSchemaGenerator(chunk_items=30)
+        for records in [self.records, iterate_records()]:
+            self.assertEqual(
+                json.dumps(await generator.generate_from_records(records)),
+                json.dumps(expected_document)
+            )
+        self.assertEqual(await generator.generate_from_records([]), get_json_schema_document(JsonSchemaForm({})))
+
+    async def test_string_formats_merge(self):
+        records = [{"mail": "ab@cd.ef"}] * 100 + [{"mail": "abcdefgh"}] * 100
+        options = {"detect_formats": True}
+        expected_document = get_json_schema_document(JsonSchemaForm.from_records(records, **options))
+        self.assertNotIn("format", expected_document["dataschema"]["properties"]["mail"])
+        generator = AsyncSchemaGenerator(options, chunk_items=30)
+        self.assertEqual(json.dumps(await generator.generate_from_records(records)), json.dumps(expected_document))
+
+    async def test_process_pool_executor(self):
+        expected_document = get_json_schema_document(JsonSchemaForm(self.document))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            generator = AsyncSchemaGenerator(executor=executor, chunk_items=40)
+            self.assertEqual(json.dumps(await generator.generate(self.document)), json.dumps(expected_document))
+
+    async def test_concurrency_limit(self):
+        executor = GatedExecutor()
+        generator = AsyncSchemaGenerator(executor=executor, max_concurrency=1)
+        tasks = [asyncio.create_task(generator.generate({"foo": index})) for index in range(3)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(executor.submitted_jobs_count, 1)
+        executor.gate.set()
+        documents = await asyncio.gather(*tasks)
+        self.assertEqual(len(documents), 3)
+        executor.shutdown()
+
+    async def test_cancellation(self):
+        executor = GatedExecutor()
+        generator = AsyncSchemaGenerator(executor=executor, chunk_items=10)
+        task = asyncio.create_task(generator.generate({"records": self.records}))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        executor.gate.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(executor.submitted_jobs_count, 1)
+        # the generator is usable after the cancellation
+        self.assertIn("dataschema", await generator.generate({"foo": 1}))
+        executor.shutdown()
+
+    async def test_invalid_input(self):
+        with self.assertRaises(InvalidAsyncParameter):
+            AsyncSchemaGenerator(max_concurrency=0)
+        with self.assertRaises(InvalidAsyncParameter):
+            AsyncSchemaGenerator(chunk_items=0)
+        with self.assertRaises(SchemaIsNotObject):
+            await AsyncSchemaGenerator().generate([1])
+        with self.assertRaises(SchemaIsNotObject):
+            await AsyncSchemaGenerator().generate_from_records([{"foo": 1}, 1])
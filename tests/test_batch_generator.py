@@ -0,0 +1,80 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from src.json_schema_form import JsonSchemaForm
+from src.batch_generator import BatchGenerator, InvalidWorkersCount, find_json_paths, get_schema_paths
+
+
+class BatchGeneratorTests(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.documents = {
+            "a.json": {"foo": 1},
+            "b.json": {"bar": ["baz"]},
+            "c.json": {"array": ["foo", False]}
+        }
+        for file_name, document in self.documents.items():
+            Path(self.temp_dir.name, file_name).write_text(json.dumps(document))
+        Path(self.temp_dir.name, "invalid.json").write_text("{")
+        Path(self.temp_dir.name, "other.txt").write_text("{}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_json_paths(self):
+        directory = self.temp_dir.name
+        self.assertEqual(
+            find_json_paths(directory),
+            [os.path.join(directory, file_name) for file_name in ["a.json", "b.json", "c.json", "invalid.json"]]
+        )
+        self.assertEqual(
+            find_json_paths(os.path.join(directory, "[ab].json") + "," + os.path.join(directory, "missing.json")),
+            [os.path.join(directory, file_name) for file_name in ["a.json", "b.json", "missing.json"]]
+        )
+
+    def test_generate(self):
+        json_paths = find_json_paths(self.temp_dir.name) + [os.path.join(self.temp_dir.name, "missing.json")]
+        json_paths.append(os.path.join(self.temp_dir.name, "array.json"))
+        Path(json_paths[-1]).write_text(json.dumps([{"foo": 1}]))
+        results = list(BatchGenerator({"items_are_required": False}, workers_count=2).generate(json_paths))
+        self.assertEqual([result["input"] for result in results], json_paths)
+        for file_name in ["a.json", "b.json"]:
+            result = results[json_paths.index(os.path.join(self.temp_dir.name, file_name))]
+            self.assertEqual(
+                result["dataschema"],
+                JsonSchemaForm(self.documents[file_name], items_are_required=False).get_data_schema()
+            )
+            self.assertEqual(result["uischema"], {})
+        self.assertEqual(results[2]["error"], "Input 'array' has incompatible type with other array items")
+        self.assertIn("error", results[3])
+        self.assertEqual(results[4]["error"], "Defined JSON file doesn't exist")
+        self.assertEqual(results[5]["error"], "JSON schema must be an object")
+
+    def test_get_schema_paths(self):
+        json_paths = [
+            os.path.join("input", "a", "s.json"),
+            os.path.join("input", "b", "c", "s.json"),
+            os.path.join("input", "t.json"),
+            os.path.join("input", "a", "s.json"),
+            os.path.join("input", "t.JSON")
+        ]
+        self.assertEqual(
+            get_schema_paths(json_paths, "output"),
+            [
+                os.path.join("output", "a", "s.schema.json"),
+                os.path.join("output", "b", "c", "s.schema.json"),
+                os.path.join("output", "t.schema.json"),
+                os.path.join("output", "a", "s-2.schema.json"),
+                os.path.join("output", "t-2.schema.json")
+            ]
+        )
+        self.assertEqual(
+            get_schema_paths(json_paths[1:3], "output"),
+            [os.path.join("output", "s.schema.json"), os.path.join("output", "t.schema.json")]
+        )
+
+    def test_invalid_workers_count(self):
+        self.assertRaises(InvalidWorkersCount, BatchGenerator, {}, workers_count=0)
@@ -0,0 +1,35 @@
+from unittest import TestCase
+from benchmarks.workloads import WORKLOADS
+from benchmarks.suite import STAGES, benchmark_workload, find_regressions
+from src.json_schema_form import JsonSchemaForm
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def test_workloads(self):
+        for name, create_workload in WORKLOADS.items():
+            document = create_workload(0.01)
+            self.assertEqual(document, create_workload(0.01), name)
+            # every workload is a valid form input
+            JsonSchemaForm(document, items_are_invisible=True).get_ui_schema()
+            results = benchmark_workload(document, repeats=1)
+            self.assertEqual(list(results), STAGES)
+
+    def test_find_regressions(self):
+        baseline = {
+            "thresholds": {"default": 1.5, "wide.get_ui_schema": 3.0},
+            "results": {"wide": {"create_input": 0.1, "get_data_schema": 0.1, "get_ui_schema": 0.1}}
+        }
+        results = {
+            "wide": {"create_input": 0.14, "get_data_schema": 0.16, "get_ui_schema": 0.2},
+            "new": {"create_input": 1.0}
+        }
+        self.assertEqual(
+            find_regressions(results, baseline),
+            ["wide.get_data_schema: 0.1600 s (baseline 0.1000 s, threshold 1.50x)"]
+        )
+        # measurement noise of the tiny timings is ignored
+        self.assertEqual(
+            find_regressions({"wide": {"create_input": 0.0002}}, {"results": {"wide": {"create_input": 0.0001}}}),
+            []
+        )
@@ -0,0 +1,117 @@
+import io
+import sys
+import json
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from unittest import TestCase
+from src import generation_stats
+from src.generation_stats import GenerationStats, MemoryAlreadyTraced, measure_phase
+from src.json_schema_form import JsonSchemaForm
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.batch_generator import get_json_schema_document
+
+
+class GenerationStatsTests(TestCase):
+
+    def test_inputs_counts(self):
+        # records are merged as objects, so they are counted as the created inputs as well
+        with GenerationStats(trace_memory=False) as stats:
+            json_schema_form = JsonSchemaForm.from_records(
+                [{"items": [{"foo": 1}, {"foo": 2, "bar": "baz"}]}, {"items": [], "flag": True}],
+                stats=stats
+            )
+            get_json_schema_document(json_schema_form)
+        report = stats.get_report()
+        self.assertEqual(
+            {"ArrayInput": 3, "ObjectInput": 4, "IntegerInput": 2, "StringInput": 1, "BooleanInput": 1},
+            report["inputs"]["created"]
+        )
+        self.assertEqual(
+            {"ArrayInput": 1, "ObjectInput": 1, "IntegerInput": 1, "StringInput": 1, "BooleanInput": 1},
+            report["inputs"]["kept"]
+        )
+        self.assertEqual({"ArrayInput": 2, "ObjectInput": 3, "IntegerInput": 1}, report["inputs"]["discarded"])
+        self.assertGreater(report["merges"], 0)
+        self.assertEqual({"data_schema", "ui_schema"}, set(report["phases"]))
+        self.assertIsNone(report["peak_memory"])
+        self.assertIsNone(generation_stats.memory_tracing_stats)
+
+    def test_peak_memory_and_report(self):
+        with GenerationStats() as stats:
+            with measure_phase(stats, "inference"):
+                JsonSchemaForm.from_records([{"foo": ["bar"] * 1000}], stats=stats)
+        self.assertGreater(stats.get_report()["peak_memory"], 0)
+        output = io.StringIO()
+        stats.write_report(output)
+        self.assertIn("inference", output.getvalue())
+        self.assertIn("ArrayInput", output.getvalue())
+
+    def test_inactive_stats(self):
+        with measure_phase(None, "inference"):
+            pass
+        with GenerationStats(trace_memory=False) as stats:
+            JsonSchemaForm.from_records([{"foo": 1}])
+        self.assertEqual({}, stats.get_report()["inputs"]["created"])
+
+    def test_concurrent_forms(self):
+        # every form records into its own collector only
+        documents = [{"items": [{"foo": index}] * 100} for index in range(1, 4)]
+        collectors = [GenerationStats(trace_memory=False) for _ in documents]
+        barrier = threading.Barrier(len(documents))
+
+        def generate(form_class: type, document: dict, stats: GenerationStats):
+            barrier.wait()
+            with stats:
+                for _ in range(len(document["items"])):
+                    get_json_schema_document(form_class(document, stats=stats))
+
+        threads = [
+            threading.Thread(target=generate, args=(form_class, document, stats))
+            for form_class, document, stats in zip([JsonSchemaForm, IterativeJsonSchemaForm, JsonSchemaForm],
+                                                   documents, collectors)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for document, stats in zip(documents, collectors):
+            generations_count = len(document["items"])
+            self.assertEqual(
+                {"ArrayInput": generations_count, "ObjectInput": generations_count, "IntegerInput": generations_count},
+                stats.get_report()["inputs"]["created"]
+            )
+            self.assertEqual(stats.get_report()["inputs"]["created"], stats.get_report()["inputs"]["kept"])
+
+    def test_memory_already_traced(self):
+        with GenerationStats():
+            with self.assertRaises(MemoryAlreadyTraced):
+                GenerationStats().start()
+            # the collectors without the memory tracing can run at the same time
+            with GenerationStats(trace_memory=False):
+                pass
+
+    def test_deep_document_cli(self):
+        depth = 5000
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "document.json"
+            json_path.write_text("{\"a\": " * depth + "1" + "}" * depth)
+            stats_path = Path(directory) / "stats.json"
+            # the document built for the statistics is written without recursion as well
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    str(Path(__file__).parent.parent / "json_schema_generator.py"),
+                    "--input=" + str(json_path),
+                    "--iterative",
+                    "--compact",
+                    "--stats=" + str(stats_path)
+                ],
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout
+            self.assertTrue(output.startswith("{\"dataschema\":{\"type\":\"object\",\"properties\":{\"a\":"))
+            self.assertEqual(output.count("\"required\":[]"), depth)
+            self.assertIn("serialization", json.loads(stats_path.read_text())["phases"])
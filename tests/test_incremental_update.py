@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+from unittest import TestCase
+from src.json_schema_form import JsonSchemaForm, SchemaIsNotObject, UnknownInputType
+from src.shared_definitions import SharedDefinitionsEmitter
+from src.incremental_update import IncrementalSchemaUpdater, update_data_schema
+
+
+class IncrementalUpdateTests(TestCase):
+
+    def setUp(self):
+        self.document = json.loads(Path(__file__).parent.joinpath("test.json").read_text())
+
+    def test_data_schema_round_trip(self):
+        for options in [{}, {"items_are_required": False, "items_are_invisible": True, "cast_types": True}]:
+            form = JsonSchemaForm(self.document, **options)
+            loaded_form = JsonSchemaForm.from_data_schema(form.get_data_schema(), **options)
+            self.assertEqual(json.dumps(loaded_form.get_data_schema()), json.dumps(form.get_data_schema()))
+            self.assertEqual(json.dumps(loaded_form.get_ui_schema()), json.dumps(form.get_ui_schema()))
+            shared_data_schema = SharedDefinitionsEmitter(min_occurrences=1).get_data_schema(form)
+            self.assertIn("definitions", shared_data_schema)
+            self.assertEqual(
+                JsonSchemaForm.from_data_schema(shared_data_schema, **options).get_data_schema(),
+                form.get_data_schema()
+            )
+
+    def test_update(self):
+        records = [
+            {"fooBar": 1, "items": [{"a": "x"}]},
+            {"fooBar": "ignored", "items": [{"b": 1}], "nested": {"c": [1.5]}},
+            {"fooBar": 2, "flag": True, "nested": {"d": 1}, "a/b~c": None}
+        ]
+        data_schema, changes = update_data_schema(JsonSchemaForm(records[0]).get_data_schema(), records[1:2])
+        self.assertEqual(data_schema, JsonSchemaForm.from_records(records[0:2]).get_data_schema())
+        self.assertEqual(changes, [{"pointer": "/properties/nested", "type": "object"}])
+        schema_updater = IncrementalSchemaUpdater(data_schema)
+        unchanged_definition = schema_updater.get_data_schema()["properties"]["items"]
+        self.assertRaises(UnknownInputType, schema_updater.update, records[2])
+        del records[2]["a/b~c"]
+        self.assertEqual(schema_updater.update(records[2]), [{"pointer": "/properties/flag", "type": "boolean"}])
+        self.assertEqual(schema_updater.get_data_schema(), JsonSchemaForm.from_records(records).get_data_schema())
+        # only the changed paths are rebuilt
+        self.assertIs(schema_updater.get_data_schema()["properties"]["items"], unchanged_definition)
+        self.assertEqual(schema_updater.update(records[0]), [])
+        self.assertRaises(SchemaIsNotObject, schema_updater.update, [records[0]])
+
+    def test_string_formats(self):
+        records = [
+            {"mail": "ab@cd.ef", "nested": {"id": "ab@cd.ef"}, "other": "ab@cd.ef"},
+            {"mail": "plain", "nested": 1}
+        ]
+        options = {"detect_formats": True}
+        data_schema, changes = update_data_schema(JsonSchemaForm(records[0], **options).get_data_schema(), records[1:])
+        self.assertEqual(data_schema, JsonSchemaForm.from_records(records, **options).get_data_schema())
+        self.assertEqual(data_schema["properties"]["other"]["format"], "email")
+        self.assertEqual(
+            sorted(changes, key=lambda change: change["pointer"]),
+            [
+                {"pointer": "/properties/mail", "type": "string", "dropped_format": "email"},
+                {"pointer": "/properties/nested/properties/id", "type": "string", "dropped_format": "email"}
+            ]
+        )
+        # the formats are merged even without the formats detection
+        self.assertEqual(update_data_schema(data_schema, [{"other": "plain"}])[1][0]["dropped_format"], "email")
+
+    def test_schema_pointer(self):
+        form = JsonSchemaForm({"a/b~c": [{"d": [[1]]}]})
+        nested_input = form.inputs[0].get_items_input().get_property_by_name("d").get_items_input().get_items_input()
+        self.assertEqual(nested_input.get_schema_pointer(), "/properties/a~1b~0c/items/properties/d/items/items")
+
+    def test_invalid_data_schema(self):
+        self.assertRaises(SchemaIsNotObject, JsonSchemaForm.from_data_schema, {"type": "array"})
+        self.assertRaises(
+            UnknownInputType,
+            JsonSchemaForm.from_data_schema, {"type": "object", "properties": {"a": {}}}
+        )
+        self.assertRaises(
+            UnknownInputType,
+            JsonSchemaForm.from_data_schema,
+            {"type": "object", "properties": {"a": {"$ref": "#/definitions/missing"}}}
+        )
+
+    def test_empty_array(self):
+        data_schema, changes = update_data_schema(JsonSchemaForm({"list": [], "x": 1}).get_data_schema(), [{"y": 2}])
+        self.assertEqual(data_schema["properties"]["list"]["items"], {})
+        self.assertEqual(changes, [{"pointer": "/properties/y", "type": "integer"}])
+        records = [{"list": [], "x": 1}, {"y": 2}, {"nested": {"list": [[]]}}]
+        self.assertEqual(
+            update_data_schema(data_schema, records[2:])[0],
+            JsonSchemaForm.from_records(records).get_data_schema()
+        )
@@ -0,0 +1,167 @@
+import os
+import json
+import tempfile
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInputFactory, StringInput
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.batch_generator import get_json_schema_document, load_json_schema_form
+from src.schema_cache import SchemaCache
+from src.input_budget import InputBudget, BudgetTracker, InvalidBudgetLimit, BudgetNotSupported
+
+
+class InputBudgetTests(TestCase):
+
+    def test_max_depth(self):
+        document = value = {}
+        for level in range(10000):
+            value["level"] = [{"id": level}]
+            value = value["level"][0]
+        for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+            form = form_class(document, budget=InputBudget(max_depth=3))
+            self.assertEqual(
+                form.get_data_schema()["properties"]["level"]["items"]["properties"]["level"],
+                {"title": "Level", "type": "array", "items": {}}
+            )
+            self.assertEqual(
+                form.exceeded_budget,
+                {"max_depth": {"limit": 3, "count": 1, "pointers": ["/level/0/level"]}}
+            )
+
+    def test_max_properties(self):
+        document = {"key" + str(index): {"nested" + str(index): index for index in range(5)} for index in range(5)}
+        form = JsonSchemaForm(document, budget=InputBudget(max_properties=3))
+        self.assertEqual(list(form.get_data_schema()["properties"]), ["key0", "key1", "key2"])
+        self.assertEqual(
+            list(form.get_data_schema()["properties"]["key0"]["properties"]),
+            ["nested0", "nested1", "nested2"]
+        )
+        self.assertEqual(form.exceeded_budget["max_properties"]["count"], 4)
+        self.assertEqual(form.exceeded_budget["max_properties"]["pointers"][0], "")
+
+    def test_max_array_items(self):
+        budget = InputBudget(max_array_items=10)
+        items = [{"key" + str(index): index} for index in range(1000000)]
+        form = JsonSchemaForm({"items": items}, budget=budget)
+        properties = list(form.get_data_schema()["properties"]["items"]["items"]["properties"])
+        self.assertEqual(len(properties), 10)
+        # the sampled items keep their order and the sample is reproducible
+        self.assertEqual(properties, sorted(properties, key=lambda key: int(key[3:])))
+        other_form = JsonSchemaForm({"items": items}, budget=budget)
+        self.assertEqual(properties, list(other_form.get_data_schema()["properties"]["items"]["items"]["properties"]))
+        self.assertEqual(form.exceeded_budget, {"max_array_items": {"limit": 10, "count": 1, "pointers": ["/items"]}})
+        # the sample is uniform
+        tracker = InputBudget(max_array_items=10).start()
+        sampled_indexes = Counter()
+        for _ in range(2000):
+            indexes = tracker._sample_indexes(100)
+            self.assertEqual(len(set(indexes)), 10)
+            sampled_indexes.update(indexes)
+        self.assertEqual(set(sampled_indexes), set(range(100)))
+        self.assertLess(max(sampled_indexes.values()) / min(sampled_indexes.values()), 1.6)
+
+    def test_timeout(self):
+        budget = InputBudget(timeout=10)
+        tracker = budget.start()
+        self.assertEqual(tracker.limit_value({"foo": [1, 2]}), {"foo": [1, 2]})
+        tracker.deadline = 0
+        self.assertEqual(tracker.limit_value({"foo": [1, 2]}, "/1"), {})
+        self.assertEqual(tracker.get_report(), {"timeout": {"limit": 10, "count": 1, "pointers": ["/1"]}})
+        # the deadline is checked while the values are copied (start, both containers, after 1024 copied values)
+        with patch("src.input_budget.time.monotonic", side_effect=[0, 0, 0, 100]):
+            tracker = budget.start()
+            self.assertEqual(tracker.limit_value({"foo": list(range(5000))})["foo"], list(range(1023)))
+        self.assertEqual(tracker.get_report(), {"timeout": {"limit": 10, "count": 1, "pointers": ["/foo"]}})
+
+    def test_copy_timeout(self):
+        document = {"foo": {"bar": 1}, "values": list(range(5000)), "baz": 1, "qux": [1]}
+        for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+            with self.subTest(form_class=form_class):
+                # the deadline passes while the values are copied (start, "/foo" twice, "/values" twice, after 1024
+                # copied values)
+                with patch("src.input_budget.time.monotonic", side_effect=[0, 0, 0, 0, 0, 100]):
+                    form = form_class(document, budget=InputBudget(timeout=10))
+                # the properties copied before the deadline are kept, the left out properties are reported
+                self.assertEqual(list(form.get_data_schema()["properties"]), ["foo", "values"])
+                self.assertEqual(form.get_data_schema()["properties"]["foo"]["properties"]["bar"]["type"], "integer")
+                self.assertEqual(
+                    form.exceeded_budget,
+                    {"timeout": {"limit": 10, "count": 3, "pointers": ["/values", "/baz", "/qux"]}}
+                )
+
+    def test_inference_timeout(self):
+        class SlowValue:
+            pass
+
+        clock = [0.0]
+
+        def create_slow_input(factory, input_name: str, input_value: SlowValue) -> StringInput:
+            # the inference is the slow part, copying the values doesn't move the clock
+            clock[0] += 0.01
+            return StringInput(input_name)
+
+        slow_values = {"key" + str(index): {"value": SlowValue()} for index in range(5000)}
+        with patch("src.input_budget.time.monotonic", lambda: clock[0]), \
+                patch.dict(JsonSchemaFormInputFactory.default_input_creators, {SlowValue: create_slow_input}):
+            for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+                with self.subTest(form_class=form_class):
+                    clock[0] = 0.0
+                    form = form_class({"foo": 1, "object": slow_values}, budget=InputBudget(timeout=1))
+                    # the deadline is checked every deadline_check_interval inferred values
+                    self.assertLess(len(form.inputs[1].get_properties()), BudgetTracker.deadline_check_interval)
+                    self.assertEqual(
+                        form.exceeded_budget,
+                        {"timeout": {"limit": 1, "count": 1, "pointers": ["/object"]}}
+                    )
+                    clock[0] = 0.0
+                    form = form_class.from_records(
+                        [{"id": 1}, {"values": slow_values}, {"name": "foo"}],
+                        budget=InputBudget(timeout=1)
+                    )
+                    self.assertEqual(list(form.get_data_schema()["properties"]), ["id", "values"])
+                    self.assertEqual(form.exceeded_budget, {"timeout": {"limit": 1, "count": 1, "pointers": ["/1"]}})
+
+    def test_records(self):
+        records = [{"id": 1, "tags": ["foo"] * 20}, {"name": "bar", "deep": {"deeper": {"deepest": 1}}}]
+        form = JsonSchemaForm.from_records(records, budget=InputBudget(max_depth=2, max_array_items=5))
+        self.assertEqual(list(form.get_data_schema()["properties"]), ["id", "tags", "name", "deep"])
+        self.assertEqual(form.get_data_schema()["properties"]["deep"]["properties"]["deeper"]["properties"], {})
+        self.assertEqual(
+            form.exceeded_budget,
+            {
+                "max_array_items": {"limit": 5, "count": 1, "pointers": ["/0/tags"]},
+                "max_depth": {"limit": 2, "count": 1, "pointers": ["/1/deep/deeper"]}
+            }
+        )
+
+    def test_json_schema_document(self):
+        document = {"foo": [1, 2, 3]}
+        self.assertNotIn("budget", get_json_schema_document(JsonSchemaForm(document, budget=InputBudget(max_depth=2))))
+        json_schema_document = get_json_schema_document(JsonSchemaForm(document, budget=InputBudget(max_depth=1)))
+        self.assertEqual(json_schema_document["dataschema"]["properties"]["foo"]["items"], {})
+        self.assertEqual(json_schema_document["budget"], {"max_depth": {"limit": 1, "count": 1, "pointers": ["/foo"]}})
+
+    def test_unsupported_inference(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "document.json")
+            with open(json_path, "w") as json_file:
+                json.dump({"foo": 1}, json_file)
+            with self.assertRaises(BudgetNotSupported):
+                load_json_schema_form(json_path, stream=True, budget=InputBudget(max_depth=1))
+            self.assertEqual(
+                load_json_schema_form(json_path, budget=InputBudget(max_depth=1)).get_data_schema()["properties"],
+                {"foo": {"title": "Foo", "type": "integer"}}
+            )
+            # budget is a part of the cache key
+            schema_cache = SchemaCache(directory)
+            self.assertNotEqual(
+                schema_cache.get_key(json_path, {"budget": InputBudget(max_depth=1)}),
+                schema_cache.get_key(json_path, {"budget": InputBudget(max_depth=2)})
+            )
+
+    def test_invalid_limit(self):
+        with self.assertRaises(InvalidBudgetLimit):
+            InputBudget(max_depth=0)
+        with self.assertRaises(InvalidBudgetLimit):
+            InputBudget(timeout=-1)
@@ -0,0 +1,168 @@
+import io
+import json
+import random
+from collections import OrderedDict
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput, JsonSchemaFormInputFactory, \
+    IncompatibleArrayItemsInput, UnknownInputType, StringInput, IntegerInput
+from src.iterative_engine import IterativeJsonSchemaForm, IterativeJsonSchemaFormInputFactory
+from src.schema_writer import JsonSchemaWriter
+
+
+def create_random_value(generator: random.Random, depth: int = 0):
+    value_type = generator.choice(["dict", "list", "str", "int", "float", "bool"] if depth < 5 else ["str", "int"])
+    if value_type == "dict":
+        return {
+            generator.choice(["foo", "barBaz", "qux_quux", "id"]) + str(generator.randint(0, 3)):
+                create_random_value(generator, depth + 1)
+            for _ in range(generator.randint(0, 4))
+        }
+    if value_type == "list":
+        item_type = generator.choice(["dict", "list", "str"])
+        return [
+            create_random_value(generator, depth + 1) if item_type != "str" else "item"
+            for _ in range(generator.randint(0, 4))
+        ]
+    return {"str": "foo", "int": 1, "float": 1.5, "bool": True}[value_type]
+
+
+class IterativeEngineTests(TestCase):
+
+    def test_same_schemas_as_recursive_form(self):
+        generator = random.Random(1)
+        documents = [json.loads(Path(__file__).parent.joinpath("test.json").read_text())]
+        documents += [{"root": create_random_value(generator)} for _ in range(300)]
+        for document in documents:
+            for options in [{}, {"items_are_required": False, "items_are_invisible": True, "cast_types": True}]:
+                try:
+                    form = JsonSchemaForm(document, **options)
+                except IncompatibleArrayItemsInput:
+                    self.assertRaises(IncompatibleArrayItemsInput, IterativeJsonSchemaForm, document, **options)
+                    self.assertRaises(
+                        IncompatibleArrayItemsInput,
+                        IterativeJsonSchemaForm.from_json_stream,
+                        io.StringIO(json.dumps(document)),
+                        **options
+                    )
+                    continue
+                for iterative_form in [
+                    IterativeJsonSchemaForm(document, **options),
+                    IterativeJsonSchemaForm.from_json_stream(io.StringIO(json.dumps(document)), **options)
+                ]:
+                    self.assertEqual(
+                        json.dumps(iterative_form.get_data_schema()),
+                        json.dumps(form.get_data_schema())
+                    )
+                    self.assertEqual(json.dumps(iterative_form.get_ui_schema()), json.dumps(form.get_ui_schema()))
+
+    def test_combined_schemas(self):
+        generator = random.Random(3)
+        documents = [{"root": create_random_value(generator)} for _ in range(300)]
+        for document in documents:
+            for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+                try:
+                    form = form_class(document, items_are_invisible=True, cast_types=True)
+                except IncompatibleArrayItemsInput:
+                    continue
+                combined_form = form_class(document, items_are_invisible=True, cast_types=True)
+                data_schema, ui_schema = combined_form.get_schemas()
+                self.assertEqual(json.dumps(data_schema), json.dumps(form.get_data_schema()))
+                self.assertEqual(json.dumps(ui_schema), json.dumps(form.get_ui_schema()))
+
+    def test_structure_fingerprint(self):
+        recursive_factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        iterative_factory = IterativeJsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        generator = random.Random(2)
+        values = [create_random_value(generator) for _ in range(300)]
+        recursive_fingerprints = [recursive_factory._get_structure_fingerprint(value) for value in values]
+        iterative_fingerprints = [iterative_factory._get_structure_fingerprint(value) for value in values]
+        # same values have the same fingerprints
+        for index in range(len(values)):
+            self.assertEqual(
+                [fingerprint == iterative_fingerprints[index] for fingerprint in iterative_fingerprints],
+                [fingerprint == recursive_fingerprints[index] for fingerprint in recursive_fingerprints]
+            )
+
+    def test_shapes_are_bounded(self):
+        generator = random.Random(4)
+        documents = [{"root": [create_random_value(generator) for _ in range(20)]} for _ in range(50)]
+        for document in documents:
+            try:
+                form = JsonSchemaForm(document, items_are_required=False)
+            except IncompatibleArrayItemsInput:
+                continue
+            with patch("src.iterative_engine.SHAPES_CACHE_SIZE", 4):
+                iterative_form = IterativeJsonSchemaForm(document, items_are_required=False)
+            self.assertLessEqual(len(iterative_form.inputs_factory.shapes), 4)
+            self.assertEqual(json.dumps(iterative_form.get_data_schema()), json.dumps(form.get_data_schema()))
+        # forgotten shapes get new fingerprints - they never match the fingerprints of other shapes
+        factory = IterativeJsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        with patch("src.iterative_engine.SHAPES_CACHE_SIZE", 2):
+            fingerprints = [factory._get_structure_fingerprint(value) for value in [{"foo": 1}, ["bar"], {"foo": 1}]]
+        self.assertEqual(len(set(fingerprints)), 3)
+        self.assertEqual(len(factory.shapes), 2)
+
+    def test_deep_document(self):
+        depth = 5000
+        document = value = {}
+        for level in range(depth):
+            value["level" + str(level)] = [{}]
+            value = value["level" + str(level)][0]
+        value["leaf"] = "foo"
+        for form, leaf_definition in [
+            (IterativeJsonSchemaForm(document, items_are_invisible=True), {"title": "Leaf", "type": "string"}),
+            (
+                IterativeJsonSchemaForm.from_json_stream(io.StringIO("{\"a\": " * depth + "1" + "}" * depth)),
+                {"title": "A", "type": "integer"}
+            )
+        ]:
+            form.get_ui_schema()
+            definition = form.get_data_schema()
+            levels = 0
+            while "properties" in definition:
+                definition = list(definition["properties"].values())[0]
+                if definition["type"] == "array":
+                    definition = definition["items"]
+                levels += 1
+            self.assertGreaterEqual(levels, depth)
+            self.assertEqual(definition, leaf_definition)
+        # the schemas are compared serialized (the comparison of the deep dicts would hit the recursion limit)
+        form = IterativeJsonSchemaForm(document, items_are_invisible=True)
+        combined_form = IterativeJsonSchemaForm(document, items_are_invisible=True)
+        combined_output = io.StringIO()
+        JsonSchemaWriter(combined_output).write(list(combined_form.get_schemas()))
+        output = io.StringIO()
+        JsonSchemaWriter(output).write([form.get_data_schema(), form.get_ui_schema()])
+        self.assertEqual(combined_output.getvalue(), output.getvalue())
+
+    def test_unknown_input_type(self):
+        self.assertRaises(UnknownInputType, IterativeJsonSchemaForm, {"foo": {"bar": [None]}})
+
+    def test_registered_input_creators(self):
+        def create_ordered_input(factory, input_name: str, input_value: OrderedDict) -> JsonSchemaFormInput:
+            return StringInput(input_name, cast_type="object")
+
+        def create_digits_input(factory, input_name: str, input_value: str) -> JsonSchemaFormInput:
+            return IntegerInput(input_name) if input_value.isdigit() else StringInput(input_name)
+
+        for factory_class in [JsonSchemaFormInputFactory, IterativeJsonSchemaFormInputFactory]:
+            with self.subTest(factory_class=factory_class):
+                inputs_factory = factory_class(items_are_required=True, cast_types=False)
+                inputs_factory.register_input_creator(OrderedDict, create_ordered_input)
+                self.assertEqual(inputs_factory.create_input("map", OrderedDict(foo=1)).get_type(), "string")
+                nested_input = inputs_factory.create_input("root", {"maps": [OrderedDict(foo=1), OrderedDict(bar=[])]})
+                self.assertEqual(nested_input.get_definition()["properties"]["maps"]["items"]["type"], "string")
+                self.assertRaises(
+                    IncompatibleArrayItemsInput,
+                    inputs_factory.create_input,
+                    "maps",
+                    [OrderedDict(foo=1), {"foo": 1}]
+                )
+                # the inputs of the registered creators may depend on the values, the items aren't deduplicated
+                inputs_factory.register_input_creator(str, create_digits_input)
+                self.assertEqual(inputs_factory.create_input("ids", ["1", "2"]).get_definition()["items"]["type"],
+                                 "integer")
+                for value in [["1", "x"], {"values": ["1", "x"]}]:
+                    self.assertRaises(IncompatibleArrayItemsInput, inputs_factory.create_input, "values", value)
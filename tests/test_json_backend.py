@@ -0,0 +1,137 @@
+import os
+import json
+import random
+import tempfile
+from pathlib import Path
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+from src.json_backend import JsonBackend, OrjsonBackend, get_json_backend, orjson, UnknownJsonBackend, \
+    JSON_BACKEND_ENVIRONMENT_VARIABLE, has_big_number, may_have_float
+from src.json_schema_form import JsonSchemaForm
+from src.batch_generator import get_json_schema_document
+from src.input_budget import InputBudget
+from tests.test_iterative_engine import create_random_value
+
+
+STRINGS = ["foo", "é", "\x7f", "\x00\x1f\n\t\r\b\f", "\u2028", "😀", "\\\"/", "日本語"]
+
+
+def create_random_json_value(generator: random.Random, depth: int = 0):
+    value = create_random_value(generator, depth)
+    if isinstance(value, dict):
+        return {generator.choice(STRINGS) + key: create_random_json_value(generator, depth + 1) for key in value}
+    if isinstance(value, list):
+        return [create_random_json_value(generator, depth + 1) for _ in value] + [None, generator.choice(STRINGS)]
+    if isinstance(value, str):
+        return generator.choice(STRINGS)
+    if isinstance(value, float):
+        return generator.choice([
+            generator.randint(-2 ** 63, 2 ** 64 - 1),
+            generator.uniform(-1, 1) * 10 ** generator.randint(-30, 30),
+            generator.choice([1e16, 1e-5, 5e-324, 0.5])
+        ])
+    return value
+
+
+class JsonBackendTests(TestCase):
+
+    def test_stdlib_backend(self):
+        json_backend = JsonBackend()
+        self.assertEqual(json_backend.dumps({"a": [1, "é"]}), "{\"a\":[1,\"\\u00e9\"]}")
+        self.assertEqual(json_backend.dumps({"a": []}, indent=2), json.dumps({"a": []}, indent=2))
+        self.assertEqual(json_backend.loads(b"{\"a\": [1]}"), {"a": [1]})
+
+    @skipIf(orjson is None, "orjson isn't installed")
+    def test_orjson_same_as_stdlib(self):
+        stdlib_backend = JsonBackend()
+        orjson_backend = OrjsonBackend()
+        generator = random.Random(4)
+        values = [create_random_json_value(generator) for _ in range(300)] + [{}, [], "", {1: "non-string key"}]
+        for value in values:
+            for indent in [None, 2, 4]:
+                dumped_value = orjson_backend.dumps(value, indent)
+                self.assertEqual(dumped_value, stdlib_backend.dumps(value, indent))
+                self.assertEqual(
+                    orjson_backend.dumps(value, indent, sort_keys=True),
+                    stdlib_backend.dumps(value, indent, sort_keys=True)
+                )
+                for data in [dumped_value, dumped_value.encode()]:
+                    self.assertEqual(orjson_backend.loads(data), stdlib_backend.loads(data))
+
+    @skipIf(orjson is None, "orjson isn't installed")
+    def test_orjson_floats(self):
+        orjson_backend = OrjsonBackend()
+        # float limit of the budget in the schema document
+        json_schema_document = get_json_schema_document(
+            JsonSchemaForm({"foo": 1, "bar": 2}, budget=InputBudget(max_properties=1, timeout=1e16))
+        )
+        self.assertEqual(orjson_backend.dumps(json_schema_document, 2), json.dumps(json_schema_document, indent=2))
+        for value in [1e16, 1.2e17, 1e-5, 1e-7, 5e-324, 0.5, 1e15, float("nan"), float("-inf")]:
+            self.assertEqual(orjson_backend.dumps({"timeout": value}), JsonBackend().dumps({"timeout": value}))
+        self.assertFalse(may_have_float(orjson.dumps({"foo": [1, True, "bar"]}, option=orjson.OPT_INDENT_2)))
+
+    @skipIf(orjson is None, "orjson isn't installed")
+    def test_orjson_parsing_edge_cases(self):
+        orjson_backend = OrjsonBackend()
+        for data in [
+            "123456789012345678901234567890", "[1e400, NaN, -Infinity]", "\"\\ud800\"", "18446744073709551615"
+        ]:
+            loaded_value = orjson_backend.loads(data)
+            self.assertEqual(repr(loaded_value), repr(json.loads(data)))
+            self.assertEqual(type(loaded_value), type(json.loads(data)))
+        for data in ["{", "[1,]", b"\xff"]:
+            with self.assertRaises(ValueError) as orjson_error:
+                orjson_backend.loads(data)
+            with self.assertRaises(ValueError) as stdlib_error:
+                json.loads(data)
+            self.assertEqual(str(orjson_error.exception), str(stdlib_error.exception))
+
+    @skipIf(orjson is None, "orjson isn't installed")
+    def test_orjson_negative_big_integers(self):
+        data = "{\"n\": -9999999999999999999, \"m\": -9223372036854775808}"
+        self.assertEqual(
+            JsonSchemaForm(OrjsonBackend().loads(data)).get_data_schema(),
+            JsonSchemaForm(JsonBackend().loads(data)).get_data_schema()
+        )
+        data_schema = JsonSchemaForm(OrjsonBackend().loads(data)).get_data_schema()
+        self.assertEqual(data_schema["properties"]["n"]["type"], "integer")
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "document.json"
+            json_path.write_text(data)
+            self.assertEqual(OrjsonBackend().load_file(str(json_path)), json.loads(data))
+            self.assertIsInstance(OrjsonBackend().load_file(str(json_path))["n"], int)
+
+    def test_load_file(self):
+        json_backends = [JsonBackend()] + ([OrjsonBackend()] if orjson is not None else [])
+        generator = random.Random(5)
+        values = [create_random_json_value(generator) for _ in range(50)]
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "document.json"
+            for json_backend in json_backends:
+                for value in values:
+                    json_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+                    self.assertEqual(json_backend.load_file(str(json_path)), value)
+                json_path.write_bytes(json.dumps({"a": "é"}).encode("utf-16"))
+                self.assertEqual(json_backend.load_file(str(json_path)), {"a": "é"})
+                for data in [b"", b"{", b"\xff"]:
+                    json_path.write_bytes(data)
+                    with self.assertRaises(ValueError):
+                        json_backend.load_file(str(json_path))
+
+    def test_has_big_number(self):
+        data = b"[" + b"1" * 10 + b"," + b"1" * 18 + b"]"
+        self.assertFalse(has_big_number(memoryview(data)))
+        with patch("src.json_backend.BIG_NUMBER_CHUNK_SIZE", 7):
+            for position in range(30):
+                big_number_data = b" " * position + b"-" + b"9" * 19
+                self.assertTrue(has_big_number(memoryview(big_number_data)))
+                self.assertTrue(has_big_number(big_number_data.decode()))
+            self.assertFalse(has_big_number(memoryview(data)))
+
+    def test_backend_selection(self):
+        self.assertIsInstance(get_json_backend("stdlib"), JsonBackend)
+        self.assertIs(get_json_backend("stdlib"), get_json_backend("stdlib"))
+        self.assertEqual(get_json_backend("auto").name, "stdlib" if orjson is None else "orjson")
+        with patch.dict(os.environ, {JSON_BACKEND_ENVIRONMENT_VARIABLE: "stdlib"}):
+            self.assertEqual(get_json_backend().name, "stdlib")
+        self.assertRaises(UnknownJsonBackend, get_json_backend, "unknown")
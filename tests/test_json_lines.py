@@ -0,0 +1,66 @@
+import io
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_lines import ProgressReporter, InvalidJsonLine, read_json_lines
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInputFactory, SchemaIsNotObject
+from src.iterative_engine import IterativeJsonSchemaForm
+
+
+class JsonLinesTests(TestCase):
+
+    def test_records_form_equals_array_items_merge(self):
+        records = [
+            {"id": 1, "user": {"name": "foo"}},
+            {"id": 2, "user": {"email": "foo@bar.com"}, "tags": ["foo"]},
+            {"id": 3, "createdAt": "2020-01-01"}
+        ] * 10
+        records_form = JsonSchemaForm.from_records(records, items_are_required=False)
+        array_form = JsonSchemaForm({"records": records}, items_are_required=False)
+        self.assertEqual(
+            records_form.get_data_schema()["properties"],
+            array_form.get_data_schema()["properties"]["records"]["items"]["properties"]
+        )
+
+    def test_records_fingerprints_are_bounded(self):
+        # optional keys - every record has different structure, the first ones recur after they're forgotten
+        records = [{"id": 1, "key" + str(index): {"foo": "2020-01-01T00:00:00Z"}} for index in range(20)] * 2
+        records.append({"id": 1, "key0": {"foo": "bar", "baz": 1}})
+        add_array_item = JsonSchemaFormInputFactory.add_array_item
+        fingerprints_sizes = []
+
+        def add_record_item(factory, input_item, item_value, items_fingerprints):
+            fingerprints_sizes.append(len(items_fingerprints))
+            add_array_item(factory, input_item, item_value, items_fingerprints)
+
+        for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+            with self.subTest(form_class=form_class.__name__):
+                expected_form = form_class.from_records(records, items_are_required=False, detect_formats=True)
+                fingerprints_sizes.clear()
+                with patch("src.json_schema_form.RECORDS_FINGERPRINTS_CACHE_SIZE", 3), \
+                        patch.object(JsonSchemaFormInputFactory, "add_array_item", add_record_item):
+                    form = form_class.from_records(records, items_are_required=False, detect_formats=True)
+                # the full set is cleared before the record is added
+                self.assertEqual(max(fingerprints_sizes), 2)
+                self.assertEqual(form.get_data_schema(), expected_form.get_data_schema())
+                self.assertNotIn("format", form.get_data_schema()["properties"]["key0"]["properties"]["foo"])
+
+    def test_read_json_lines(self):
+        progress_output = io.StringIO()
+        progress_reporter = ProgressReporter(progress_output, interval=0)
+        form = JsonSchemaForm.from_records(
+            read_json_lines(io.StringIO('{"foo": 1}\n\n{"bar": true}\n'), progress_reporter),
+            items_are_required=False
+        )
+        self.assertEqual(list(form.get_data_schema()["properties"].keys()), ["foo", "bar"])
+        self.assertEqual(progress_reporter.records_count, 2)
+        self.assertTrue(progress_output.getvalue().startswith("Processed 1 records ("))
+        self.assertIn("Processed 2 records (", progress_output.getvalue())
+
+    def test_invalid_records(self):
+        with self.assertRaises(InvalidJsonLine) as context:
+            list(read_json_lines(io.StringIO('{"foo": 1}\n{"bar": \n')))
+        self.assertEqual(context.exception.line_number, 2)
+        self.assertRaises(SchemaIsNotObject, JsonSchemaForm.from_records, [{"foo": 1}, ["foo"]])
+
+    def test_no_records(self):
+        self.assertEqual(JsonSchemaForm.from_records([]).get_data_schema()["properties"], {})
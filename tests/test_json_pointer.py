@@ -0,0 +1,83 @@
+import os
+import json
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm, IncompatibleArrayItemsInput, SchemaIsNotObject
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.batch_generator import load_json_schema_form
+from src.input_budget import InputBudget
+from src.json_pointer import resolve_json_pointer, get_pointer_tokens, InvalidJsonPointer, JsonPointerNotFound, \
+    PointerNotSupported
+
+
+class JsonPointerTests(TestCase):
+
+    def test_resolve_json_pointer(self):
+        document = {"foo": [{"bar": 1}, {"a/b": 2, "m~n": 3}], "": 4}
+        self.assertIs(resolve_json_pointer(document, ""), document)
+        self.assertEqual(resolve_json_pointer(document, "/foo/0/bar"), 1)
+        self.assertEqual(resolve_json_pointer(document, "/foo/1/a~1b"), 2)
+        self.assertEqual(resolve_json_pointer(document, "/foo/1/m~0n"), 3)
+        self.assertEqual(resolve_json_pointer(document, "/"), 4)
+        self.assertEqual(get_pointer_tokens("/~01/~10"), ["~1", "/0"])
+        for pointer in ["/foo/2", "/foo/01", "/foo/-", "/foo/0/bar/baz", "/baz"]:
+            with self.subTest(pointer=pointer), self.assertRaises(JsonPointerNotFound):
+                resolve_json_pointer(document, pointer)
+        with self.assertRaises(InvalidJsonPointer):
+            resolve_json_pointer(document, "foo")
+
+    def test_lazy_form(self):
+        form = JsonSchemaForm({"foo": [1, "bar"]}, lazy=True)
+        self.assertFalse(form.inputs_loaded)
+        # the failed inference leaves the inputs empty and it's repeated on the next use
+        for _ in range(2):
+            with self.assertRaises(IncompatibleArrayItemsInput):
+                form.get_data_schema()
+            self.assertEqual(form.form_inputs, [])
+        form = JsonSchemaForm({"foo": 1}, lazy=True)
+        form.add_record({"bar": "baz"})
+        self.assertEqual(list(form.get_data_schema()["properties"]), ["foo", "bar"])
+
+    def test_from_pointer(self):
+        document = {
+            "payload": {"customer": {"name": "foo", "tags": ["bar"]}, "items": [1, "baz"]},
+            "other": [{"id": 1}, {"id": "qux"}]
+        }
+        for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+            with self.subTest(form_class=form_class):
+                # the incompatible items of the other branches are never inferred
+                form = form_class.from_pointer(document, "/payload/customer", items_are_required=False)
+                self.assertEqual(
+                    form.get_data_schema(),
+                    form_class(document["payload"]["customer"], items_are_required=False).get_data_schema()
+                )
+        with patch.object(JsonSchemaForm, "_load_inputs_from_schema") as load_inputs_from_schema:
+            form = JsonSchemaForm.from_pointer(document, "/payload/customer", lazy=True)
+            load_inputs_from_schema.assert_not_called()
+        self.assertEqual(list(form.get_data_schema()["properties"]), ["name", "tags"])
+        with self.assertRaises(SchemaIsNotObject):
+            JsonSchemaForm.from_pointer(document, "/payload/items")
+        with self.assertRaises(JsonPointerNotFound):
+            JsonSchemaForm.from_pointer(document, "/payload/order")
+
+    def test_budget_pointers(self):
+        document = {"payload": [{"customer": {"tags": ["foo", "bar", "baz"]}}]}
+        form = JsonSchemaForm.from_pointer(document, "/payload/0/customer", budget=InputBudget(max_array_items=2))
+        self.assertEqual(
+            form.exceeded_budget,
+            {"max_array_items": {"limit": 2, "count": 1, "pointers": ["/payload/0/customer/tags"]}}
+        )
+
+    def test_load_json_schema_form(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "document.json")
+            with open(json_path, "w") as json_file:
+                json.dump({"payload": {"customer": {"name": "foo"}}, "items": [1, "bar"]}, json_file)
+            self.assertEqual(
+                load_json_schema_form(json_path, pointer="/payload/customer").get_data_schema()["properties"],
+                {"name": {"title": "Name", "type": "string"}}
+            )
+            for load_options in [{"stream": True}, {"json_lines": True}]:
+                with self.subTest(load_options=load_options), self.assertRaises(PointerNotSupported):
+                    load_json_schema_form(json_path, pointer="/payload", **load_options)
@@ -1,5 +1,10 @@
+from enum import IntEnum
+from collections import OrderedDict
 from unittest import TestCase
-from src.json_schema_form import JsonSchemaForm, IncompatibleArrayItemsInput
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInputFactory, IncompatibleArrayItemsInput, \
+    ObjectInputPropertyNotFound, UnknownInputType, StringInput, get_title_from_name, get_title_cache_info
+from src.iterative_engine import IterativeJsonSchemaForm
 
 
 class JsonSchemaFormTests(TestCase):
@@ -153,6 +158,21 @@ class JsonSchemaFormTests(TestCase):
             }
         )
 
+    def test_title_parsing_special_names(self):
+        self.assertEqual(get_title_from_name(""), "")
+        self.assertEqual(get_title_from_name("#id"), "Id")
+        self.assertEqual(get_title_from_name("userID2name"), "User Id2Name")
+        self.assertEqual(get_title_from_name("mixed_snakeCase"), "Mixed Snakecase")
+        self.assertEqual(get_title_from_name("élanVital"), "Élan Vital")
+        self.assertEqual(get_title_from_name("názevÚčtu"), "Název Účtu")
+
+    def test_title_cache(self):
+        cache_info = get_title_cache_info()
+        JsonSchemaForm({"titleCacheTest": "test"})
+        JsonSchemaForm({"titleCacheTest": "test"})
+        self.assertEqual(get_title_cache_info().misses, cache_info.misses + 1)
+        self.assertEqual(get_title_cache_info().hits, cache_info.hits + 1)
+
     def test_invisible_items_ui_definition(self):
         form = JsonSchemaForm(
             {
@@ -308,3 +328,179 @@ class JsonSchemaFormTests(TestCase):
                 "required": []
             }
         )
+
+    def test_array_items_with_repeated_structure(self):
+        form = JsonSchemaForm(
+            {
+                "array": [{"foo": 1, "bar": ["x"]}] * 1000 + [{"baz": 1.5, "foo": 2}, {"bar": ["y"], "foo": 3}]
+            },
+            items_are_required=False
+        )
+        self.assertEqual(
+            list(form.get_data_schema()["properties"]["array"]["items"]["properties"].keys()),
+            ["foo", "bar", "baz"]
+        )
+        self.assertRaises(
+            IncompatibleArrayItemsInput,
+            JsonSchemaForm,
+            {
+                "array": [{"foo": 1}] * 1000 + [["foo"]]
+            }
+        )
+
+    def test_nested_arrays_are_fingerprinted_once(self):
+        depth = 50
+        value = [1]
+        for _ in range(depth):
+            value = [value]
+        inputs_factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        create_structure_fingerprint = JsonSchemaFormInputFactory._create_structure_fingerprint
+        with patch.object(
+                JsonSchemaFormInputFactory,
+                "_create_structure_fingerprint",
+                autospec=True,
+                side_effect=create_structure_fingerprint
+        ) as fingerprint_mock:
+            array_input = inputs_factory.create_input("array", value)
+        # every nested array is fingerprinted once (not on every level of the arrays above it)
+        self.assertEqual(fingerprint_mock.call_count, depth)
+        self.assertIsNone(inputs_factory.fingerprints_cache)
+        for _ in range(depth):
+            array_input = array_input.get_items_input()
+        self.assertEqual(array_input.get_items_input().get_type(), "integer")
+
+    def test_wide_objects_merge(self):
+        form = JsonSchemaForm(
+            {
+                "array": [
+                    {"key" + str(index): index for index in range(10000)},
+                    {"key" + str(index): index for index in range(5000, 15000)}
+                ]
+            }
+        )
+        items_input = form.inputs[0].get_items_input()
+        self.assertEqual(
+            [form_input.get_name() for form_input in items_input.get_properties()],
+            ["key" + str(index) for index in range(15000)]
+        )
+        self.assertEqual(items_input.get_property_by_name("key14999").get_name(), "key14999")
+        self.assertRaises(ObjectInputPropertyNotFound, items_input.get_property_by_name, "key15000")
+
+    def test_cached_definitions_invalidation(self):
+        form = JsonSchemaForm(
+            {
+                "array": [{"foo": "val"}],
+                "object": {"inner": {"bar": 1}}
+            },
+            items_are_invisible=True
+        )
+        data_schema = form.get_data_schema()
+        ui_schema = form.get_ui_schema()
+        object_definition = form.inputs[1].get_definition()
+        self.assertIs(form.get_data_schema(), data_schema)
+        self.assertIs(form.get_ui_schema(), ui_schema)
+        # change of the array items invalidates the array and the form, other inputs stay cached
+        array_input = form.inputs[0]
+        array_input.merge_items_input(form.inputs_factory.create_input("arra", {"bar": True}))
+        self.assertIsNot(form.get_data_schema(), data_schema)
+        self.assertIsNot(form.get_ui_schema(), ui_schema)
+        self.assertIs(form.inputs[1].get_definition(), object_definition)
+        self.assertEqual(
+            list(form.get_data_schema()["properties"]["array"]["items"]["properties"].keys()),
+            ["foo", "bar"]
+        )
+        self.assertEqual(list(form.get_ui_schema()["array"]["items"].keys()), ["ui:widget", "foo", "bar"])
+        # merging already known properties doesn't invalidate anything
+        data_schema = form.get_data_schema()
+        array_input.merge_items_input(form.inputs_factory.create_input("arra", {"foo": "val"}))
+        self.assertIs(form.get_data_schema(), data_schema)
+        # nested change is propagated to the form
+        form.inputs[1].get_property_by_name("inner").add_property(form.inputs_factory.create_input("baz", 1.5))
+        self.assertIn("baz", form.get_data_schema()["properties"]["object"]["properties"]["inner"]["properties"])
+
+    def test_combined_schemas(self):
+        document = {"array": [{"foo": "val"}], "object": {"inner": {"bar": 1}}}
+        form = JsonSchemaForm(document, items_are_invisible=True)
+        data_schema, ui_schema = form.get_schemas()
+        self.assertEqual(data_schema, JsonSchemaForm(document, items_are_invisible=True).get_data_schema())
+        self.assertEqual(ui_schema, JsonSchemaForm(document, items_are_invisible=True).get_ui_schema())
+        self.assertIs(form.get_data_schema(), data_schema)
+        self.assertIs(form.get_ui_schema(), ui_schema)
+        # the cached definitions are reused, only the changed inputs are created again
+        object_definitions = form.inputs[1].get_definitions()
+        form.inputs[0].merge_items_input(form.inputs_factory.create_input("array", {"bar": True}))
+        data_schema, ui_schema = form.get_schemas()
+        self.assertEqual(list(data_schema["properties"]["array"]["items"]["properties"]), ["foo", "bar"])
+        self.assertEqual(list(ui_schema["array"]["items"]), ["ui:widget", "foo", "bar"])
+        self.assertIs(data_schema["properties"]["object"], object_definitions[0])
+        self.assertIs(ui_schema["object"], object_definitions[1])
+        # UI schema of the visible items is empty, the inputs aren't visited for it
+        form = JsonSchemaForm(document)
+        self.assertEqual(form.get_schemas(), (JsonSchemaForm(document).get_data_schema(), {}))
+        self.assertIsNone(form.inputs[1].ui_hidden_definition)
+
+    def test_type_dispatch(self):
+        class Level(IntEnum):
+            LOW = 1
+
+        inputs_factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        # bool is a subclass of int, the subclasses are resolved by their nearest registered base type
+        self.assertEqual(inputs_factory.create_input("flag", True).get_type(), "boolean")
+        self.assertEqual(inputs_factory.create_input("level", Level.LOW).get_type(), "integer")
+        ordered_input = inputs_factory.create_input("map", OrderedDict(foo=1))
+        self.assertEqual(ordered_input.get_properties()[0].get_type(), "integer")
+        with self.assertRaises(UnknownInputType):
+            inputs_factory.create_input("none", None)
+        # custom creators are local to the factory
+        inputs_factory.register_input_creator(
+            type(None),
+            lambda factory, input_name, input_value: StringInput(input_name, cast_type="null")
+        )
+        self.assertEqual(inputs_factory.create_input("none", None).get_definition()["cast_type"], "null")
+        # replaced creator of the base type is used for the already resolved subclasses as well
+        inputs_factory.register_input_creator(
+            int,
+            lambda factory, input_name, input_value: StringInput(input_name, cast_type="integer")
+        )
+        self.assertEqual(inputs_factory.create_input("level", Level.LOW).get_definition()["cast_type"], "integer")
+        self.assertEqual(inputs_factory.create_input("flag", False).get_type(), "boolean")
+        self.assertRaises(UnknownInputType, JsonSchemaFormInputFactory(True, False).create_input, "none", None)
+
+    def test_detect_formats(self):
+        records = [
+            {
+                "id": "123e4567-e89b-12d3-a456-426614174000",
+                "created": "2024-01-01T10:00:00.123+02:00",
+                "email": "foo@example.com",
+                "links": ["https://example.com/foo?bar"],
+                "author": {"email": "bar@example.com"}
+            },
+            {
+                "id": "123e4567-e89b-12d3-a456-426614174001",
+                "created": "2024-01-02T10:00:00Z",
+                "email": "not an email",
+                "links": ["example.com"],
+                "author": {"email": 1}
+            }
+        ]
+        for form_class in [JsonSchemaForm, IterativeJsonSchemaForm]:
+            form = form_class({"records": records}, detect_formats=True)
+            items_properties = form.get_data_schema()["properties"]["records"]["items"]["properties"]
+            self.assertEqual(items_properties["id"]["format"], "uuid")
+            self.assertEqual(items_properties["created"]["format"], "date-time")
+            # the format is kept only if all the values have it
+            self.assertNotIn("format", items_properties["email"])
+            self.assertNotIn("format", items_properties["links"]["items"])
+            self.assertNotIn("format", items_properties["author"]["properties"]["email"])
+            self.assertEqual(
+                form_class.from_records(records, detect_formats=True).get_data_schema()["properties"],
+                items_properties
+            )
+            # the first record only
+            form = form_class.from_records(records[:1], detect_formats=True)
+            self.assertEqual(form.get_data_schema()["properties"]["links"]["items"]["format"], "uri")
+            self.assertEqual(form.get_data_schema()["properties"]["author"]["properties"]["email"]["format"], "email")
+        # detection is optional, the formats survive the data schema round trip
+        self.assertNotIn("format", JsonSchemaForm(records[0]).get_data_schema()["properties"]["id"])
+        data_schema = JsonSchemaForm(records[0], detect_formats=True).get_data_schema()
+        self.assertEqual(JsonSchemaForm.from_data_schema(data_schema).get_data_schema(), data_schema)
@@ -0,0 +1,80 @@
+import io
+import json
+from pathlib import Path
+from unittest import TestCase
+from src.json_stream_parser import JsonStreamParser, InvalidJsonStream
+from src.json_schema_form import JsonSchemaForm, IncompatibleArrayItemsInput, SchemaIsNotObject
+
+
+class JsonStreamParserTests(TestCase):
+
+    def test_parse_events(self):
+        parser = JsonStreamParser(io.StringIO('{"a": [1, 2.5, "x\\n"], "b": {}, "c": [true, false, null]}'))
+        self.assertEqual(
+            list(parser.parse()),
+            [
+                ("start_map", None),
+                ("map_key", "a"),
+                ("start_array", None),
+                ("number", 1),
+                ("number", 2.5),
+                ("string", "x\n"),
+                ("end_array", None),
+                ("map_key", "b"),
+                ("start_map", None),
+                ("end_map", None),
+                ("map_key", "c"),
+                ("start_array", None),
+                ("boolean", True),
+                ("boolean", False),
+                ("null", None),
+                ("end_array", None),
+                ("end_map", None)
+            ]
+        )
+
+    def test_values_decoded_as_json_loads(self):
+        document = '[0, -12, 1e3, 1.5E-2, "\\u00e9\\"", "", -Infinity]'
+        events = list(JsonStreamParser(io.StringIO(document), chunk_size=1).parse())
+        values = [value for event, value in events if event not in ("start_array", "end_array")]
+        self.assertEqual(values, json.loads(document))
+        self.assertEqual([type(value) for value in values], [type(value) for value in json.loads(document)])
+
+    def test_invalid_documents(self):
+        for document in ['{"a": 1', '{"a" 1}', '{"a": 1,}', '[1 2]', '{"a": tru}', '{} {}', '', '"unterminated']:
+            with self.subTest(document=document):
+                with self.assertRaises(InvalidJsonStream):
+                    list(JsonStreamParser(io.StringIO(document), chunk_size=2).parse())
+
+    def test_stream_form_equals_loaded_form(self):
+        documents = [
+            Path(__file__).parent.joinpath("test.json").read_text(),
+            json.dumps({
+                "camelCase": [{"foo": 1, "inner": [[1.5], [2.5]]}, {"bar": "x", "foo": 2}],
+                "snake_case": {"deep": {"deeper": [True, False]}},
+                "empty": [],
+                "emptyObject": {},
+                "duplicate": 1
+            }).replace('"duplicate": 1', '"duplicate": 1, "camelCase": "overridden"')
+        ]
+        for document in documents:
+            for options in [{}, {"items_are_required": False, "items_are_invisible": True, "cast_types": True}]:
+                with self.subTest(document=document, options=options):
+                    loaded_form = JsonSchemaForm(json.loads(document), **options)
+                    stream_form = JsonSchemaForm.from_json_stream(io.StringIO(document), **options)
+                    self.assertEqual(
+                        json.dumps(stream_form.get_data_schema()),
+                        json.dumps(loaded_form.get_data_schema())
+                    )
+                    self.assertEqual(
+                        json.dumps(stream_form.get_ui_schema()),
+                        json.dumps(loaded_form.get_ui_schema())
+                    )
+
+    def test_stream_form_errors(self):
+        self.assertRaises(
+            IncompatibleArrayItemsInput,
+            JsonSchemaForm.from_json_stream,
+            io.StringIO('{"array": ["foo", false]}')
+        )
+        self.assertRaises(SchemaIsNotObject, JsonSchemaForm.from_json_stream, io.StringIO('[{"foo": 1}]'))
@@ -0,0 +1,119 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm
+from src.batch_generator import BatchGenerator, load_json_schema_document, JsonFileNotFound
+from src.schema_cache import SchemaCache, InvalidCacheSize
+from src.input_budget import InputBudget, BudgetNotSupported
+from src.json_backend import get_json_backend
+
+
+class SchemaCacheTests(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.json_path = os.path.join(self.temp_dir.name, "document.json")
+        Path(self.json_path).write_text(json.dumps({"fooBar": [1, 2]}))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key(self):
+        schema_cache = SchemaCache(self.cache_dir)
+        key = schema_cache.get_key(self.json_path, {"cast_types": True, "items_are_required": False})
+        self.assertEqual(key, schema_cache.get_key(self.json_path, {"items_are_required": False, "cast_types": True}))
+        self.assertNotEqual(key, schema_cache.get_key(self.json_path, {"items_are_required": True, "cast_types": True}))
+        # the inference way doesn't change the document
+        self.assertEqual(
+            key,
+            schema_cache.get_key(
+                self.json_path,
+                {"cast_types": True, "items_are_required": False, "stream": True, "iterative": True}
+            )
+        )
+        with patch.object(SchemaCache, "format_version", SchemaCache.format_version + 1):
+            self.assertNotEqual(
+                key,
+                schema_cache.get_key(self.json_path, {"cast_types": True, "items_are_required": False})
+            )
+        Path(self.json_path).write_text(json.dumps({"fooBar": [1, "2"]}))
+        self.assertNotEqual(
+            key,
+            schema_cache.get_key(self.json_path, {"cast_types": True, "items_are_required": False})
+        )
+
+    def test_hit_skips_loading(self):
+        schema_cache = SchemaCache(self.cache_dir)
+        load_options = {"cast_types": True}
+        document = load_json_schema_document(self.json_path, load_options, {}, schema_cache)
+        form = JsonSchemaForm({"fooBar": [1, 2]}, cast_types=True)
+        self.assertEqual(document, {"dataschema": form.get_data_schema(), "uischema": form.get_ui_schema()})
+        with patch("src.batch_generator.load_json_schema_form", side_effect=AssertionError) as load_mock:
+            self.assertEqual(load_json_schema_document(self.json_path, load_options, {}, schema_cache), document)
+            # different options are a miss
+            self.assertRaises(AssertionError, load_json_schema_document, self.json_path, {}, {}, schema_cache)
+            # bypassed cache is never read
+            self.assertRaises(
+                AssertionError,
+                load_json_schema_document, self.json_path, load_options, {}, SchemaCache(self.cache_dir, bypass=True)
+            )
+            self.assertEqual(load_mock.call_count, 2)
+        self.assertRaises(
+            JsonFileNotFound,
+            load_json_schema_document, self.json_path + ".missing", {}, {}, schema_cache
+        )
+        # the document cached without the stream inference doesn't hide the unsupported options
+        load_json_schema_document(self.json_path, {"budget": InputBudget(max_depth=1)}, {}, schema_cache)
+        self.assertRaises(
+            BudgetNotSupported,
+            load_json_schema_document,
+            self.json_path, {"budget": InputBudget(max_depth=1), "stream": True}, {}, schema_cache
+        )
+
+    def test_lru_eviction(self):
+        document = {"dataschema": {"foo": "x" * 100}, "uischema": {}}
+        document_size = len(get_json_backend().dumps(document).encode())
+        schema_cache = SchemaCache(self.cache_dir, max_size=document_size * 2)
+        with patch.object(SchemaCache, "_evict", wraps=schema_cache._evict) as evict_mock:
+            schema_cache.set("a", document)
+            schema_cache.set("b", document)
+            # replaced document isn't counted twice
+            schema_cache.set("b", document)
+            # the directory is scanned only by the first write
+            self.assertEqual(evict_mock.call_count, 1)
+        self.assertEqual(schema_cache.size, document_size * 2)
+        os.utime(os.path.join(self.cache_dir, "a.json"), ns=(1, 1))
+        os.utime(os.path.join(self.cache_dir, "b.json"), ns=(2, 2))
+        # "a" is used, so "b" is the least recently used one
+        self.assertEqual(schema_cache.get("a"), document)
+        schema_cache.set("c", document)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["a.json", "c.json"])
+        self.assertIsNone(schema_cache.get("b"))
+        schema_cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertIsNone(schema_cache.get("a"))
+
+    def test_batch(self):
+        schema_cache = SchemaCache(self.cache_dir)
+        batch_generator = BatchGenerator({}, workers_count=1, schema_cache=schema_cache)
+        results = list(batch_generator.generate([self.json_path]))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertEqual(list(batch_generator.generate([self.json_path])), results)
+
+    def test_deep_document(self):
+        schema_cache = SchemaCache(self.cache_dir)
+        document = value = {}
+        for _ in range(100000):
+            value["a"] = value = {}
+        # too deep document isn't cached (it couldn't be read)
+        schema_cache.set("deep", document)
+        self.assertIsNone(schema_cache.get("deep"))
+        schema_cache.set("flat", {"a": {}})
+        self.assertEqual(schema_cache.get("flat"), {"a": {}})
+
+    def test_invalid_size(self):
+        self.assertRaises(InvalidCacheSize, SchemaCache, self.cache_dir, max_size=-1)
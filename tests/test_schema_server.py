@@ -0,0 +1,125 @@
+import json
+import threading
+from pathlib import Path
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen, Request
+from concurrent.futures import ThreadPoolExecutor
+from src.json_schema_form import JsonSchemaForm
+from src.schema_server import SchemaServer, LatencyRecorder, InvalidMaxBodySize
+
+
+class SchemaServerTests(TestCase):
+
+    def setUp(self):
+        self.server = SchemaServer(("127.0.0.1", 0), {"items_are_required": True})
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+        self.url = "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def request(self, path: str, document=None):
+        data = None if document is None else json.dumps(document).encode()
+        try:
+            with urlopen(Request(self.url + path, data=data)) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_schema(self):
+        document = json.loads(Path(__file__).parent.joinpath("test.json").read_text())
+        for path, options in [
+            ("/schema", {"items_are_required": True}),
+            (
+                "/schema?required-items=0&invisible-items&cast-types=1",
+                {"items_are_required": False, "items_are_invisible": True, "cast_types": True}
+            )
+        ]:
+            form = JsonSchemaForm(document, **options)
+            self.assertEqual(
+                self.request(path, document),
+                (200, {"dataschema": form.get_data_schema(), "uischema": form.get_ui_schema()})
+            )
+
+    def test_concurrent_requests(self):
+        documents = [{"foo" + str(i): {"barBaz": [i, i + 1]}} for i in range(50)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda document: self.request("/schema", document), documents))
+        for document, (status, response) in zip(documents, responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(response["dataschema"], JsonSchemaForm(document).get_data_schema())
+        status, stats = self.request("/stats")
+        self.assertEqual(status, 200)
+        self.assertEqual(stats["requests"], 50)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+
+    def test_validate(self):
+        data_schema = JsonSchemaForm({"foo": [{"bar": 1}]}).get_data_schema()
+        self.assertEqual(
+            self.request("/validate", {"dataschema": data_schema, "data": {"foo": [{"bar": 2}]}}),
+            (200, {"valid": True, "errors": []})
+        )
+        self.assertEqual(
+            self.request("/validate", {"dataschema": data_schema, "data": {"foo": [{"bar": "baz"}]}}),
+            (200, {"valid": False, "errors": [{"pointer": "/foo/0/bar", "message": "must be integer"}]})
+        )
+        self.assertEqual(self.request("/validate", {"data": {}})[0], 400)
+        self.assertEqual(self.request("/validate", {"dataschema": {"type": "array"}, "data": {}})[0], 400)
+        # validation requests latency is recorded separately
+        status, stats = self.request("/stats")
+        self.assertEqual(stats["requests"], 0)
+        self.assertEqual(stats["validate"]["requests"], 4)
+
+    def test_max_body_size(self):
+        server = SchemaServer(("127.0.0.1", 0), {}, max_body_size=100)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.start()
+        try:
+            url = "http://127.0.0.1:" + str(server.server_address[1])
+            for path in ["/schema", "/validate"]:
+                with self.assertRaises(HTTPError) as error:
+                    urlopen(Request(url + path, data=json.dumps({"foo": "x" * 100}).encode()))
+                self.assertEqual(error.exception.code, 413)
+                self.assertEqual(
+                    json.loads(error.exception.read()),
+                    {"error": "Request body has 111 bytes, at most 100 bytes are accepted"}
+                )
+            with urlopen(Request(url + "/schema", data=json.dumps({"foo": "x"}).encode())) as response:
+                self.assertEqual(response.status, 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+            server_thread.join()
+        self.assertRaises(InvalidMaxBodySize, SchemaServer, ("127.0.0.1", 0), {}, max_body_size=-1)
+
+    def test_pointer(self):
+        document = {"payload": {"customer": {"name": "foo"}, "items": [1, "bar"]}}
+        self.assertEqual(
+            self.request("/schema?pointer=/payload/customer", document)[1]["dataschema"]["properties"],
+            {"name": {"title": "Name", "type": "string"}}
+        )
+        self.assertEqual(
+            self.request("/schema?pointer=/payload/unknown", document),
+            (400, {"error": "JSON pointer '/payload/unknown' doesn't exist in the document"})
+        )
+
+    def test_errors(self):
+        self.assertEqual(self.request("/schema", [1, 2]), (400, {"error": "JSON schema must be an object"}))
+        self.assertEqual(self.request("/unknown", {})[0], 404)
+        self.assertEqual(self.request("/stats")[1]["requests"], 1)
+
+
+class LatencyRecorderTests(TestCase):
+
+    def test_percentiles(self):
+        latency_recorder = LatencyRecorder(max_samples=100)
+        self.assertEqual(latency_recorder.get_stats(), {"requests": 0, "p50_ms": 0.0, "p99_ms": 0.0})
+        for latency in range(200, 0, -1):
+            latency_recorder.record(latency / 1000)
+        # only the latest 100 samples (0.1 s - 0.001 s) are kept
+        self.assertEqual(latency_recorder.get_percentile(50), 0.05)
+        self.assertEqual(latency_recorder.get_stats(), {"requests": 200, "p50_ms": 50.0, "p99_ms": 99.0})
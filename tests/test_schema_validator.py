@@ -0,0 +1,129 @@
+from unittest import TestCase
+from src.json_schema_form import JsonSchemaForm
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.shared_definitions import SharedDefinitionsEmitter
+from src.schema_validator import ValidatorCompiler, ValidatorCache, InvalidValidatedSchema, get_schema_hash
+
+
+class SchemaValidatorTests(TestCase):
+
+    def setUp(self):
+        self.records = [
+            {
+                "id": 1,
+                "name": "foo",
+                "score": 1.5,
+                "active": True,
+                "email": "foo@example.com",
+                "tags": ["foo"],
+                "address": {"city": "Prague", "geo": {"lat": 50.1}},
+                "orders": [{"sku": "a", "quantity": 1}]
+            },
+            {"id": 2, "name": "bar", "orders": []}
+        ]
+        self.data_schema = JsonSchemaForm.from_records(
+            self.records,
+            items_are_required=False,
+            detect_formats=True
+        ).get_data_schema()
+
+    def test_validate(self):
+        validate = ValidatorCompiler(self.data_schema).compile()
+        for record in self.records:
+            self.assertEqual(validate(record), [])
+        # integral float is an integer, bool is not a number
+        self.assertEqual(validate({"id": 1.0, "score": 2}), [])
+        self.assertEqual(
+            validate({
+                "id": True,
+                "name": 1,
+                "score": "1.5",
+                "email": "foo",
+                "tags": ["foo", 1, "bar", None],
+                "address": {"city": "Prague", "geo": []},
+                "orders": [{"sku": "a", "quantity": 1}, {"sku": 1, "quantity": 1.5}, "foo"]
+            }),
+            [
+                {"pointer": "/id", "message": "must be integer"},
+                {"pointer": "/name", "message": "must be string"},
+                {"pointer": "/score", "message": "must be float"},
+                {"pointer": "/email", "message": "must be email string"},
+                {"pointer": "/orders/2", "message": "must be object"},
+                {"pointer": "/orders/1/sku", "message": "must be string"},
+                {"pointer": "/orders/1/quantity", "message": "must be integer"},
+                {"pointer": "/address/geo", "message": "must be object"},
+                {"pointer": "/tags/1", "message": "must be string"},
+                {"pointer": "/tags/3", "message": "must be string"}
+            ]
+        )
+        self.assertEqual(validate([]), [{"pointer": "", "message": "must be object"}])
+
+    def test_required_and_cast_types(self):
+        data_schema = JsonSchemaForm({"count": 1, "price": 1.5, "a/b": "foo"}, cast_types=True).get_data_schema()
+        validate = ValidatorCompiler(data_schema).compile()
+        self.assertEqual(validate({"count": "-12", "price": "1e3", "a/b": "foo"}), [])
+        self.assertEqual(validate({"count": 12, "price": 1, "a/b": "foo"}), [])
+        self.assertEqual(
+            validate({"count": "1.5", "price": "abc"}),
+            [
+                {"pointer": "/count", "message": "must be integer or string castable to integer"},
+                {"pointer": "/price", "message": "must be float or string castable to float"},
+                {"pointer": "/a~1b", "message": "is required"}
+            ]
+        )
+
+    def test_shared_definitions_and_depth(self):
+        document = {"first": {"foo": {"bar": 1}}, "second": {"foo": {"bar": 2}}}
+        form = JsonSchemaForm(document)
+        data_schema = SharedDefinitionsEmitter().get_data_schema(form)
+        self.assertIn("definitions", data_schema)
+        compiler = ValidatorCompiler(data_schema)
+        validate = compiler.compile()
+        self.assertEqual(validate(document), [])
+        self.assertEqual(validate({"first": {"foo": {}}, "second": document["second"]})[0]["pointer"], "/first/foo/bar")
+        # the shared definition is compiled once (root, first, second and foo functions)
+        self.assertEqual(len(compiler.sources), 4)
+        # nesting depth isn't limited by the recursion limit
+        document = value = {}
+        for level in range(5000):
+            value["level"] = [{"id": level}]
+            value = value["level"][0]
+        validate = ValidatorCompiler(IterativeJsonSchemaForm(document).get_data_schema()).compile()
+        self.assertEqual(validate(document), [])
+        value["id"] = "foo"
+        self.assertEqual(validate(document)[0]["pointer"], "/level/0" * 5000 + "/id")
+
+    def test_invalid_schema(self):
+        for data_schema in [[], {"type": "array"}, {"type": "object", "properties": {"foo": {"type": "date"}}},
+                            {"type": "object", "properties": {"foo": {"$ref": "#/definitions/bar"}}}]:
+            with self.assertRaises(InvalidValidatedSchema):
+                ValidatorCompiler(data_schema).compile()
+
+    def test_cache(self):
+        validator_cache = ValidatorCache(max_size=1)
+        validate = validator_cache.get_validator(self.data_schema)
+        # the same schema with the other keys order
+        reordered_schema = dict(reversed(list(self.data_schema.items())))
+        self.assertEqual(get_schema_hash(reordered_schema), get_schema_hash(self.data_schema))
+        self.assertIs(validator_cache.get_validator(reordered_schema), validate)
+        other_schema = JsonSchemaForm({"foo": 1}).get_data_schema()
+        self.assertIsNot(validator_cache.get_validator(other_schema), validate)
+        self.assertIsNot(validator_cache.get_validator(self.data_schema), validate)
+        self.assertEqual(validator_cache.get_info(), {"hits": 1, "misses": 3, "size": 1, "max_size": 1})
+        # form validator is cached until the form changes
+        form = JsonSchemaForm({"foo": 1})
+        self.assertIs(form.get_validator(), form.get_validator())
+        self.assertEqual(form.get_validator()({"foo": 1, "bar": "baz"}), [])
+        form.add_record({"bar": True})
+        self.assertEqual(
+            form.get_validator()({"foo": 1, "bar": "baz"}),
+            [{"pointer": "/bar", "message": "must be boolean"}]
+        )
+
+    def test_string_format_bounds(self):
+        data_schema = JsonSchemaForm({"url": "https://example.com"}, detect_formats=True).get_data_schema()
+        validate = ValidatorCompiler(data_schema).compile()
+        self.assertEqual(validate({"url": "ftp://example.com/foo"}), [])
+        # the values out of the format length range aren't matched by the pattern
+        for url in ["http://" + "a" * 20000 + " ", "https://example.com/" + "a" * 2048, "a://"]:
+            self.assertEqual(validate({"url": url}), [{"pointer": "/url", "message": "must be uri string"}])
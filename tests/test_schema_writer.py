@@ -0,0 +1,88 @@
+import io
+import json
+import random
+from pathlib import Path
+from unittest import TestCase
+from src.json_schema_form import JsonSchemaForm
+from src.iterative_engine import IterativeJsonSchemaForm
+from src.batch_generator import get_json_schema_document
+from src.input_budget import InputBudget
+from src.schema_writer import JsonSchemaWriter, write_json_schema_document
+from tests.test_iterative_engine import create_random_value
+
+
+class LimitedOutput(io.StringIO):
+
+    def __init__(self):
+        super().__init__()
+        self.chunks_sizes = []
+
+    def write(self, chunk: str) -> int:
+        self.chunks_sizes.append(len(chunk))
+        return super().write(chunk)
+
+
+class JsonSchemaWriterTests(TestCase):
+
+    def test_same_output_as_json_dumps(self):
+        generator = random.Random(3)
+        values = [create_random_value(generator) for _ in range(300)]
+        values += [[None, 1.5, -1, {"kéy \"quoted\"": [None, True, {}, []]}, "x\n"], {}, [], "foo", None]
+        for value in values:
+            for indent in [None, 2, 4]:
+                output = io.StringIO()
+                JsonSchemaWriter(output, indent).write(value)
+                if indent is None:
+                    self.assertEqual(output.getvalue(), json.dumps(value, separators=(",", ":")))
+                else:
+                    self.assertEqual(output.getvalue(), json.dumps(value, indent=indent))
+
+    def test_lazy_values(self):
+        output = io.StringIO()
+        JsonSchemaWriter(output).write({"foo": lambda: [1, lambda: {"bar": lambda: None}]})
+        self.assertEqual(output.getvalue(), "{\"foo\":[1,{\"bar\":null}]}")
+
+    def test_chunks(self):
+        output = LimitedOutput()
+        JsonSchemaWriter(output, buffer_size=100).write([{"foo": "bar" * 10}] * 100)
+        self.assertGreater(len(output.chunks_sizes), 10)
+        self.assertLess(max(output.chunks_sizes), 200)
+        self.assertEqual(output.getvalue(), json.dumps([{"foo": "bar" * 10}] * 100, separators=(",", ":")))
+
+    def test_schema_document(self):
+        document = json.loads(Path(__file__).parent.joinpath("test.json").read_text())
+        for options in [{}, {"items_are_required": False, "items_are_invisible": True, "cast_types": True}]:
+            for document_options in [{}, {"shared_definitions": True}]:
+                form = JsonSchemaForm(document, **options)
+                output = io.StringIO()
+                write_json_schema_document(form, output, indent=2, **document_options)
+                # definitions are created while written, nothing is cached
+                self.assertIsNone(form.data_schema)
+                self.assertIsNone(form.inputs[0].definition)
+                self.assertEqual(
+                    output.getvalue(),
+                    json.dumps(get_json_schema_document(form, **document_options), indent=2)
+                )
+
+    def test_lazy_form_budget(self):
+        for document_options in [{}, {"shared_definitions": True}]:
+            form = JsonSchemaForm({"foo": 1, "bar": 2}, budget=InputBudget(max_properties=1), lazy=True)
+            output = io.StringIO()
+            write_json_schema_document(form, output, **document_options)
+            json_schema_document = json.loads(output.getvalue())
+            self.assertEqual(json_schema_document["budget"]["max_properties"]["count"], 1)
+            self.assertEqual(
+                json_schema_document,
+                get_json_schema_document(JsonSchemaForm({"foo": 1, "bar": 2}, budget=InputBudget(max_properties=1)))
+            )
+
+    def test_deep_schema_document(self):
+        depth = 5000
+        form = IterativeJsonSchemaForm.from_json_stream(
+            io.StringIO("{\"a\": " * depth + "1" + "}" * depth),
+            items_are_invisible=True
+        )
+        output = io.StringIO()
+        write_json_schema_document(form, output)
+        self.assertTrue(output.getvalue().startswith("{\"dataschema\":{\"type\":\"object\",\"properties\":{\"a\":"))
+        self.assertEqual(output.getvalue().count("\"ui:widget\":\"hidden\""), depth)
@@ -0,0 +1,110 @@
+import os
+import json
+import random
+import tempfile
+from unittest import TestCase
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInputFactory, IncompatibleArrayItemsInput, \
+    IncompatibleInputs
+from src.sharded_inference import ShardedSchemaInference, read_json_lines_range
+from src.generation_stats import GenerationStats
+
+
+class ShardedInferenceTests(TestCase):
+
+    def setUp(self):
+        generator = random.Random(1)
+        self.records = [
+            {
+                "id": index,
+                "key" + str(generator.randint(0, 30)): {"foo" + str(generator.randint(0, 5)): "bar"},
+                "tags": [{"tag" + str(generator.randint(0, 5)): True}]
+            }
+            for index in range(300)
+        ]
+
+    def test_form_merge_is_associative(self):
+        expected_schema = JsonSchemaForm.from_records(self.records).get_data_schema()
+        for boundaries in [(0, 100, 200, 300), (0, 1, 299, 300), (0, 0, 150, 300)]:
+            forms = [JsonSchemaForm.from_records(self.records[boundaries[i]:boundaries[i + 1]]) for i in range(3)]
+            left, middle, right = forms
+            left.merge(middle)
+            left.merge(right)
+            self.assertEqual(json.dumps(left.get_data_schema()), json.dumps(expected_schema))
+            forms = [JsonSchemaForm.from_records(self.records[boundaries[i]:boundaries[i + 1]]) for i in range(3)]
+            left, middle, right = forms
+            middle.merge(right)
+            left.merge(middle)
+            self.assertEqual(json.dumps(left.get_data_schema()), json.dumps(expected_schema))
+
+    def test_array_input_merge(self):
+        factory = JsonSchemaFormInputFactory(items_are_required=True, cast_types=False)
+        items = [record["tags"] for record in self.records]
+        expected_definition = factory.create_input("tags", items).get_definition()
+        array_input = factory.create_input("tags", [])
+        for start in range(0, len(items), 70):
+            array_input.merge(factory.create_input("tags", items[start:start + 70]))
+        self.assertEqual(json.dumps(array_input.get_definition()), json.dumps(expected_definition))
+        self.assertRaises(
+            IncompatibleArrayItemsInput,
+            array_input.merge,
+            factory.create_input("tags", ["foo"])
+        )
+        self.assertRaises(IncompatibleInputs, array_input.merge, factory.create_input("tags", "foo"))
+
+    def test_read_json_lines_range(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_lines_path = os.path.join(temp_dir, "records.jsonl")
+            with open(json_lines_path, "w") as json_lines_file:
+                for record in self.records:
+                    json_lines_file.write(json.dumps(record) + "\n")
+            file_size = os.path.getsize(json_lines_path)
+            records = []
+            boundaries = [0, 1, 50, 51, 1000, 1001, file_size // 2, file_size]
+            for start, end in zip(boundaries[:-1], boundaries[1:]):
+                records += list(read_json_lines_range(json_lines_path, start, end))
+            self.assertEqual(records, self.records)
+
+    def test_sharded_inference(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_lines_path = os.path.join(temp_dir, "records.jsonl")
+            with open(json_lines_path, "w") as json_lines_file:
+                for record in self.records:
+                    json_lines_file.write(json.dumps(record) + "\n")
+            sharded_inference = ShardedSchemaInference({"items_are_required": False}, workers_count=2, shards_count=5)
+            self.assertEqual(
+                json.dumps(sharded_inference.infer_json_lines(json_lines_path).get_data_schema()),
+                json.dumps(JsonSchemaForm.from_records(self.records, items_are_required=False).get_data_schema())
+            )
+        document = {"meta": {"count": 1}, "records": self.records, "short": [1, 2]}
+        sharded_inference = ShardedSchemaInference({}, workers_count=2, shards_count=4, min_shard_items=10)
+        self.assertEqual(
+            json.dumps(sharded_inference.infer_document(document).get_data_schema()),
+            json.dumps(JsonSchemaForm(document).get_data_schema())
+        )
+        # only the inputs inferred in the main process are collected
+        with GenerationStats(trace_memory=False) as stats:
+            sharded_inference.infer_document(document, stats)
+        self.assertEqual(
+            {"ObjectInput": 1, "IntegerInput": 2, "ArrayInput": 1},
+            stats.get_report()["inputs"]["created"]
+        )
+
+    def test_string_formats_merge(self):
+        records = [{"mail": "ab@cd.ef", "nested": {"id": "ab@cd.ef"}}] * 100 + [{"mail": "abcdefgh", "nested": 1}] * 100
+        options = {"detect_formats": True}
+        expected_schema = JsonSchemaForm.from_records(records, **options).get_data_schema()
+        self.assertNotIn("format", expected_schema["properties"]["mail"])
+        self.assertNotIn("format", expected_schema["properties"]["nested"]["properties"]["id"])
+        left = JsonSchemaForm.from_records(records[:100], **options)
+        left.merge(JsonSchemaForm.from_records(records[100:], **options))
+        self.assertEqual(json.dumps(left.get_data_schema()), json.dumps(expected_schema))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_lines_path = os.path.join(temp_dir, "records.jsonl")
+            with open(json_lines_path, "w") as json_lines_file:
+                for record in records:
+                    json_lines_file.write(json.dumps(record) + "\n")
+            sharded_inference = ShardedSchemaInference(options, workers_count=2, shards_count=2)
+            self.assertEqual(
+                json.dumps(sharded_inference.infer_json_lines(json_lines_path).get_data_schema()),
+                json.dumps(expected_schema)
+            )
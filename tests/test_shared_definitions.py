@@ -0,0 +1,92 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+from src.json_schema_form import JsonSchemaForm, JsonSchemaFormInput
+from src.shared_definitions import SharedDefinitionsEmitter, get_input_shape
+
+
+def resolve_references(definition, definitions: dict):
+    if isinstance(definition, dict):
+        if "$ref" in definition:
+            return resolve_references(definitions[definition["$ref"].split("/")[-1]], definitions)
+        return {key: resolve_references(value, definitions) for key, value in definition.items()}
+    return definition
+
+
+class SharedDefinitionsTests(TestCase):
+
+    def setUp(self):
+        address = {"street": "Main", "city": "Prague", "geo": {"lat": 1.5, "lng": 1.5}}
+        self.document = {
+            "customer": {"name": "foo", "address": address, "billing": {"address": address}},
+            "orders": [{"id": 1, "address": address, "price": {"amount": 1, "currency": "CZK"}}],
+            "price": {"amount": 1, "currency": "CZK"},
+            "total": {"amount": 1, "currency": "CZK"},
+            "unique": {"foo": "bar"}
+        }
+
+    def test_shared_definitions(self):
+        form = JsonSchemaForm(self.document)
+        data_schema = SharedDefinitionsEmitter().get_data_schema(form)
+        self.assertEqual(list(data_schema["definitions"].keys()), ["geo", "address", "price"])
+        self.assertEqual(
+            data_schema["properties"]["customer"]["properties"]["address"],
+            {"$ref": "#/definitions/address"}
+        )
+        self.assertEqual(data_schema["definitions"]["address"]["properties"]["geo"], {"$ref": "#/definitions/geo"})
+        self.assertEqual(data_schema["properties"]["price"], {"$ref": "#/definitions/price"})
+        # different title - different shape
+        self.assertEqual(data_schema["properties"]["total"]["title"], "Total")
+        self.assertEqual(data_schema["properties"]["unique"], form.get_data_schema()["properties"]["unique"])
+        # same schema after the references resolution
+        definitions = data_schema.pop("definitions")
+        self.assertEqual(resolve_references(data_schema, definitions), form.get_data_schema())
+        self.assertLess(
+            len(json.dumps(data_schema)) + len(json.dumps(definitions)),
+            len(json.dumps(form.get_data_schema()))
+        )
+
+    def test_definition_name_collision(self):
+        form = JsonSchemaForm({
+            "a": {"item/x": {"foo": 1}, "other": {"item/x": {"foo": 1}}},
+            "b": {"item/x": {"bar": 1}, "other": {"item/x": {"bar": 1}}}
+        })
+        data_schema = SharedDefinitionsEmitter().get_data_schema(form)
+        self.assertEqual(list(data_schema["definitions"].keys()), ["item_x", "item_x2"])
+        definitions = data_schema.pop("definitions")
+        self.assertEqual(resolve_references(data_schema, definitions), form.get_data_schema())
+
+    def test_no_shared_definitions(self):
+        form = JsonSchemaForm({"foo": {"bar": 1}}, items_are_required=False)
+        self.assertEqual(SharedDefinitionsEmitter().get_data_schema(form), form.get_data_schema())
+
+    def test_identical_subtrees_share_shape(self):
+        form = JsonSchemaForm(self.document)
+        customer = form.inputs[0]
+        address = customer.properties["address"]
+        billing_address = customer.properties["billing"].properties["address"]
+        self.assertIs(get_input_shape(address), get_input_shape(billing_address))
+        self.assertIsNot(get_input_shape(address), get_input_shape(customer.properties["billing"]))
+        # shapes are interned across the forms
+        self.assertIs(get_input_shape(JsonSchemaForm(self.document).inputs[0]), get_input_shape(customer))
+
+    def test_repeated_emission_uses_cached_shapes(self):
+        form = JsonSchemaForm(self.document)
+        emitter = SharedDefinitionsEmitter()
+        data_schema = emitter.get_data_schema(form)
+        with patch.object(JsonSchemaFormInput, "get_shape_key", side_effect=AssertionError("shape is not cached")):
+            self.assertEqual(emitter.get_data_schema(form), data_schema)
+
+    def test_changed_input_shape_is_invalidated(self):
+        created = {"at": "2020-01-01T00:00:00Z"}
+        form = JsonSchemaForm({"a": {"created": created}, "b": {"created": created}}, detect_formats=True)
+        emitter = SharedDefinitionsEmitter()
+        self.assertEqual(list(emitter.get_data_schema(form)["definitions"].keys()), ["created"])
+        b_shape = form.inputs[1].shape
+        form.add_record({"a": {"created": {"at": "yesterday"}}})
+        self.assertIsNone(form.inputs[0].shape)
+        # unchanged inputs keep their shapes
+        self.assertIs(form.inputs[1].shape, b_shape)
+        data_schema = emitter.get_data_schema(form)
+        self.assertNotIn("definitions", data_schema)
+        self.assertEqual(data_schema, form.get_data_schema())
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from src.string_formats import StringFormatDetector, InvalidStringFormat, default_format_detector
+from src.json_schema_form import JsonSchemaFormInputFactory
+
+
+class StringFormatDetectorTests(TestCase):
+
+    def test_default_formats(self):
+        values_formats = {
+            "123e4567-e89b-12d3-a456-426614174000": "uuid",
+            "123e4567-e89b-12d3-a456-42661417400": None,
+            "123e4567-e89b-12d3-a456-42661417400g": None,
+            "2024-01-01T10:00:00Z": "date-time",
+            "2024-01-01t10:00:00.123456789-05:30": "date-time",
+            "2024-01-01 10:00:00Z": None,
+            "2024-01-01": None,
+            "foo.bar@example.co.uk": "email",
+            "foo@localhost": None,
+            "foo bar@example.com": None,
+            "https://example.com/foo?bar#baz": "uri",
+            "ftp://example.com": "uri",
+            "note: foo": None,
+            "https:///foo": None,
+            "": None,
+            "foo": None
+        }
+        for value, string_format in values_formats.items():
+            with self.subTest(value=value):
+                self.assertEqual(default_format_detector.detect(value), string_format)
+        # the values longer than any of the formats are never matched
+        self.assertIsNone(default_format_detector.detect("https://example.com/" + "a" * 5000))
+
+    def test_register_format(self):
+        format_detector = StringFormatDetector()
+        self.assertIsNone(format_detector.detect("127.0.0.1"))
+        format_detector.register_format("ipv4", r"[0-9]{1,3}(?:\.[0-9]{1,3}){3}", 7, 15, ".")
+        self.assertEqual(format_detector.detect("127.0.0.1"), "ipv4")
+        self.assertIsNone(format_detector.detect("127.0.0"))
+        self.assertIsNone(format_detector.detect("127"))
+        # applicable matchers are cached by the value length
+        self.assertEqual(len(format_detector.length_matchers[9]), 1)
+        self.assertEqual(format_detector.length_matchers[3], [])
+        with self.assertRaises(InvalidStringFormat):
+            format_detector.register_format("empty", "foo", 5, 4)
+        with self.assertRaises(InvalidStringFormat):
+            format_detector.register_format("invalid", "(foo", 1, 4)
+        # factory registration doesn't change the default detector
+        inputs_factory = JsonSchemaFormInputFactory(True, False, detect_formats=True)
+        inputs_factory.register_string_format("ipv4", r"[0-9]{1,3}(?:\.[0-9]{1,3}){3}", 7, 15, ".")
+        self.assertEqual(inputs_factory.create_input("host", "127.0.0.1").get_definition()["format"], "ipv4")
+        self.assertEqual(inputs_factory.create_input("email", "foo@example.com").get_definition()["format"], "email")
+        self.assertIsNone(default_format_detector.detect("127.0.0.1"))